@@ -1,48 +1,138 @@
-from dotenv import load_dotenv
+from functools import partial
 from os.path import join, dirname
+from requests import Session
 from selenium.webdriver import Chrome
-from selenium.webdriver.chrome.options import Options
 from smtplib import SMTP_SSL
-from src.config import Config
+from src.config import Config, ProfileStore
 from src.database import Database
-from src.database.models import Holiday, Punch
-from src.gui import GUI
-from src.utility import PagerDuty, PunchCardManager, GMAIL_DOMAIN
+from src.database.models import Holiday, Punch, TimeOff
+from src.utility import (
+    AsyncAccountManager,
+    BrowserWorkers,
+    GMAIL_DOMAIN,
+    HttpPunchClient,
+    PagerDuty,
+    PunchCardManager,
+    SessionStore,
+    chrome_options
+)
 from sys import exc_info
+import signal
 
 
+ENV_PATH = join(dirname(__file__), 'data', '.env')
+
+
+def make_browser() -> Chrome:
+    # Headless, and trimmed down to keep a long running browser small.
+    # The pages wait for each element explicitly, so no implicit wait is set.
+    return Chrome(options=chrome_options())
+
+
+def build_browser_manager(
+    profiles_path: str,
+    account_id: str,
+    driver: Chrome
+) -> PunchCardManager:
+    # Runs in a browser worker process, which only does the browser work
+    if profiles_path:
+        config = ProfileStore(profiles_path).get_config(account_id)
+    else:
+        config = Config(ENV_PATH)
+
+    connection = Database(config)
+
+    return PunchCardManager({
+        'config': config,
+        'driver': driver,
+        'holiday': Holiday(connection),
+        'pager': None,
+        'punch': Punch(connection, account_id),
+        'sessions': SessionStore(config)
+    })
+
+
+def run_accounts(path: str, size: int) -> None:
+    # Every account's profile is laid over the shared settings of the .env
+    configs = ProfileStore(path).get_configs()
+
+    if not configs:
+        print('No account profiles found in %s' % path)
+        return
+
+    # A few browser worker processes are shared between all of the accounts
+    browsers = BrowserWorkers(
+        make_browser,
+        partial(build_browser_manager, path),
+        size,
+        **configs[0].get_browser_limits()
+    )
+
+    manager = AsyncAccountManager({
+        'configs': configs,
+        'browsers': browsers,
+        'sessions': SessionStore(configs[0])
+    })
+
+    try:
+        manager.start()
+    finally:
+        browsers.close()
+
 
 def main() -> None:
-    # Load up environment configuration
-    load_dotenv(join(dirname(__file__), 'data', '.env'))
-    config = Config()
-    
+    # Load up environment configuration, stopping here if any of it is bad
+    config = Config(ENV_PATH)
+
+    # With account profiles, run every account from this one process
+    if config.get_account_profiles():
+        run_accounts(config.get_account_profiles(), config.get_browsers())
+        return
+
     # Connect to the database
     db = Database(config)
     
-    # Add the connection to the two models.
+    # Add the connection to the models.
     holiday = Holiday(db)
-    punch = Punch(db)
-    
-    # Set the options to have chrome be headless
-    op = Options()
-    op.add_argument('--headless')
+    time_off = TimeOff(db, config.get_account_id())
+    punch = Punch(db, config.get_account_id())
     
-    # Instantiate the driver
-    driver = Chrome(options=op)
-    driver.implicitly_wait(config.get_implicit_wait())
+    # The browser runs in a worker process, so a crash or hang in it is
+    # recovered from rather than taking this process down.
+    browsers = BrowserWorkers(
+        make_browser,
+        partial(build_browser_manager, None),
+        **config.get_browser_limits()
+    )
+
+    # Read the configuration again on SIGHUP. The browser workers read their
+    # own, so they are replaced once the new settings are in use.
+    if hasattr(signal, 'SIGHUP'):
+        signal.signal(
+            signal.SIGHUP,
+            lambda signum, frame: config.reload() and browsers.reload()
+        )
     
     # Instantiate the pager
     smtp = SMTP_SSL(GMAIL_DOMAIN)
     pager = PagerDuty(config, smtp)
     
+    # Optionally punch over HTTP, leaving the browser as the fallback
+    http = None
+    if config.get_punch_backend() == 'http':
+        http = HttpPunchClient(config, Session())
+
     # Set the args in a dictionary for future use
     args = {
         'config': config,
-        'driver': driver,
+        'driver': None,
+        'browsers': browsers,
         'holiday': holiday,
+        'http': http,
         'pager': pager,
-        'punch': punch
+        'time_off': time_off,
+        'punch': punch,
+        'sessions': SessionStore(config)
     }
 
     punch_card_manager = PunchCardManager(args)
@@ -56,6 +146,11 @@ def main() -> None:
             'PROGRAM CRASH, needs restart.\nException - %s\nValue - %s' %
             (exception_type, value)
         )
+    finally:
+        # Send any pages still queued, and commit anything still batched.
+        pager.close()
+        db.close()
+        browsers.close()
 
 
 if __name__ == "__main__":
@@ -1,9 +1,13 @@
+from calendar import month_name
 import sqlite3
 import os
 from os.path import join, dirname, exists
 
 path = '../data'
 
+# Month names as stored in the holidays table, back to the month number.
+months = {name: number for number, name in enumerate(month_name) if name}
+
 try:
     os.mkdir(join(dirname(__file__), path))
 except OSError:
@@ -34,6 +38,7 @@ try:
             [month] TEXT NOT NULL,
             [day] INTEGER NOT NULL,
             [year] INTEGER NOT NULL,
+            [date_key] INTEGER NOT NULL,
             UNIQUE(month, day, year)
         )
         '''
@@ -42,6 +47,27 @@ except sqlite3.OperationalError:
     add_example_holidays = False
     print('Table holidays already exists')
 
+    # Older tables only have the month name, day and year, so the integer
+    # YYYYMMDD key is added and filled in from those.
+    try:
+        cursor.execute('ALTER TABLE holidays ADD COLUMN [date_key] INTEGER')
+    except sqlite3.OperationalError:
+        print('Column date_key already exists.')
+
+    cursor.execute('SELECT id, month, day, year FROM holidays WHERE date_key IS NULL')
+    cursor.executemany(
+        'UPDATE holidays SET date_key=? WHERE id=?',
+        [
+            (year * 10000 + months[month] * 100 + day, id_)
+            for id_, month, day, year in cursor.fetchall()
+        ]
+    )
+    print('Filled in date_key for existing holidays')
+
+cursor.execute(
+    'CREATE UNIQUE INDEX IF NOT EXISTS holidays_date_key ON holidays(date_key)'
+)
+
 if add_example_holidays:
     print('Holiday table created, loading sample holidays')
     sample_holidays = [
@@ -57,8 +83,11 @@ if add_example_holidays:
         ('December', 25, 2020)
     ]
     cursor.executemany(
-        'INSERT INTO holidays(month, day, year) VALUES(?, ?, ?)',
-        sample_holidays
+        'INSERT INTO holidays(month, day, year, date_key) VALUES(?, ?, ?, ?)',
+        [
+            (month, day, year, year * 10000 + months[month] * 100 + day)
+            for month, day, year in sample_holidays
+        ]
     )
     print('Example holidays added')
 else:
@@ -78,15 +107,63 @@ try:
             [clock_in] DATETIME NULLABLE,
             [lunch_start] DATETIME NULLABLE,
             [lunch_end] DATETIME NULLABLE,
-            [clock_out] DATETIME NULLABLE
+            [clock_out] DATETIME NULLABLE,
+            [account_id] TEXT NULLABLE
         )
         '''
     )
 except sqlite3.OperationalError:
     print('Table punches already exists.')
 
+    # Tables from before accounts were tracked need the column added.
+    try:
+        cursor.execute('ALTER TABLE punches ADD COLUMN [account_id] TEXT NULLABLE')
+    except sqlite3.OperationalError:
+        print('Column account_id already exists.')
+    else:
+        print('Added account_id to punches')
+
+cursor.execute(
+    'CREATE INDEX IF NOT EXISTS punches_account_id ON punches(account_id, id)'
+)
+
 print('Tracking table added')
 
+print('Creating PTO tables')
+
+try:
+    cursor.execute(
+        '''
+        CREATE TABLE pto(
+            [id] INTEGER PRIMARY KEY,
+            [account_id] TEXT NULLABLE,
+            [start_key] INTEGER NOT NULL,
+            [end_key] INTEGER NOT NULL,
+            [hours] REAL NOT NULL
+        )
+        '''
+    )
+except sqlite3.OperationalError:
+    print('Table pto already exists.')
+
+cursor.execute(
+    'CREATE INDEX IF NOT EXISTS pto_account_id ON pto(account_id, start_key, end_key)'
+)
+
+try:
+    cursor.execute(
+        '''
+        CREATE TABLE pto_syncs(
+            [account_id] TEXT NULLABLE,
+            [synced_at] DATETIME NOT NULL
+        )
+        '''
+    )
+except sqlite3.OperationalError:
+    print('Table pto_syncs already exists.')
+
+print('PTO tables added')
+
 connection.commit()
 
 print('Schema created')
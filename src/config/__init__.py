@@ -1 +1,3 @@
 from .config import Config
+from .profiles import ProfileStore
+from .settings import Secret, Settings, load_settings
@@ -1,15 +1,44 @@
-from os import getenv
-from os.path import join, dirname
+from datetime import tzinfo
+from dotenv import load_dotenv
+from types import MappingProxyType
+from typing import Mapping
+from .settings import Secret, Settings, load_settings
+import os
 
 
 class Config:
     """A class that will handle loading up environment variables. 
     
     This class will load up the environment variables into the instantiated
-    object, and read back environment values.
+    object, and read back environment values. Every value is read and checked
+    once, into an immutable snapshot, so a missing or bad value stops the
+    program at startup. The getters then only read the snapshot.
+
+    The snapshot can be swapped for a fresh one with reload(), such as on
+    SIGHUP. Values already taken by other objects, like the start hour held
+    by a manager, keep their old value until those are created again. Only
+    this process sees the new snapshot, so browser workers, which read the
+    settings of their own, have to be started again to pick it up.
+
+    Attributes
+    ----------
+    _path : string
+        The .env file loaded into the environment, None for none.
+
+    _environ : Mapping
+        Where the settings are read from, the environment by default.
+
+    _settings : Settings
+        The snapshot of every setting, swapped whole on reload.
 
     Methods
     -------
+    reload()
+        Reads and checks the settings again, keeping the old on failure.
+
+    _reveal(values)
+        Decrypts any secrets among the values.
+
     get_login()
         Returns login information including a company ID, login and password.
 
@@ -20,23 +49,115 @@ class Config:
         Returns the url for the dashboard page.
 
     get_implicit_wait()
-        Returns the amount of time selenium should wait on the page to load.
+        Returns the amount of time selenium should wait for an element.
 
     get_db_path()
         Returns path to the database, this relative to this file.
 
+    get_db_settings()
+        Returns the database pragmas and commit batching settings.
+
     get_questions()
         Returns the secret questions as key-value pairs in a python dictionary.
     
     get_pager_duty_info()
         Returns the information needed for PagerDuty
+
+    get_pager_limits()
+        Returns the digest window and rate limit for PagerDuty.
+
+    get_browser_limits()
+        Returns when a browser worker is replaced with a fresh one.
+
+    get_browsers()
+        Returns how many browser workers the accounts share.
     
     get_start_hour()
         The hour to start the clock in process.
+
+    get_timezone()
+        Returns the timezone the hours of the account are kept in.
+
+    get_blocked_urls()
+        Returns the URL patterns each page has the browser block.
+
+    get_account_id()
+        Returns the ID used to keep this account's punches apart from others.
+
+    get_session_dir()
+        Returns path to the directory of saved login sessions.
+
+    get_session_key_path()
+        Returns path to the key encrypting the saved login sessions.
+
+    get_punch_url()
+        Returns the url the punch form is submitted to.
+
+    get_punch_backend()
+        Returns how punches are made, through the 'browser' or over 'http'.
+
+    get_pto_refresh_hours()
+        Returns how many hours the PTO grid is trusted before being read again.
+
+    get_warm_up_seconds()
+        Returns how long before a punch the browser logs in, ready to click.
+
+    get_after_punch_url()
+        Returns where the browser goes once a punch has registered.
+
+    get_account_profiles()
+        Returns where the profiles of the accounts are kept, if anywhere.
     """
 
-    @staticmethod
-    def get_login() -> dict:
+    def __init__(self, path: str = None, environ: Mapping = None):
+        """
+        Creates a new instance of the Config, reading every setting.
+
+        Parameters
+        ----------
+        path : string, optional
+            A .env file to load into the environment first.
+
+        environ : Mapping, optional
+            Where to read the settings from, such as an account's profile,
+            instead of the environment.
+
+        Raises
+        ------
+        ValueError
+            When a setting is missing or cannot be used.
+        """
+        self._path = path
+        self._environ = os.environ if environ is None else environ
+
+        if path is not None:
+            load_dotenv(path)
+
+        self._settings = load_settings(self._environ)
+
+    def reload(self) -> bool:
+        """
+        Reads the .env file and environment again into a new snapshot. When
+        the new settings are not valid, the old ones are kept. Only this
+        instance is updated, other processes keep the settings they read.
+
+        Returns
+        -------
+        bool
+            True if the new settings are now in use.
+        """
+        if self._path is not None:
+            load_dotenv(self._path, override=True)
+
+        try:
+            self._settings = load_settings(self._environ)
+        except ValueError as exception:
+            print(exception)
+            return False
+
+        return True
+
+    def get_login(self) -> dict:
         """
         Returns login information; company ID, login and password.
 
@@ -45,14 +166,9 @@ class Config:
         Dictionary
             Get login information using keys: companyId, username, and password.
         """
-        return {
-            'companyId': getenv('COMPANY_CODE'),
-            'username': getenv('USERNAME'),
-            'password': getenv('PASSWORD')
-        }
+        return self._reveal(self._settings.login)
 
-    @staticmethod
-    def get_login_url() -> str:
+    def get_login_url(self) -> str:
         """
         Returns the url in string form for where to log in.
 
@@ -60,10 +176,9 @@ class Config:
         -------
         string
         """
-        return getenv('PAYLOCITY_LOGIN_URL')
+        return self._settings.login_url
 
-    @staticmethod
-    def get_dashboard_url() -> str:
+    def get_dashboard_url(self) -> str:
         """
         Returns the url for the dashboard page.
 
@@ -71,21 +186,21 @@ class Config:
         -------
         string
         """
-        return getenv('PAYLOCITY_BASE_URL')
+        return self._settings.dashboard_url
 
-    @staticmethod
-    def get_implicit_wait() -> int:
+    def get_implicit_wait(self) -> int:
         """
-        Returns the max time (seconds) selenium waits for page load.
+        Returns the max time (seconds) the pages wait for each element to
+        show up. Elements are waited on explicitly, one at a time, so this is
+        only spent in full when an element never appears.
 
         Returns
         -------
         int
         """
-        return int(getenv('IMPLICIT_WAIT'))
+        return self._settings.implicit_wait
 
-    @staticmethod
-    def get_db_path() -> str:
+    def get_db_path(self) -> str:
         """
         Returns path to the database, this relative to this file.
 
@@ -93,10 +208,21 @@ class Config:
         -------
         string
         """
-        return join(dirname(__file__), '..', '..', 'data', 'database.db')
+        return self._settings.db_path
 
-    @staticmethod
-    def get_questions() -> dict:
+    def get_db_settings(self) -> dict:
+        """
+        Returns the pragmas and commit batching settings of the database.
+
+        Returns
+        -------
+        Dictionary
+            Get the settings using keys: synchronous, cache_size,
+            commit_batch_size, commit_interval and busy_timeout (seconds).
+        """
+        return self._settings.db_settings
+
+    def get_questions(self) -> dict:
         """
         Returns secret questions-answers as key-value pairs in dictionary.
 
@@ -105,14 +231,9 @@ class Config:
         Dictionary
             Use the secret questions as keys to get the secret answers.
         """
-        return {
-            getenv('SECRET_Q_1'): getenv('SECRET_A_1'),
-            getenv('SECRET_Q_2'): getenv('SECRET_A_2'),
-            getenv('SECRET_Q_3'): getenv('SECRET_A_3')
-        }
+        return self._reveal(self._settings.questions)
 
-    @staticmethod
-    def get_pager_duty_info() -> dict:
+    def get_pager_duty_info(self) -> dict:
         """
         Returns information necessary for PagerDuty
 
@@ -121,14 +242,44 @@ class Config:
         Dictionary
             Contains the information to login to the e-mail service for alerts.
         """
-        return {
-            'from': getenv('EMAIL_ADDRESS'),
-            'password': getenv('EMAIL_PASSWORD'),
-            'to': getenv('SMS_GATEWAY')
-        }
+        return self._reveal(self._settings.pager_duty_info)
 
-    @staticmethod
-    def get_start_hour() -> int:
+    def get_pager_limits(self) -> dict:
+        """
+        Returns how PagerDuty holds back and rate limits messages.
+
+        Returns
+        -------
+        Dictionary
+            Get the limits using keys: digest_seconds (0 sends INFO and
+            WARNING right away), messages_per_hour (0 for no limit) and burst.
+        """
+        return self._settings.pager_limits
+
+    def get_browser_limits(self) -> dict:
+        """
+        Returns when a browser worker is quit and replaced with a fresh one.
+
+        Returns
+        -------
+        Dictionary
+            Get the limits using keys: max_jobs, max_hours and max_memory_mb,
+            the memory of the worker and its browser (0 for no limit).
+        """
+        return self._settings.browser_limits
+
+    def get_browsers(self) -> int:
+        """
+        Returns how many browser worker processes the accounts share.
+
+        Returns
+        -------
+        int
+            The number of workers, 1 by default.
+        """
+        return self._settings.browsers
+
+    def get_start_hour(self) -> int:
         """
         Returns the hour at which to start work.
 
@@ -137,4 +288,157 @@ class Config:
         int
             The hour (based on 24 hour clock) to start work.
         """
-        return int(getenv('STARTING_HOUR'))
+        return self._settings.start_hour
+
+    def get_timezone(self) -> tzinfo:
+        """
+        Returns the timezone the hours of the account are kept in.
+
+        Returns
+        -------
+        tzinfo
+            The zone named by TIMEZONE, or the zone of the host.
+        """
+        return self._settings.timezone
+
+    def get_blocked_urls(self) -> dict:
+        """
+        Returns the URL patterns each page has the browser refuse to load,
+        such as images, fonts and analytics.
+
+        Returns
+        -------
+        Dictionary
+            The patterns of each page, using keys: login, dashboard and pto.
+        """
+        return self._settings.blocked_urls
+
+    def get_account_id(self) -> str:
+        """
+        Returns the ID keeping this account's punches apart from others that
+        share the database.
+
+        Returns
+        -------
+        string
+            The account ID, or None when only one account is run.
+        """
+        return self._settings.account_id
+
+    def get_session_dir(self) -> str:
+        """
+        Returns path to the directory of saved login sessions, this relative
+        to this file.
+
+        Returns
+        -------
+        string
+        """
+        return self._settings.session_dir
+
+    def get_session_key_path(self) -> str:
+        """
+        Returns path to the key encrypting the saved login sessions, this
+        relative to this file.
+
+        Returns
+        -------
+        string
+        """
+        return self._settings.session_key_path
+
+    def get_punch_url(self) -> str:
+        """
+        Returns the url the dashboard's punch form is submitted to.
+
+        Returns
+        -------
+        string
+        """
+        return self._settings.punch_url
+
+    def get_punch_backend(self) -> str:
+        """
+        Returns how punches are made, by clicking through the 'browser' or by
+        posting the punch form over 'http'.
+
+        Returns
+        -------
+        string
+            The backend to punch with, 'browser' when not set.
+        """
+        return self._settings.punch_backend
+
+    def get_pto_refresh_hours(self) -> float:
+        """
+        Returns how many hours the days off read from the PTO grid are
+        trusted, before logging in to read them again.
+
+        Returns
+        -------
+        float
+            The hours between reads of the PTO grid, 72 by default.
+        """
+        return self._settings.pto_refresh_hours
+
+    def get_warm_up_seconds(self) -> float:
+        """
+        Returns how many seconds before a punch is due the browser logs in
+        and waits on the dashboard, so the button is clicked on time.
+
+        Returns
+        -------
+        float
+            The seconds of lead, 120 by default, 0 to log in when due.
+        """
+        return self._settings.warm_up_seconds
+
+    def get_after_punch_url(self) -> str:
+        """
+        Returns where the browser goes once a punch has registered, based on
+        the AFTER_PUNCH strategy. 'blank' leaves for about:blank, 'logout'
+        loads the logout url and 'stay' keeps the dashboard open for the next
+        punch.
+
+        Returns
+        -------
+        string
+            The url to load, None to stay on the dashboard.
+        """
+        return self._settings.after_punch_url
+
+    def get_account_profiles(self) -> str:
+        """
+        Returns the JSON file, or directory of JSON files, holding the
+        profiles of the accounts to run from this process.
+
+        Returns
+        -------
+        string
+            The path to the profiles, None to run the one account.
+        """
+        return self._settings.account_profiles
+
+    @staticmethod
+    def _reveal(values: Mapping) -> Mapping:
+        """
+        Decrypts any secrets among the values. Values without secrets are
+        handed back as they are.
+
+        Parameters
+        ----------
+        values : Mapping, required
+            The values from the snapshot.
+
+        Returns
+        -------
+        Mapping
+            The values, with every secret decrypted.
+        """
+        if not any(isinstance(value, Secret) for value in values.values()):
+            return values
+
+        return MappingProxyType({
+            key: value.reveal() if isinstance(value, Secret) else value
+            for key, value in values.items()
+        })
@@ -0,0 +1,270 @@
+from collections import ChainMap
+from cryptography.fernet import Fernet
+from os.path import basename, isdir, join, splitext
+from typing import Mapping
+from .config import Config
+from .settings import DATA_DIR, Secret
+import json
+import os
+
+
+class ProfileStore:
+    """Reads the profiles of many accounts from JSON.
+
+    The path is either one JSON file holding a list of profiles, or a
+    directory holding a JSON file per profile. A profile holds the same
+    names as the .env file, such as USERNAME, STARTING_HOUR, SECRET_Q_1 or
+    SMS_GATEWAY, and is laid over the environment, so shared settings like
+    the urls only need to be set once. The password, secret answers and
+    email password can be given encrypted, as {"encrypted": "<token>"}, made
+    with encrypt().
+
+    Profiles are only indexed by account ID when read. The config of an
+    account is built, and checked, the first time it is asked for, and its
+    secrets are only decrypted when handed out.
+
+    Attributes
+    ----------
+    _key_path : string
+        Where the key for the encrypted values is kept.
+
+    _environ : Mapping
+        The shared settings every profile is laid over.
+
+    _profiles : dictionary
+        The raw profile of each account, by account ID.
+
+    _configs : dictionary
+        The config of each account built so far, by account ID.
+
+    _fernet : Fernet
+        Decrypts the secrets, None until the key is first needed.
+
+    Methods
+    -------
+    get_account_ids()
+        Returns the ID of every account, in order.
+
+    get_config(account_id)
+        Returns the config of the account, building it on first use.
+
+    get_configs()
+        Returns the config of every account.
+
+    encrypt(value)
+        Encrypts a value for use in a profile.
+
+    _read(path)
+        Reads the profiles in the file or directory.
+
+    _environment(profile)
+        Lays the profile over the shared settings.
+
+    _cipher()
+        Returns the Fernet, loading the key on first use.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        key_path: str = None,
+        environ: Mapping = os.environ
+    ):
+        """
+        Creates a new instance of the ProfileStore, indexing the profiles.
+
+        Parameters
+        ----------
+        path : string, required
+            A JSON file of profiles, or a directory of JSON files.
+
+        key_path : string, optional
+            Where the key for the encrypted values is kept, in data/ by
+            default.
+
+        environ : Mapping, optional
+            The shared settings every profile is laid over.
+
+        Raises
+        ------
+        ValueError
+            When a profile cannot be read, or an account ID is repeated.
+        """
+        self._key_path = key_path or join(DATA_DIR, 'profiles.key')
+        self._environ = environ
+        self._profiles = {}
+        self._configs = {}
+        self._fernet = None
+
+        for profile in self._read(path):
+            account_id = profile.get('ACCOUNT_ID')
+
+            if not account_id:
+                raise ValueError('Every profile needs an ACCOUNT_ID')
+
+            if account_id in self._profiles:
+                raise ValueError('Account %s has two profiles' % account_id)
+
+            self._profiles[account_id] = profile
+
+    def get_account_ids(self) -> list:
+        """
+        Returns the ID of every account.
+
+        Returns
+        -------
+        list
+            The account IDs, sorted.
+        """
+        return sorted(self._profiles)
+
+    def get_config(self, account_id: str) -> Config:
+        """
+        Returns the config of the account, building it the first time.
+
+        Parameters
+        ----------
+        account_id : string, required
+            The account to get the config of.
+
+        Returns
+        -------
+        Config
+
+        Raises
+        ------
+        KeyError
+            When there is no profile for the account.
+
+        ValueError
+            When a setting of the account is missing or cannot be used.
+        """
+        if account_id not in self._configs:
+            environ = self._environment(self._profiles[account_id])
+            self._configs[account_id] = Config(environ=environ)
+
+        return self._configs[account_id]
+
+    def get_configs(self) -> list:
+        """
+        Returns the config of every account.
+
+        Returns
+        -------
+        list
+            The configs, in the order of the account IDs.
+        """
+        return [
+            self.get_config(account_id) for account_id in self.get_account_ids()
+        ]
+
+    def encrypt(self, value: str) -> dict:
+        """
+        Encrypts a value to be put in a profile.
+
+        Parameters
+        ----------
+        value : string, required
+            The plain value.
+
+        Returns
+        -------
+        dictionary
+            The value as it is written in a profile.
+        """
+        return {'encrypted': self._cipher().encrypt(value.encode()).decode()}
+
+    @staticmethod
+    def _read(path: str) -> list:
+        """
+        Reads the profiles from a file holding a list of them, or from each
+        JSON file in a directory. A profile read from its own file takes the
+        file's name as its account ID, unless it gives one.
+
+        Parameters
+        ----------
+        path : string, required
+            The file or directory to read.
+
+        Returns
+        -------
+        list
+            The raw profiles.
+
+        Raises
+        ------
+        ValueError
+            When a file is not valid JSON.
+        """
+        if not isdir(path):
+            with open(path) as profile_file:
+                profiles = json.load(profile_file)
+
+            return profiles if isinstance(profiles, list) else [profiles]
+
+        profiles = []
+        for name in sorted(os.listdir(path)):
+            account_id, extension = splitext(basename(name))
+
+            if extension != '.json':
+                continue
+
+            with open(join(path, name)) as profile_file:
+                profile = json.load(profile_file)
+
+            profile.setdefault('ACCOUNT_ID', account_id)
+            profiles.append(profile)
+
+        return profiles
+
+    def _environment(self, profile: dict) -> ChainMap:
+        """
+        Lays the profile over the shared settings. Encrypted values are
+        wrapped as Secrets, and everything else is made a string, as if it
+        were read from the environment.
+
+        Parameters
+        ----------
+        profile : dictionary, required
+            The raw profile.
+
+        Returns
+        -------
+        ChainMap
+            The settings of the account.
+        """
+        values = {}
+
+        for name, value in profile.items():
+            if isinstance(value, dict) and 'encrypted' in value:
+                values[name] = Secret(value['encrypted'], self._cipher)
+            elif value is not None:
+                values[name] = str(value)
+
+        return ChainMap(values, self._environ)
+
+    def _cipher(self) -> Fernet:
+        """
+        Returns the Fernet for the secrets, reading the key the first time.
+        A key is created if there is none yet, so values can be encrypted.
+
+        Returns
+        -------
+        Fernet
+        """
+        if self._fernet is None:
+            try:
+                with open(self._key_path, 'rb') as key_file:
+                    key = key_file.read()
+            except FileNotFoundError:
+                key = Fernet.generate_key()
+                descriptor = os.open(
+                    self._key_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600
+                )
+
+                with os.fdopen(descriptor, 'wb') as key_file:
+                    key_file.write(key)
+
+            self._fernet = Fernet(key)
+
+        return self._fernet
@@ -0,0 +1,329 @@
+from cryptography.fernet import InvalidToken
+from datetime import datetime, tzinfo
+from os.path import exists, join, dirname
+from types import MappingProxyType
+from typing import Mapping, NamedTuple
+from zoneinfo import ZoneInfo
+
+
+# Settings that have no sensible default, and must be set.
+REQUIRED = (
+    'COMPANY_CODE', 'USERNAME', 'PASSWORD', 'PAYLOCITY_LOGIN_URL',
+    'PAYLOCITY_BASE_URL', 'IMPLICIT_WAIT', 'STARTING_HOUR', 'SECRET_Q_1',
+    'SECRET_A_1', 'SECRET_Q_2', 'SECRET_A_2', 'SECRET_Q_3', 'SECRET_A_3'
+)
+
+# The values SQLite accepts for PRAGMA synchronous, in any case.
+SYNCHRONOUS_MODES = ('off', 'normal', 'full', 'extra')
+
+PUNCH_BACKENDS = ('browser', 'http')
+
+# Where the browser goes after a punch, for each AFTER_PUNCH strategy. The
+# logout url is taken from the environment.
+AFTER_PUNCH = {'blank': 'about:blank', 'logout': None, 'stay': None}
+
+# The URL patterns of each kind of resource the pages can do without. Chrome
+# blocks requests by URL rather than by type, so each type is matched by its
+# usual extensions, or hosts.
+RESOURCE_PATTERNS = {
+    'image': ('*.png*', '*.jpg*', '*.jpeg*', '*.gif*', '*.svg*', '*.ico*',
+              '*.webp*'),
+    'font': ('*.woff*', '*.ttf*', '*.otf*', '*.eot*'),
+    'media': ('*.mp4*', '*.webm*', '*.mp3*', '*.ogg*'),
+    'analytics': ('*google-analytics.com*', '*googletagmanager.com*',
+                  '*doubleclick.net*', '*nr-data.net*', '*newrelic.com*',
+                  '*hotjar.com*', '*pendo.io*', '*fullstory.com*')
+}
+
+# The pages requests are blocked for, each of which can block more URLs.
+BLOCKING_PAGES = ('login', 'dashboard', 'pto')
+
+DATA_DIR = join(dirname(__file__), '..', '..', 'data')
+
+# Where the zone of the host is kept, used when an account does not name one.
+LOCAL_ZONE_PATH = '/etc/localtime'
+
+
+def local_zone() -> tzinfo:
+    """
+    Returns the timezone of the host, with its daylight saving rules when they
+    can be read, or else the current offset of the host.
+
+    Returns
+    -------
+    tzinfo
+    """
+    try:
+        with open(LOCAL_ZONE_PATH, 'rb') as zone_file:
+            return ZoneInfo.from_file(zone_file, 'localtime')
+    except (OSError, ValueError):
+        return datetime.now().astimezone().tzinfo
+
+
+class Secret:
+    """A value kept encrypted until it is needed.
+
+    Only the token is held, and it is decrypted each time the value is asked
+    for, so the plain value of every account is not kept in memory.
+
+    Attributes
+    ----------
+    _token : string
+        The encrypted value.
+
+    _cipher : callable
+        Returns the Fernet to decrypt with, loading the key the first time.
+
+    Methods
+    -------
+    reveal()
+        Decrypts the value.
+    """
+
+    __slots__ = ('_token', '_cipher')
+
+    def __init__(self, token: str, cipher: callable):
+        """
+        Creates a new instance of the Secret.
+
+        Parameters
+        ----------
+        token : string, required
+            The encrypted value.
+
+        cipher : callable, required
+            Returns the Fernet to decrypt with.
+        """
+        self._token = token
+        self._cipher = cipher
+
+    def reveal(self) -> str:
+        """
+        Decrypts the value.
+
+        Returns
+        -------
+        string
+
+        Raises
+        ------
+        ValueError
+            When the value cannot be decrypted with the key.
+        """
+        try:
+            return self._cipher().decrypt(self._token.encode()).decode()
+        except InvalidToken:
+            raise ValueError('A secret could not be decrypted with the key')
+
+    def __repr__(self) -> str:
+        """Keeps the token out of logs and error messages."""
+        return 'Secret(...)'
+
+
+class Settings(NamedTuple):
+    """Every setting, read from the environment once and then left alone.
+
+    Dictionaries are read only views, so nothing handed out can change the
+    snapshot. Values given encrypted are kept as Secrets.
+    """
+
+    login: Mapping
+    login_url: str
+    dashboard_url: str
+    implicit_wait: int
+    db_path: str
+    db_settings: Mapping
+    questions: Mapping
+    pager_duty_info: Mapping
+    pager_limits: Mapping
+    browser_limits: Mapping
+    browsers: int
+    start_hour: int
+    account_id: str
+    session_dir: str
+    session_key_path: str
+    punch_url: str
+    punch_backend: str
+    pto_refresh_hours: float
+    warm_up_seconds: float
+    after_punch_url: str
+    timezone: tzinfo
+    blocked_urls: Mapping
+    account_profiles: str
+
+
+def load_settings(environ: Mapping) -> Settings:
+    """
+    Reads and checks every setting, so a bad one is found at startup rather
+    than when it is first used. With account profiles, and no account of its
+    own, the environment only holds what the accounts share, so the settings
+    of an account are only checked once its profile is laid over it.
+
+    Parameters
+    ----------
+    environ : Mapping, required
+        The environment variables to read, such as os.environ.
+
+    Returns
+    -------
+    Settings
+
+    Raises
+    ------
+    ValueError
+        Listing every setting that is missing or cannot be used.
+    """
+    errors = []
+
+    def text(name: str, default: str = None) -> str:
+        return environ.get(name) or default
+
+    def number(name: str, default, cast=int, low=None, high=None):
+        value = environ.get(name) or default
+
+        # A missing required setting has already been noted.
+        if value is None:
+            return None
+
+        try:
+            value = cast(value)
+        except (TypeError, ValueError):
+            errors.append('%s must be a number, not %r' % (name, value))
+            return default
+
+        if low is not None and value < low:
+            errors.append('%s must be at least %s, not %s' % (name, low, value))
+        elif high is not None and value > high:
+            errors.append('%s must be at most %s, not %s' % (name, high, value))
+
+        return value
+
+    def choice(name: str, default: str, options) -> str:
+        value = (environ.get(name) or default).lower()
+
+        if value not in options:
+            errors.append(
+                '%s must be one of %s, not %r' % (name, ', '.join(options), value)
+            )
+
+        return value
+
+    account_profiles = text('ACCOUNT_PROFILES')
+    if account_profiles and not exists(account_profiles):
+        errors.append('ACCOUNT_PROFILES %r does not exist' % account_profiles)
+
+    shared = account_profiles and not text('ACCOUNT_ID')
+
+    for name in REQUIRED:
+        if not shared and not environ.get(name):
+            errors.append('%s is not set' % name)
+
+    synchronous = choice('DB_SYNCHRONOUS', 'NORMAL', SYNCHRONOUS_MODES).upper()
+
+    # A batch holds the write lock until it is committed, so the other
+    # connections must be willing to wait longer than that for it.
+    commit_interval = number('DB_COMMIT_INTERVAL', 1, float, low=0)
+    busy_timeout = number('DB_BUSY_TIMEOUT', 5, float, low=0)
+    if commit_interval >= busy_timeout:
+        errors.append(
+            'DB_COMMIT_INTERVAL must be less than DB_BUSY_TIMEOUT, %s is not '
+            'less than %s' % (commit_interval, busy_timeout)
+        )
+
+    punch_backend = choice('PUNCH_BACKEND', 'browser', PUNCH_BACKENDS)
+    if punch_backend == 'http' and not text('PAYLOCITY_PUNCH_URL'):
+        errors.append('PAYLOCITY_PUNCH_URL is needed to punch over http')
+
+    after_punch = choice('AFTER_PUNCH', 'blank', AFTER_PUNCH)
+    after_punch_url = AFTER_PUNCH.get(after_punch)
+    if after_punch == 'logout':
+        after_punch_url = text('PAYLOCITY_LOGOUT_URL')
+
+        if after_punch_url is None:
+            errors.append(
+                'PAYLOCITY_LOGOUT_URL is needed to log out after a punch'
+            )
+
+    blocked = []
+    resources = text('BLOCKED_RESOURCES', ','.join(RESOURCE_PATTERNS)).lower()
+    for resource in filter(None, map(str.strip, resources.split(','))):
+        if resource == 'none':
+            continue
+
+        if resource not in RESOURCE_PATTERNS:
+            errors.append(
+                'BLOCKED_RESOURCES must be made of %s or none, not %r'
+                % (', '.join(RESOURCE_PATTERNS), resource)
+            )
+            continue
+
+        blocked.extend(RESOURCE_PATTERNS[resource])
+
+    blocked_urls = {}
+    for page in BLOCKING_PAGES:
+        extra = text('BLOCKED_URLS_%s' % page.upper(), '').split(',')
+        blocked_urls[page] = tuple(blocked) + tuple(
+            pattern.strip() for pattern in extra if pattern.strip()
+        )
+
+    timezone = None
+    if text('TIMEZONE'):
+        try:
+            timezone = ZoneInfo(text('TIMEZONE'))
+        except (KeyError, ValueError):
+            errors.append('TIMEZONE %r is not a known zone' % text('TIMEZONE'))
+
+    settings = Settings(
+        login=MappingProxyType({
+            'companyId': text('COMPANY_CODE'),
+            'username': text('USERNAME'),
+            'password': text('PASSWORD')
+        }),
+        login_url=text('PAYLOCITY_LOGIN_URL'),
+        dashboard_url=text('PAYLOCITY_BASE_URL'),
+        implicit_wait=number('IMPLICIT_WAIT', None, low=0),
+        db_path=join(DATA_DIR, 'database.db'),
+        db_settings=MappingProxyType({
+            'synchronous': synchronous,
+            'cache_size': number('DB_CACHE_SIZE', -2000),
+            'commit_batch_size': number('DB_COMMIT_BATCH_SIZE', 1, low=1),
+            'commit_interval': commit_interval,
+            'busy_timeout': busy_timeout
+        }),
+        questions=MappingProxyType({
+            text('SECRET_Q_%d' % n): text('SECRET_A_%d' % n) for n in (1, 2, 3)
+        }),
+        pager_duty_info=MappingProxyType({
+            'from': text('EMAIL_ADDRESS'),
+            'password': text('EMAIL_PASSWORD'),
+            'to': text('SMS_GATEWAY')
+        }),
+        pager_limits=MappingProxyType({
+            'digest_seconds': number('PAGER_DIGEST_SECONDS', 0, float, low=0),
+            'messages_per_hour': number('PAGER_MESSAGES_PER_HOUR', 0, float, low=0),
+            'burst': number('PAGER_BURST', 3, low=1)
+        }),
+        browser_limits=MappingProxyType({
+            'max_jobs': number('BROWSER_MAX_JOBS', 50, low=1),
+            'max_hours': number('BROWSER_MAX_HOURS', 24, float, low=0),
+            'max_memory_mb': number('BROWSER_MAX_MB', 600, float, low=0)
+        }),
+        browsers=number('BROWSERS', 1, low=1),
+        start_hour=number('STARTING_HOUR', None, low=0, high=23),
+        account_id=text('ACCOUNT_ID'),
+        session_dir=join(DATA_DIR, 'sessions'),
+        session_key_path=join(DATA_DIR, 'session.key'),
+        punch_url=text('PAYLOCITY_PUNCH_URL'),
+        punch_backend=punch_backend,
+        pto_refresh_hours=number('PTO_REFRESH_HOURS', 72, float, low=0),
+        warm_up_seconds=number('WARM_UP_SECONDS', 120, float, low=0),
+        after_punch_url=after_punch_url,
+        timezone=timezone or local_zone(),
+        blocked_urls=MappingProxyType(blocked_urls),
+        account_profiles=account_profiles
+    )
+
+    if errors:
+        raise ValueError('Invalid settings:\n%s' % '\n'.join(errors))
+
+    return settings
@@ -1,26 +1,50 @@
+from contextlib import contextmanager
 from src.config import Config
+from threading import Lock, Timer, local
+from types import SimpleNamespace
 import sqlite3
 
 
+# The values SQLite accepts for PRAGMA synchronous.
+SYNCHRONOUS_MODES = ('OFF', 'NORMAL', 'FULL', 'EXTRA')
+
+
 class Database:
-    """A class that will handle Database interactions. 
-    
+    """A class that will handle Database interactions.
+
     The connection to the database will be managed by this class object. No ORM
     will be used as there are very few interactions.
 
+    Each thread is handed its own connection and cursor the first time it
+    uses the database, so workers running at the same time never share cursor
+    state. The methods below always act on the calling thread's connection.
+
+    Connections are opened in WAL mode, with the synchronous and cache size
+    pragmas taken from the config. When the config sets a commit batch size
+    above one, commits are grouped: they are flushed once the batch fills up,
+    or once the commit interval has passed, whichever comes first. A batch
+    holds the write lock until then, so the other connections wait for it up
+    to the busy timeout, which the config keeps longer than the interval.
+
     Attributes
     ----------
-    _cursor : Cursor
-        The cursor for the database.
+    _path : string
+        The path to the database file.
 
-    _db : Connection
-        A connection to the Database
+    _settings : dictionary
+        The pragmas and commit batching settings.
+
+    _local : local
+        Holds the state of each thread's connection.
+
+    _connections : list
+        The state of every connection opened so far.
+
+    _lock : Lock
+        Guards the list of connections.
 
     Methods
     -------
-    get_cursor()
-        Returns the cursor with the connection to the database.
-
     commit()
         Calls to commit the transaction.
 
@@ -35,6 +59,24 @@ class Database:
 
     get_last_row_id()
         On an insert, this will return the new row id if applicable.
+
+    unit_of_work()
+        Context manager grouping statements into a single transaction.
+
+    flush()
+        Commits the batched writes of every thread right away.
+
+    close()
+        Flushes, then closes the connections of every thread.
+
+    _thread()
+        Returns the calling thread's state, connecting if it is new.
+
+    _connect()
+        Opens a connection with the configured pragmas.
+
+    _flush(thread)
+        Commits the batched writes of the thread's connection.
     """
 
     def __init__(self, config: Config):
@@ -45,16 +87,50 @@ class Database:
         ----------
         config : Config
             Configuration object that loaded the .env file.
+
+        Raises
+        ------
+        ValueError
+            When the synchronous setting is not one SQLite knows.
         """
-        self._db = sqlite3.connect(
-            config.get_db_path(),
-            check_same_thread=False
-        )
-        self._cursor = self._db.cursor()
-    
+        self._path = config.get_db_path()
+        self._settings = config.get_db_settings()
+
+        if self._settings['synchronous'] not in SYNCHRONOUS_MODES:
+            raise ValueError(
+                'Unknown synchronous mode %s' % self._settings['synchronous']
+            )
+
+        self._local = local()
+        self._connections = []
+        self._lock = Lock()
+
     def commit(self) -> None:
-        """Commits the database transactions."""
-        self._db.commit()
+        """
+        Commits the database transactions. Inside a unit of work this waits
+        for the unit to finish instead, and with batching turned on it waits
+        for the batch to fill or the commit interval to pass.
+        """
+        thread = self._thread()
+
+        if thread.depth > 0:
+            return
+
+        with thread.lock:
+            thread.pending += 1
+
+            if thread.pending < self._settings['commit_batch_size']:
+                if thread.timer is None:
+                    thread.timer = Timer(
+                        self._settings['commit_interval'],
+                        self._flush,
+                        (thread,)
+                    )
+                    thread.timer.daemon = True
+                    thread.timer.start()
+                return
+
+        self._flush(thread)
 
     def execute(self, sql: str, data=()) -> None:
         """
@@ -68,7 +144,10 @@ class Database:
         data : tuple, optional
              The data to be inserted into the sql statement.
         """
-        self._cursor.execute(sql, data)
+        thread = self._thread()
+
+        with thread.lock:
+            thread.cursor.execute(sql, data)
 
     def fetchall(self) -> list:
         """
@@ -79,7 +158,7 @@ class Database:
         list
             The list of data returned from the query.
         """
-        return self._cursor.fetchall()
+        return self._thread().cursor.fetchall()
 
     def fetchone(self) -> any:
         """
@@ -90,8 +169,8 @@ class Database:
         tuple
             The list of data returned from the query.
         """
-        return self._cursor.fetchone()
-    
+        return self._thread().cursor.fetchone()
+
     def get_last_row_id(self) -> any:
         """
         Will return the last row id, generally used after an insert
@@ -101,4 +180,126 @@ class Database:
         int
             The value of the last row inserted.
         """
-        return self._cursor.lastrowid
+        return self._thread().cursor.lastrowid
+
+    @contextmanager
+    def unit_of_work(self):
+        """
+        Groups everything run inside it into one transaction on the calling
+        thread's connection. It is committed when the block finishes, or
+        rolled back if the block raises. Units of work can be nested, only the
+        outermost one commits.
+
+        Yields
+        ------
+        Database
+            This database, for convenience.
+        """
+        thread = self._thread()
+
+        # Batched writes from before must not be lost to a rollback.
+        if thread.depth == 0:
+            self._flush(thread)
+
+        thread.depth += 1
+
+        try:
+            yield self
+        except Exception:
+            thread.depth -= 1
+            if thread.depth == 0:
+                with thread.lock:
+                    thread.db.rollback()
+            raise
+
+        thread.depth -= 1
+        if thread.depth == 0:
+            self.commit()
+
+    def flush(self) -> None:
+        """Commits the batched writes of every thread right away."""
+        with self._lock:
+            connections = list(self._connections)
+
+        for thread in connections:
+            self._flush(thread)
+
+    def close(self) -> None:
+        """Flushes, then closes the connections of every thread."""
+        self.flush()
+
+        with self._lock:
+            for thread in self._connections:
+                thread.db.close()
+
+            self._connections = []
+
+        self._local = local()
+
+    def _thread(self) -> SimpleNamespace:
+        """
+        Returns the calling thread's connection state, connecting to the
+        database the first time the thread uses it.
+
+        Returns
+        -------
+        SimpleNamespace
+            Holds the thread's connection, cursor, unit of work depth, and
+            the writes waiting for a batched commit.
+        """
+        if not hasattr(self._local, 'state'):
+            db = self._connect()
+            self._local.state = SimpleNamespace(
+                db=db,
+                cursor=db.cursor(),
+                depth=0,
+                pending=0,
+                timer=None,
+                lock=Lock()
+            )
+
+            with self._lock:
+                self._connections.append(self._local.state)
+
+        return self._local.state
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Opens a connection, in WAL mode so readers do not block the writer,
+        with the configured synchronous and cache size pragmas.
+
+        Returns
+        -------
+        Connection
+        """
+        # Batched commits are flushed from a timer thread.
+        db = sqlite3.connect(
+            self._path,
+            timeout=self._settings['busy_timeout'],
+            check_same_thread=False
+        )
+
+        db.execute('PRAGMA journal_mode=WAL')
+        db.execute('PRAGMA synchronous=%s' % self._settings['synchronous'])
+        db.execute('PRAGMA cache_size=%d' % self._settings['cache_size'])
+
+        return db
+
+    def _flush(self, thread: SimpleNamespace) -> None:
+        """
+        Commits the writes waiting on the thread's connection, if there are
+        any, and stops the timer that would have done so.
+
+        Parameters
+        ----------
+        thread : SimpleNamespace, required
+            The state of the connection to commit.
+        """
+        with thread.lock:
+            if thread.timer is not None:
+                thread.timer.cancel()
+                thread.timer = None
+
+            if thread.pending:
+                thread.db.commit()
+                thread.pending = 0
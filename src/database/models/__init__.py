@@ -1,2 +1,3 @@
-from .holiday import Holiday
+from .holiday import Holiday, from_date_key, to_date_key
 from .punch import Punch
+from .time_off import TimeOff
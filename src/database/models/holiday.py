@@ -1,9 +1,42 @@
-from datetime import datetime
+from datetime import date, datetime
 from calendar import month_name
 from sqlite3 import OperationalError
 from src.database import Database
 
 
+def to_date_key(date: datetime) -> int:
+    """
+    Encodes the date as the integer YYYYMMDD, which sorts like the date.
+
+    Parameters
+    ----------
+    date : datetime, required
+        The date to encode.
+
+    Return
+    ----------
+    int
+        The date key, such as 20200101.
+    """
+    return date.year * 10000 + date.month * 100 + date.day
+
+
+def from_date_key(date_key: int) -> date:
+    """
+    Decodes a YYYYMMDD integer back into a date.
+
+    Parameters
+    ----------
+    date_key : int, required
+        The date key, such as 20200101.
+
+    Return
+    ----------
+    date
+    """
+    return date(date_key // 10000, date_key // 100 % 100, date_key % 100)
+
+
 class Holiday:
     """A class that will handle Database interactions with the holidays table. 
 
@@ -12,6 +45,9 @@ class Holiday:
     _connection : Database
         A connection to the Database
 
+    _holidays : set
+        The date key of every holiday, None until first loaded.
+
     Methods
     -------
     add_holiday(date)
@@ -20,11 +56,17 @@ class Holiday:
     get_row_id_by_date(date)
         Returns the row ID for the given date passed in.
 
+    get_holidays_between(start, end)
+        Returns the holidays from start to end, inclusive.
+
     is_holiday(date)
         Determines if the given date is a holiday.
 
     remove_holiday(date)
         Removes a holiday from the database.
+
+    _load()
+        Reads every holiday in the table into memory, once.
     """
 
     def __init__(self, connection: Database):
@@ -37,7 +79,8 @@ class Holiday:
             The database connection.
         """
         self._connection = connection
-    
+        self._holidays = None
+
     def add_holiday(self, date: datetime) -> int:
         """
         Adds a record to the database to create a holiday.
@@ -52,8 +95,9 @@ class Holiday:
         int
             On successful insert, returns row ID. On fail, return -1
         """
-        sql = 'INSERT INTO holidays(month, day, year) VALUES(?, ?, ?)'
-        data = (month_name[date.month], date.day, date.year,)
+        # The month, day and year are still written for older readers.
+        sql = 'INSERT INTO holidays(month, day, year, date_key) VALUES(?, ?, ?, ?)'
+        data = (month_name[date.month], date.day, date.year, to_date_key(date),)
 
         try:
             self._connection.execute(sql, data)
@@ -62,6 +106,9 @@ class Holiday:
             print(exception)
             return -1
 
+        if self._holidays is not None:
+            self._holidays.add(to_date_key(date))
+
         return self._connection.get_last_row_id()
     
     def get_row_id_by_date(self, date: datetime) -> int:
@@ -78,17 +125,52 @@ class Holiday:
         int
             The ID of the row for the holiday found, -1 on error or not found.
         """
-        sql = 'SELECT id FROM holidays WHERE month=? AND day=? AND year=?'
-        data = (month_name[date.month], date.day, date.year,)
+        sql = 'SELECT id FROM holidays WHERE date_key=?'
+        data = (to_date_key(date),)
 
         try:
             self._connection.execute(sql, data)
-            row = self._connection.fetchall()[0]
+            row = self._connection.fetchone()
         except OperationalError:
             return -1
 
+        if row is None:
+            return -1
+
         return row[0]
 
+    def get_holidays_between(self, start: datetime, end: datetime) -> list:
+        """
+        Finds the holidays from start to end, using the index on date_key.
+
+        Parameters
+        ----------
+        start : datetime, required
+            The first day of the range.
+
+        end : datetime, required
+            The last day of the range, inclusive.
+
+        Return
+        ----------
+        list
+            The dates of the holidays in order, empty on error.
+        """
+        sql = '''
+            SELECT date_key FROM holidays
+            WHERE date_key BETWEEN ? AND ?
+            ORDER BY date_key
+        '''
+        data = (to_date_key(start), to_date_key(end),)
+
+        try:
+            self._connection.execute(sql, data)
+            rows = self._connection.fetchall()
+        except OperationalError:
+            return []
+
+        return [from_date_key(row[0]) for row in rows]
+
     def is_holiday(self, date: datetime) -> bool:
         """
         Checks if the month-day-year combination is a holiday.
@@ -103,17 +185,13 @@ class Holiday:
         bool
             True if day is a holiday.
         """
-        sql = 'SELECT * FROM holidays WHERE month=? AND day=? AND year=?;'
-        data = (month_name[date.month], date.day, date.year,)
-
         try:
-            self._connection.execute(sql, data)
-            results = self._connection.fetchall()
+            holidays = self._load()
         except OperationalError:
             # In this case we'll just consider it a holiday and not clock
             return True
 
-        return len(results) != 0
+        return to_date_key(date) in holidays
 
     def remove_holiday(self, record_id: int) -> bool:
         """
@@ -138,5 +216,24 @@ class Holiday:
         except OperationalError:
             print('Could not delete record.')
             return False
-        
+
+        # The date of the record is not known here, so read them all again.
+        self._holidays = None
+
         return True
+
+    def _load(self) -> set:
+        """
+        Reads every holiday's date key into a set, the first time it is
+        needed. Later lookups do not touch the database.
+
+        Return
+        ----------
+        set
+            The date key of every holiday.
+        """
+        if self._holidays is None:
+            self._connection.execute('SELECT date_key FROM holidays')
+            self._holidays = {row[0] for row in self._connection.fetchall()}
+
+        return self._holidays
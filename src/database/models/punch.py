@@ -11,6 +11,15 @@ class Punch:
     _connection : Database
         A connection to the Database.
 
+    _account_id : string
+        The account whose punches are tracked, None for a single account.
+
+    _rows : dictionary
+        Rows already read or written, as lists, keyed by ID.
+
+    _current_id : int
+        The ID of the most recent day's row, None until it is known.
+
     Methods
     -------
     get_punch_by_id(id_)
@@ -28,7 +37,7 @@ class Punch:
     out(datetime)
         Updates the punch card to have the time the day ended.
 
-    insert_new_day()
+    insert_new_day(day)
         Adds a new day to the table for tracking punches.
 
     get_most_recent_day()
@@ -40,11 +49,14 @@ class Punch:
     update_is_work_day(is_work_day)
         Updates the punch day to determine if punches are needed or not.
 
-    _update_punch(datetime, sql)
+    _update_punch(datetime, sql, position)
         This private method handles updating the punches for the day.
+
+    _cache(row)
+        Keeps the row as the most recent day.
     """
 
-    def __init__(self, connection: Database):
+    def __init__(self, connection: Database, account_id: str = None):
         """
         Creates a new instance of the Punch model object.
 
@@ -52,8 +64,15 @@ class Punch:
         ----------
         connection : Database, required
             Holds on to database connection.
+
+        account_id : string, optional
+            The account whose punches are tracked, when several share a table.
         """
         self._connection = connection
+        self._account_id = account_id
+
+        self._rows = {}
+        self._current_id = None
 
     def get_punch_by_id(self, id_: int) -> tuple:
         """
@@ -69,6 +88,9 @@ class Punch:
         tuple
             The row, an empty tuple on failure.
         """
+        if id_ in self._rows:
+            return tuple(self._rows[id_])
+
         sql = 'SELECT * FROM punches WHERE id=?'
         data = (id_,)
 
@@ -94,7 +116,7 @@ class Punch:
             True on successful insert.
         """
         sql = 'UPDATE punches SET clock_in=? WHERE id=?'
-        return self._update_punch(datetime_obj, sql)
+        return self._update_punch(datetime_obj, sql, 3)
 
     def start(self, datetime_obj: datetime) -> bool:
         """
@@ -111,7 +133,7 @@ class Punch:
             True on successful update.
         """
         sql = 'UPDATE punches SET lunch_start=? WHERE id=?'
-        return self._update_punch(datetime_obj, sql)
+        return self._update_punch(datetime_obj, sql, 4)
 
     def end(self, datetime_obj: datetime) -> bool:
         """
@@ -128,7 +150,7 @@ class Punch:
             True on successful update.
         """
         sql = 'UPDATE punches SET lunch_end=? WHERE id=?'
-        return self._update_punch(datetime_obj, sql)
+        return self._update_punch(datetime_obj, sql, 5)
 
     def out(self, datetime_obj: datetime) -> bool:
         """
@@ -145,20 +167,26 @@ class Punch:
             True on successful update.
         """
         sql = 'UPDATE punches SET clock_out=? WHERE id=?'
-        return self._update_punch(datetime_obj, sql)
+        return self._update_punch(datetime_obj, sql, 6)
 
-    def insert_new_day(self) -> bool:
+    def insert_new_day(self, day: date = None) -> bool:
         """
         Adds a new day to the datatable for tracking if there needs punches or
         for skipping the day entirely.
 
+        Parameters
+        ----------
+        day : date, optional
+            The day in the timezone of the account, today on the host if not
+            given.
+
         Returns
         -------
         bool
             True on successful insert, false otherwise.
         """
-        sql = 'INSERT INTO punches(punch_day) VALUES(?)'
-        data = (date.today(),)
+        sql = 'INSERT INTO punches(punch_day, account_id) VALUES(?, ?)'
+        data = (day or date.today(), self._account_id,)
 
         try:
             self._connection.execute(sql, data)
@@ -166,25 +194,46 @@ class Punch:
         except OperationalError:
             return False
 
+        # Older days are done with, only the new one needs to be kept.
+        self._rows = {}
+        self._cache((
+            self._connection.get_last_row_id(), str(data[0]),
+            None, None, None, None, None, self._account_id
+        ))
+
         return True
 
     def get_most_recent_day(self) -> tuple:
         """
-        This will return the last row inserted into the table.
+        This will return the last row inserted into the table. It is only
+        read from the database the first time, after that the cached copy is
+        kept up to date by the writes.
 
         Returns
         -------
         tuple
             Returns a tuple of the row of data.
         """
-        sql = 'SELECT * FROM punches ORDER BY id DESC LIMIT 1'
+        if self._current_id is not None:
+            return tuple(self._rows[self._current_id])
+
+        sql = (
+            'SELECT * FROM punches WHERE account_id IS ? '
+            'ORDER BY id DESC LIMIT 1'
+        )
+        data = (self._account_id,)
 
         try:
-            self._connection.execute(sql)
+            self._connection.execute(sql, data)
         except OperationalError:
             return ()
-        
-        return self._connection.fetchone()
+
+        row = self._connection.fetchone()
+
+        if row is not None:
+            self._cache(row)
+
+        return row
 
     def is_work_day(self) -> bool:
         """Returns whether today is a work day or not."""
@@ -206,7 +255,8 @@ class Punch:
             True on successful update, False otherwise.
         """
         sql = 'UPDATE punches SET is_work_day=? WHERE id=?'
-        data = (is_work_day, self.get_most_recent_day()[0],)
+        id_ = self.get_most_recent_day()[0]
+        data = (is_work_day, id_,)
 
         try:
             self._connection.execute(sql, data)
@@ -214,9 +264,13 @@ class Punch:
         except OperationalError:
             return False
 
+        # Booleans are stored, and read back, as integers.
+        if id_ in self._rows:
+            self._rows[id_][2] = int(is_work_day)
+
         return True
 
-    def _update_punch(self, datetime_obj: datetime, sql: str) -> bool:
+    def _update_punch(self, datetime_obj: datetime, sql: str, position: int) -> bool:
         """
         Will run the given sql with the datetime, updating the most recently
         inserted row in the table for the given punch, passed in via the sql.
@@ -229,6 +283,9 @@ class Punch:
         sql : string, required
             The sql for the column to update.
 
+        position : int, required
+            The position of the column in the row, to update the cached copy.
+
         Returns
         -------
         bool
@@ -243,4 +300,20 @@ class Punch:
         except OperationalError:
             return False
 
+        # Stored the way the database gives datetimes back, as strings.
+        if id_ in self._rows:
+            self._rows[id_][position] = str(datetime_obj)
+
         return True
+
+    def _cache(self, row: tuple) -> None:
+        """
+        Keeps a copy of the row as the most recent day.
+
+        Parameters
+        ----------
+        row : tuple, required
+            The row of the punches table.
+        """
+        self._rows[row[0]] = list(row)
+        self._current_id = row[0]
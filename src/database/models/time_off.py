@@ -0,0 +1,209 @@
+from datetime import datetime
+from sqlite3 import OperationalError
+from src.database import Database
+from src.records import PtoRecord
+from .holiday import from_date_key, to_date_key
+
+
+class TimeOff:
+    """A class that will handle Database interactions with the pto table.
+
+    The table holds the approved days off read from the PTO grid, as ranges of
+    date keys, so a day off can be found with one indexed query. A second
+    table remembers when each account's grid was last read.
+
+    Attributes
+    ----------
+    _connection : Database
+        A connection to the Database
+
+    _account_id : string
+        The account whose days off are read and written, None for a single
+        account.
+
+    Methods
+    -------
+    sync(records, now)
+        Writes the approved records, only touching the rows that changed.
+
+    get_records()
+        Returns the stored days off, in order.
+
+    get_synced_at()
+        Returns when the grid was last synced.
+
+    is_pto_day(date)
+        Determines if the given date is an approved day off.
+    """
+
+    def __init__(self, connection: Database, account_id: str = None):
+        """
+        Creates a new instance of the TimeOff model object.
+
+        Parameters
+        ----------
+        connection: Database, required
+            The database connection.
+
+        account_id : string, optional
+            The account whose days off are kept.
+        """
+        self._connection = connection
+        self._account_id = account_id
+
+    def sync(self, records: list, now: datetime) -> int:
+        """
+        Brings the table in line with the records read from the grid. Rows
+        are keyed by their first day, new ones are inserted, changed ones are
+        updated and the ones no longer approved are deleted. Rows that did not
+        change are not written.
+
+        Parameters
+        ----------
+        records : list, required
+            The PtoRecords read from the grid.
+
+        now : datetime, required
+            When the records were read.
+
+        Return
+        ----------
+        int
+            The number of rows written, -1 on error.
+        """
+        wanted = {
+            to_date_key(record.start): (to_date_key(record.end), record.hours)
+            for record in records if record.is_approved
+        }
+        changes = 0
+
+        try:
+            with self._connection.unit_of_work():
+                self._connection.execute(
+                    'SELECT id, start_key, end_key, hours FROM pto WHERE account_id IS ?',
+                    (self._account_id,)
+                )
+                stored = {
+                    row[1]: (row[0], (row[2], row[3]))
+                    for row in self._connection.fetchall()
+                }
+
+                for start_key, (end_key, hours) in wanted.items():
+                    row_id, values = stored.pop(start_key, (None, None))
+
+                    if row_id is None:
+                        self._connection.execute(
+                            '''
+                            INSERT INTO pto(account_id, start_key, end_key, hours)
+                            VALUES(?, ?, ?, ?)
+                            ''',
+                            (self._account_id, start_key, end_key, hours,)
+                        )
+                    elif values != (end_key, hours):
+                        self._connection.execute(
+                            'UPDATE pto SET end_key=?, hours=? WHERE id=?',
+                            (end_key, hours, row_id,)
+                        )
+                    else:
+                        continue
+
+                    changes += 1
+
+                for row_id, _ in stored.values():
+                    self._connection.execute('DELETE FROM pto WHERE id=?', (row_id,))
+                    changes += 1
+
+                self._connection.execute(
+                    'DELETE FROM pto_syncs WHERE account_id IS ?',
+                    (self._account_id,)
+                )
+                self._connection.execute(
+                    'INSERT INTO pto_syncs(account_id, synced_at) VALUES(?, ?)',
+                    (self._account_id, str(now),)
+                )
+        except OperationalError as exception:
+            print(exception)
+            return -1
+
+        return changes
+
+    def get_records(self) -> list:
+        """
+        Returns the stored days off for the account.
+
+        Return
+        ----------
+        list
+            An approved PtoRecord for each row, in order, empty on error.
+        """
+        sql = '''
+            SELECT start_key, end_key, hours FROM pto
+            WHERE account_id IS ?
+            ORDER BY start_key
+        '''
+        data = (self._account_id,)
+
+        try:
+            self._connection.execute(sql, data)
+            rows = self._connection.fetchall()
+        except OperationalError:
+            return []
+
+        return [
+            PtoRecord(from_date_key(start), from_date_key(end), hours, 'Approved')
+            for start, end, hours in rows
+        ]
+
+    def get_synced_at(self) -> datetime:
+        """
+        Returns when the account's grid was last synced.
+
+        Return
+        ----------
+        datetime
+            The time of the last sync, None if there has not been one.
+        """
+        sql = 'SELECT synced_at FROM pto_syncs WHERE account_id IS ?'
+        data = (self._account_id,)
+
+        try:
+            self._connection.execute(sql, data)
+            row = self._connection.fetchone()
+        except OperationalError:
+            return None
+
+        if row is None:
+            return None
+
+        return datetime.fromisoformat(row[0])
+
+    def is_pto_day(self, date: datetime) -> bool:
+        """
+        Checks if the date falls within an approved day off.
+
+        Parameters
+        ----------
+        date : datetime, required
+            The date to check against the database.
+
+        Return
+        ----------
+        bool
+            True if the day is an approved day off.
+        """
+        sql = '''
+            SELECT 1 FROM pto
+            WHERE account_id IS ? AND start_key <= ? AND end_key >= ?
+            LIMIT 1
+        '''
+        date_key = to_date_key(date)
+        data = (self._account_id, date_key, date_key,)
+
+        try:
+            self._connection.execute(sql, data)
+            row = self._connection.fetchone()
+        except OperationalError:
+            # In this case we'll just consider it a day off and not clock
+            return True
+
+        return row is not None
@@ -1,4 +1,6 @@
-from .dashboard import Dashboard
+from .blocking import RequestBlocker
+from .dashboard import Dashboard, LAST_PUNCH_ID, parse_last_punch
+from .locator import Locator
 from .login import Login
-from .pto import PaidTimeOff
+from .pto import PaidTimeOff, PtoRecord
 from .question import Question
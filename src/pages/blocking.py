@@ -0,0 +1,87 @@
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.webdriver import WebDriver
+from threading import Lock
+from typing import Mapping
+from weakref import WeakKeyDictionary
+
+
+class RequestBlocker:
+    """Has the browser refuse the requests a page can do without.
+
+    Chrome blocks requests by URL pattern, for every tab, until told
+    otherwise. Each page object asks for its own patterns before it loads,
+    and the browser is only told when they change, so moving between pages
+    blocking the same URLs costs nothing.
+
+    Attributes
+    ----------
+    _blocked : WeakKeyDictionary
+        The patterns each browser was last told to block, shared by every
+        instance.
+
+    _lock : Lock
+        Guards the patterns shared between the instances.
+
+    _driver : WebDriver
+        The driver of the browser to block requests in.
+
+    _blocked_urls : Mapping
+        The URL patterns to block on each page.
+
+    Methods
+    -------
+    block(page)
+        Blocks the URLs of the page, before it is loaded.
+    """
+
+    _blocked = WeakKeyDictionary()
+    _lock = Lock()
+
+    def __init__(self, driver: WebDriver, blocked_urls: Mapping = None):
+        """
+        Creates a new instance of the RequestBlocker.
+
+        Parameters
+        ----------
+        driver : WebDriver, required
+            The chrome driver used to navigate around the browser.
+
+        blocked_urls : Mapping, optional
+            The URL patterns to block on each page, nothing if not given.
+        """
+        self._driver = driver
+        self._blocked_urls = blocked_urls or {}
+
+    def block(self, page: str) -> None:
+        """
+        Blocks the URLs of the page, and lets through any others that were
+        blocked. Browsers that cannot block requests are left alone, as the
+        page still works, only slower.
+
+        Parameters
+        ----------
+        page : string, required
+            The page about to be loaded, such as login, dashboard or pto.
+        """
+        patterns = tuple(self._blocked_urls.get(page, ()))
+
+        with RequestBlocker._lock:
+            previous = RequestBlocker._blocked.get(self._driver)
+
+        # A browser that was never told to block anything blocks nothing.
+        if patterns == (previous or ()):
+            return
+
+        try:
+            if previous is None:
+                self._driver.execute_cdp_cmd('Network.enable', {})
+
+            self._driver.execute_cdp_cmd(
+                'Network.setBlockedURLs', {'urls': list(patterns)}
+            )
+        except (AttributeError, WebDriverException) as exception:
+            print('Could not block requests for the %s page: %s' % (page, exception))
+            return
+
+        with RequestBlocker._lock:
+            RequestBlocker._blocked[self._driver] = patterns
@@ -1,6 +1,42 @@
+from .blocking import RequestBlocker
+from .locator import Locator, WAIT_SECONDS
 from .pto import PaidTimeOff
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
 from selenium.webdriver.chrome.webdriver import WebDriver
+from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webelement import WebElement
+from typing import Mapping
+
+
+# The id of the element on the dashboard showing the latest punch.
+LAST_PUNCH_ID = 'LastPunch'
+
+# The punches, in the order they are checked for in the latest punch's text.
+PUNCHES = ('Clock In', 'Start Lunch', 'End Lunch', 'Clock Out')
+
+
+def parse_last_punch(text: str) -> str:
+    """
+    Finds which punch the text of the latest punch describes, such as
+    'Clock In 8:01 AM'.
+
+    Parameters
+    ----------
+    text : string, required
+        The text of the element showing the latest punch.
+
+    Returns
+    -------
+    string
+        The name of the punch, None if the text names none of them.
+    """
+    text = ' '.join(text.split()).lower()
+
+    for punch in PUNCHES:
+        if punch.lower() in text:
+            return punch
+
+    return None
 
 
 class Dashboard:
@@ -11,6 +47,21 @@ class Dashboard:
     _driver : WebDriver
         This is the instance of the web driver used to navigate.
 
+    _timeout : float
+        The most seconds to wait for an element.
+
+    _locator : Locator
+        Waits for each element of the page as it is needed.
+
+    _leave_to : string
+        Where to go once a punch has registered, None to stay.
+
+    _blocked_urls : Mapping
+        The URL patterns the browser blocks on each page.
+
+    _blocker : RequestBlocker
+        Keeps the browser from loading what the pages do not need.
+
     Methods
     -------
     clock_in()
@@ -28,11 +79,20 @@ class Dashboard:
     go_to_pto()
         Navigate to the page containing PTO.
 
+    get_last_punch()
+        Reads which punch the dashboard shows as the latest.
+
     _click_and_nav_away(element)
-        Click on the provided element, and navigate to www.google.com
+        Click on the provided element, read the latest punch, then leave.
     """
 
-    def __init__(self, driver: WebDriver):
+    def __init__(
+        self,
+        driver: WebDriver,
+        timeout: float = WAIT_SECONDS,
+        leave_to: str = 'about:blank',
+        blocked_urls: Mapping = None
+    ):
         """
         Creates a new instance of the Dashboard page object.
 
@@ -40,28 +100,70 @@ class Dashboard:
         ----------
         driver : WebDriver
             The chrome driver used to navigate around the browser.
+
+        timeout : float, optional
+            The most seconds to wait for an element.
+
+        leave_to : string, optional
+            Where to go once a punch has registered, None to stay.
+
+        blocked_urls : Mapping, optional
+            The URL patterns the browser blocks on each page.
         """
         self._driver = driver
+        self._timeout = timeout
+        self._locator = Locator(driver, timeout)
+        self._leave_to = leave_to
+        self._blocked_urls = blocked_urls
+        self._blocker = RequestBlocker(driver, blocked_urls)
+
+    def clock_in(self) -> str:
+        """
+        Finds the element to clock in, and sends to _click_and_nav.
+
+        Returns
+        -------
+        string
+            The latest punch shown once the page reloaded.
+        """
+        clock_in_element = self._locator.clickable(By.NAME, 'ClockIn')
+        return self._click_and_nav_away(clock_in_element)
+
+    def start_lunch(self) -> str:
+        """
+        Finds the element to start lunch, and sends to _click_and_nav.
 
-    def clock_in(self) -> None:
-        """Finds the element to clock in, and sends to _click_and_nav."""
-        clock_in_element = self._driver.find_element_by_name('ClockIn')
-        self._click_and_nav_away(clock_in_element)
+        Returns
+        -------
+        string
+            The latest punch shown once the page reloaded.
+        """
+        start_lunch_element = self._locator.clickable(By.NAME, 'StartLunch')
+        return self._click_and_nav_away(start_lunch_element)
 
-    def start_lunch(self) -> None:
-        """Finds the element to start lunch, and sends to _click_and_nav."""
-        start_lunch_element = self._driver.find_element_by_name('StartLunch')
-        self._click_and_nav_away(start_lunch_element)
+    def end_lunch(self) -> str:
+        """
+        Finds the element to end lunch, and sends to _click_and_nav.
 
-    def end_lunch(self) -> None:
-        """Finds the element to end lunch, and sends to _click_and_nav."""
-        end_lunch_element = self._driver.find_element_by_name('EndLunch')
-        self._click_and_nav_away(end_lunch_element)
+        Returns
+        -------
+        string
+            The latest punch shown once the page reloaded.
+        """
+        end_lunch_element = self._locator.clickable(By.NAME, 'EndLunch')
+        return self._click_and_nav_away(end_lunch_element)
 
-    def clock_out(self) -> None:
-        """Finds the element to clock out, and sends to _click_and_nav."""
-        clock_out_element = self._driver.find_element_by_name('ClockOut')
-        self._click_and_nav_away(clock_out_element)
+    def clock_out(self) -> str:
+        """
+        Finds the element to clock out, and sends to _click_and_nav.
+
+        Returns
+        -------
+        string
+            The latest punch shown once the page reloaded.
+        """
+        clock_out_element = self._locator.clickable(By.NAME, 'ClockOut')
+        return self._click_and_nav_away(clock_out_element)
 
     def go_to_pto(self) -> PaidTimeOff:
         """
@@ -73,21 +175,70 @@ class Dashboard:
             The PTO page object to handle finding PTO.
         """
         path = '//a[text()="Launch Time & Attendance"]'
-        self._driver.find_element_by_xpath(path).click()
-        return PaidTimeOff(self._driver)
+        link = self._locator.clickable(By.XPATH, path)
+
+        self._blocker.block('pto')
+        link.click()
+
+        return PaidTimeOff(self._driver, self._timeout, self._blocked_urls)
 
-    def _click_and_nav_away(self, element: WebElement) -> None:
+    def get_last_punch(self) -> str:
+        """
+        Reads which punch the dashboard shows as the latest.
+
+        Returns
+        -------
+        string
+            The name of the punch, None if it could not be read.
+        """
+        try:
+            element = self._locator.visible(By.ID, LAST_PUNCH_ID)
+        except NoSuchElementException:
+            return None
+
+        return parse_last_punch(element.text)
+
+    def _click_and_nav_away(self, element: WebElement) -> str:
         """Clicks on provided element and navigates away from Paylocity.
 
-        The only reason to navigate away from Paylocity is to simulate logging
-        out of the service. It is unnecessary to close and re-open the web
-        browser regularly. Further, it does not make sense to stay on the
-        Paylocity web page, just to have it log use out due to expired session.
+        Clicking the button submits the punch form, which reloads the page.
+        Waiting for the button to go stale confirms the punch was sent, and
+        the latest punch is read from the reloaded page before leaving.
+        Leaving for a blank page, rather than a full external site, avoids a
+        load of its own, while staying keeps the page open for the next
+        punch.
 
         Parameters
         ----------
         element : WebElement, required
             The web element that should be clicked on.
+
+        Returns
+        -------
+        string
+            The latest punch shown once the page reloaded, None if it could
+            not be read.
+
+        Raises
+        ------
+        TimeoutException
+            When the page did not reload after the click. The punch may have
+            been sent, so it must not be sent again.
         """
+        # The punch reloads the dashboard.
+        self._blocker.block('dashboard')
         element.click()
-        self._driver.get('https://www.google.com')
+
+        try:
+            self._locator.stale(element)
+        except NoSuchElementException as exception:
+            raise TimeoutException(
+                'The dashboard did not reload after the punch'
+            ) from exception
+
+        last_punch = self.get_last_punch()
+
+        if self._leave_to is not None:
+            self._driver.get(self._leave_to)
+
+        return last_punch
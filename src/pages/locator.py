@@ -0,0 +1,251 @@
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from selenium.webdriver.chrome.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
+from selenium.webdriver.support import expected_conditions as ec
+from selenium.webdriver.support.ui import WebDriverWait
+
+
+# The most seconds to wait for an element, unless told otherwise.
+WAIT_SECONDS = 10
+
+# How often the page is checked while waiting.
+POLL_SECONDS = 0.1
+
+
+class first_of_located:
+    """An expectation that one of several elements is present on the page.
+
+    The locators are checked in order on each poll, so whichever page shows
+    up first wins, rather than waiting out the timeout on the other.
+
+    Attributes
+    ----------
+    _locators : dictionary
+        The (by, value) locator of each element, by name.
+    """
+
+    def __init__(self, locators: dict):
+        """
+        Creates a new instance of the expectation.
+
+        Parameters
+        ----------
+        locators : dictionary, required
+            The (by, value) locator of each element, by name.
+        """
+        self._locators = locators
+
+    def __call__(self, driver: WebDriver):
+        """
+        Checks the page for each of the elements.
+
+        Parameters
+        ----------
+        driver : WebDriver, required
+            The driver to search with.
+
+        Returns
+        -------
+        tuple
+            The name of the element found and the element, False while none
+            have been found.
+        """
+        for name, locator in self._locators.items():
+            elements = driver.find_elements(*locator)
+
+            if elements:
+                return name, elements[0]
+
+        return False
+
+
+class Locator:
+    """Finds elements on the page by waiting for each one explicitly.
+
+    Rather than a driver wide implicit wait, which stalls for the whole wait
+    whenever an element is missing, each lookup waits only for the element,
+    and the condition, it needs. A lookup that times out raises the same
+    NoSuchElementException the driver would.
+
+    Attributes
+    ----------
+    _driver : WebDriver
+        The driver used to find the elements.
+
+    _timeout : float
+        The most seconds to wait for an element.
+
+    Methods
+    -------
+    find(by, value)
+        Waits for the element to be present.
+
+    visible(by, value)
+        Waits for the element to be displayed.
+
+    clickable(by, value)
+        Waits for the element to be displayed and enabled.
+
+    first_of(locators)
+        Waits for whichever of the elements shows up first.
+
+    stale(element)
+        Waits for the element to be taken off the page.
+
+    _wait(condition, description)
+        Waits for the condition, raising if it is not met in time.
+    """
+
+    def __init__(self, driver: WebDriver, timeout: float = WAIT_SECONDS):
+        """
+        Creates a new instance of the Locator.
+
+        Parameters
+        ----------
+        driver : WebDriver, required
+            The chrome driver used to navigate around the browser.
+
+        timeout : float, optional
+            The most seconds to wait for an element.
+        """
+        self._driver = driver
+        self._timeout = timeout
+
+    def find(self, by: str, value: str) -> WebElement:
+        """
+        Waits for the element to be present on the page.
+
+        Parameters
+        ----------
+        by : string, required
+            How to locate the element, such as By.ID.
+
+        value : string, required
+            The value to locate the element by.
+
+        Returns
+        -------
+        WebElement
+
+        Raises
+        ------
+        NoSuchElementException
+            When the element did not show up in time.
+        """
+        return self._wait(ec.presence_of_element_located((by, value)), value)
+
+    def visible(self, by: str, value: str) -> WebElement:
+        """
+        Waits for the element to be displayed on the page.
+
+        Parameters
+        ----------
+        by : string, required
+            How to locate the element, such as By.ID.
+
+        value : string, required
+            The value to locate the element by.
+
+        Returns
+        -------
+        WebElement
+
+        Raises
+        ------
+        NoSuchElementException
+            When the element was not displayed in time.
+        """
+        return self._wait(ec.visibility_of_element_located((by, value)), value)
+
+    def clickable(self, by: str, value: str) -> WebElement:
+        """
+        Waits for the element to be displayed and enabled.
+
+        Parameters
+        ----------
+        by : string, required
+            How to locate the element, such as By.ID.
+
+        value : string, required
+            The value to locate the element by.
+
+        Returns
+        -------
+        WebElement
+
+        Raises
+        ------
+        NoSuchElementException
+            When the element could not be clicked in time.
+        """
+        return self._wait(ec.element_to_be_clickable((by, value)), value)
+
+    def first_of(self, locators: dict) -> tuple:
+        """
+        Waits for whichever of the elements shows up first.
+
+        Parameters
+        ----------
+        locators : dictionary, required
+            The (by, value) locator of each element, by name.
+
+        Returns
+        -------
+        tuple
+            The name of the element that showed up, and the element.
+
+        Raises
+        ------
+        NoSuchElementException
+            When none of the elements showed up in time.
+        """
+        return self._wait(first_of_located(locators), ', '.join(locators))
+
+    def stale(self, element: WebElement) -> None:
+        """
+        Waits for the element to be taken off the page, such as when the
+        form it submitted loads the next page.
+
+        Parameters
+        ----------
+        element : WebElement, required
+            The element to wait on.
+
+        Raises
+        ------
+        NoSuchElementException
+            When the element was still on the page after the timeout.
+        """
+        self._wait(ec.staleness_of(element), 'the page to reload')
+
+    def _wait(self, condition: callable, description: str) -> any:
+        """
+        Waits for the condition to be met.
+
+        Parameters
+        ----------
+        condition : callable, required
+            The expectation to wait on.
+
+        description : string, required
+            What is being waited on, for the error.
+
+        Returns
+        -------
+        any
+            Whatever the condition returned once met.
+
+        Raises
+        ------
+        NoSuchElementException
+            When the condition was not met in time.
+        """
+        wait = WebDriverWait(self._driver, self._timeout, POLL_SECONDS)
+
+        try:
+            return wait.until(condition)
+        except TimeoutException:
+            raise NoSuchElementException(
+                'Timed out after %s seconds waiting for %s'
+                % (self._timeout, description)
+            )
@@ -1,6 +1,9 @@
 from src.config import Config
+from .blocking import RequestBlocker
+from .locator import Locator
 from .question import Question
 from selenium.webdriver.chrome.webdriver import WebDriver
+from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 
 
@@ -15,6 +18,12 @@ class Login:
     _driver : WebDriver
         This is the instance of the web driver used to navigate.
 
+    _locator : Locator
+        Waits for each element of the page as it is needed.
+
+    _blocker : RequestBlocker
+        Keeps the browser from loading what the pages do not need.
+
     Methods
     -------
     login()
@@ -35,6 +44,8 @@ class Login:
         """
         self._config = config
         self._driver = driver
+        self._locator = Locator(driver, config.get_implicit_wait())
+        self._blocker = RequestBlocker(driver, config.get_blocked_urls())
 
     def login(self) -> Question:
         """
@@ -47,22 +58,24 @@ class Login:
         """
         payload = self._config.get_login()
 
+        self._blocker.block('login')
         self._driver.get(self._config.get_login_url())
 
         # Insert the company ID for PayLease
-        input_company_id = self._driver.find_element_by_id("CompanyId")
+        input_company_id = self._locator.visible(By.ID, "CompanyId")
         input_company_id.send_keys(payload['companyId'])
 
         # Insert given username.
-        input_username = self._driver.find_element_by_id("Username")
+        input_username = self._locator.visible(By.ID, "Username")
         input_username.send_keys(payload['username'])
 
         # Insert the super top secret password
-        input_password = self._driver.find_element_by_id("Password")
+        input_password = self._locator.visible(By.ID, "Password")
         input_password.send_keys(payload['password'])
 
         # Just send return while still in the password field.
         # No need to actually click the submit button.
+        self._blocker.block('dashboard')
         input_password.send_keys(Keys.RETURN)
 
         # Nine times out of 10, we should be on the dashboard.
@@ -2,16 +2,20 @@ from datetime import datetime
 from datetime import timedelta
 from selenium.webdriver.chrome.webdriver import WebDriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as ec
-from selenium.common.exceptions import TimeoutException
-import time
+from src.records import PtoRecord
+from typing import Mapping
+from .blocking import RequestBlocker
+from .locator import Locator, WAIT_SECONDS
+import math
 
 
 DATE = 0
 STATUS = 4
 HOURS = 2
 
+# A day off is an 8 hour period.
+HOURS_PER_DAY = 8
+
 
 class PaidTimeOff:
     """A class that will handle find the PTO approvals.
@@ -25,13 +29,27 @@ class PaidTimeOff:
     _driver : Webdriver
         The driver controlling the web browser.
 
+    _locator : Locator
+        Waits for each element of the page as it is needed.
+
+    _blocker : RequestBlocker
+        Keeps the browser from loading what the pages do not need.
+
     Methods
     -------
-    is_pto_day()
-        Navigates to the PTO page.
+    is_pto_day(date)
+        Returns true if the date is an approved PTO day.
+
+    get_pto_records()
+        Returns every request for time off in the grid.
     """
 
-    def __init__(self, driver: WebDriver):
+    def __init__(
+        self,
+        driver: WebDriver,
+        timeout: float = WAIT_SECONDS,
+        blocked_urls: Mapping = None
+    ):
         """
         Creates a new instance of the PaidTimeOff page object.
 
@@ -39,8 +57,16 @@ class PaidTimeOff:
         ----------
         driver : WebDriver, required
             The chrome driver used to navigate around the browser.
+
+        timeout : float, optional
+            The most seconds to wait for an element.
+
+        blocked_urls : Mapping, optional
+            The URL patterns the browser blocks on each page.
         """
         self._driver = driver
+        self._locator = Locator(driver, timeout)
+        self._blocker = RequestBlocker(driver, blocked_urls)
 
     def is_pto_day(self, date: datetime) -> bool:
         """
@@ -57,24 +83,44 @@ class PaidTimeOff:
         bool
             Returns True if the day is a PTO day, False otherwise.
         """
-        self._driver.find_element_by_id('tabStatus').click()
+        return any(
+            self._determine_date_is_pto(record, date)
+            for record in self.get_pto_records()
+        )
+
+    def get_pto_records(self) -> list:
+        """
+        Reads every row of the PTO grid, then returns to the dashboard.
+
+        Returns
+        -------
+        list
+            A PtoRecord for each row of the grid, rows that cannot be read
+            are skipped.
+        """
+        self._locator.clickable(By.ID, 'tabStatus').click()
 
-        is_pto = self._determine_date_is_pto(self._get_pto_row(), date)
+        records = []
+        for row in self._get_pto_rows():
+            try:
+                records.append(self._parse_row(row))
+            except (IndexError, ValueError):
+                print('Could not read PTO row: %s' % ' '.join(row))
 
         self._navigate_back_to_dash()
 
-        return is_pto
+        return records
 
     @staticmethod
-    def _determine_date_is_pto(nearest_pto: list, date: datetime) -> bool:
+    def _determine_date_is_pto(record: PtoRecord, date: datetime) -> bool:
         """
-        This private function analyzes the row passed in to see if the given
-        date is an approved PTO day.
+        This private function checks the record to see if the given date is
+        an approved PTO day.
 
         Parameters
         ----------
-        nearest_pto : array, required
-            Each column is split into a position in the array.
+        record : PtoRecord, required
+            The request for time off.
 
         date : datetime, required
             The date that is being compared against the range of requested days
@@ -86,55 +132,55 @@ class PaidTimeOff:
             Will return False if the day is not approved, or not in the range.
             It will return True otherwise.
         """
-        # Early return if the PTO day is not approved.
-        if nearest_pto[STATUS] != 'Approved':
-            return False
+        if isinstance(date, datetime):
+            date = date.date()
+
+        return record.is_approved and record.start <= date <= record.end
+
+    @staticmethod
+    def _parse_row(row: list) -> PtoRecord:
+        """
+        Turns a row of the grid, split into its columns, into a PtoRecord.
+
+        Parameters
+        ----------
+        row : list, required
+            Each column is split into a position in the list.
 
-        # Get the first day of the approved time off.
-        first_date = datetime.strptime(nearest_pto[DATE], '%m/%d/%Y')
+        Returns
+        -------
+        PtoRecord
+            The request for time off the row describes.
+        """
+        start = datetime.strptime(row[DATE], '%m/%d/%Y').date()
+        hours = float(row[HOURS])
 
-        # A day off is an 8 hour period. But it needs to be 0 based.
-        days_approved = (int(nearest_pto[HOURS]) / 8) - 1
-        end_day = first_date + timedelta(days=days_approved)
+        # Part of a day off still takes the whole day.
+        days = max(math.ceil(hours / HOURS_PER_DAY), 1)
+        end = start + timedelta(days=days - 1)
 
-        return first_date <= date <= end_day
+        return PtoRecord(start, end, hours, row[STATUS])
 
-    def _get_pto_row(self) -> list:
+    def _get_pto_rows(self) -> list:
         """
-        Returns an array based on column of each value in the last row.
+        Returns every row of the grid, each split into its columns.
 
         Returns
         -------
         list
-            A list of the row data from the paid time off page.
+            A list of the rows from the paid time off page.
         """
-        # Locate the div containing the approved PTO
-        parent = self._driver.find_element_by_id('BenefitsWidget')
-
-        # Get the table containing the rows of the time off.
-        table = parent.find_element_by_class_name('k-grid-content')
+        # Get the table, in the div containing the approved PTO, holding the
+        # rows of the time off.
+        table = self._locator.visible(
+            By.CSS_SELECTOR, '#BenefitsWidget .k-grid-content'
+        )
 
-        # Get the text out of the table, split on '\n' then get the last row.
-        # The last row contains the closest date to that which is requested off.
-        rows = table.text.split('\n')
-        return rows.pop().split(' ')
+        # Get the text out of the table, one row per line.
+        return [row.split(' ') for row in table.text.split('\n') if row]
 
     def _navigate_back_to_dash(self) -> None:
-        """Returns back to the dashboard page."""
-        self._driver.find_element_by_class_name('unav-main-menu-title').click()
-
-        element = None
-        try:
-            element = WebDriverWait(self._driver, 1).until(
-                ec.visibility_of_element_located(
-                    (By.CLASS_NAME, 'unav-drawer-item-title')
-                )
-            )
-        except TimeoutException:
-            # Sleep for 3 extra seconds with hopes the menu opens up.
-            time.sleep(3)
-            element = self._driver.find_element_by_class_name(
-                'unav-drawer-item-title'
-            )
-        finally:
-            element.click()
+        """Returns back to the dashboard page, once the menu has opened."""
+        self._blocker.block('dashboard')
+        self._locator.clickable(By.CLASS_NAME, 'unav-main-menu-title').click()
+        self._locator.clickable(By.CLASS_NAME, 'unav-drawer-item-title').click()
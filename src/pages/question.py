@@ -1,10 +1,19 @@
 from src.config import Config
 from .dashboard import Dashboard
+from .locator import Locator
 from selenium.common.exceptions import NoSuchElementException
 from selenium.webdriver.chrome.webdriver import WebDriver
+from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 
 
+# What marks the dashboard and the secret question page, whichever loads.
+LANDING_PAGES = {
+    'dashboard': (By.CLASS_NAME, 'header-nav'),
+    'question': (By.ID, 'ChallengeAnswer')
+}
+
+
 class Question:
     """A class that will handle answering the secret question.
 
@@ -22,6 +31,9 @@ class Question:
     _driver : Webdriver
         The driver controlling the web browser.
 
+    _locator : Locator
+        Waits for each element of the page as it is needed.
+
     Methods
     -------
     is_on_question_page()
@@ -46,24 +58,23 @@ class Question:
         """
         self._config = config
         self._driver = driver
+        self._locator = Locator(driver, config.get_implicit_wait())
 
     def is_on_question_page(self) -> bool:
         """
         Returns true if the browser landed on the question page.
-        
-        This is a little tricky to read. However, if it is successful in finding
-        the element with the class 'header-nav', then it immediately returns
-        False, which signifies landing on the dashboard (which should be the
-        case most of the time). If it takes 10 seconds to try and find the
-        element, but it cannot, it returns true, because that element is on the
-        dashboard, and we are on the question page.
+
+        It waits for either the dashboard's 'header-nav' or the question's
+        answer box, whichever shows up first, so landing on either page is
+        known as soon as it loads. If neither shows up in time, it is assumed
+        to be the question page, as it is not the dashboard.
         """
         try:
-            self._driver.find_element_by_class_name('header-nav')
+            landed, _ = self._locator.first_of(LANDING_PAGES)
         except NoSuchElementException:
             return True
 
-        return False
+        return landed == 'question'
 
     def answer_question(self) -> Dashboard:
         """
@@ -78,13 +89,18 @@ class Question:
 
         # Step 1: Figure out what the question is.
         path = '//label[@for="%s"]' % element_id
-        secret_question = self._driver.find_element_by_xpath(path).text
+        secret_question = self._locator.visible(By.XPATH, path).text
 
         # Step 2: Enter text into box.
-        answer_box = self._driver.find_element_by_id(element_id)
+        answer_box = self._locator.visible(By.ID, element_id)
         answer_box.send_keys(self._config.get_questions()[secret_question])
 
         # Step 3: Hit enter to submit rather than finding the button.
         answer_box.send_keys(Keys.RETURN)
         
-        return Dashboard(self._driver)
+        return Dashboard(
+            self._driver,
+            self._config.get_implicit_wait(),
+            self._config.get_after_punch_url(),
+            self._config.get_blocked_urls()
+        )
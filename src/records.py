@@ -0,0 +1,16 @@
+from datetime import date
+from typing import NamedTuple
+
+
+class PtoRecord(NamedTuple):
+    """A single request for time off, as shown in the PTO grid."""
+
+    start: date
+    end: date
+    hours: float
+    status: str
+
+    @property
+    def is_approved(self) -> bool:
+        """Returns true if the time off has been approved."""
+        return self.status == 'Approved'
@@ -1,2 +1,12 @@
 from .pager_duty import PagerDuty, GMAIL_DOMAIN
 from .punch_card_manager import PunchCardManager
+from .punch_scheduler import PunchScheduler
+from .driver_pool import DriverPool
+from .browser_workers import BrowserWorkers
+from .chrome import chrome_options
+from .account_manager import AccountManager
+from .async_account_manager import AsyncAccountManager
+from .session_store import SessionStore
+from .http_punch_client import HttpPunchClient
+from .token_bucket import TokenBucket
+from .pto_index import PtoIndex
@@ -0,0 +1,247 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from queue import Empty, Queue
+from requests import Session
+from smtplib import SMTP_SSL
+from src.config import Config
+from src.database import Database
+from src.database.models import Holiday, Punch, TimeOff
+from sys import exc_info
+from .http_punch_client import HttpPunchClient
+from .pager_duty import PagerDuty
+from .punch_card_manager import PunchCardManager
+from .punch_scheduler import PunchScheduler
+
+
+# How long to wait before trying an account again after it crashed.
+RETRY_SECONDS = 60
+
+
+class AccountManager:
+    """Runs the punch cards of many accounts from a single process.
+
+    Every account keeps its own PunchCardManager and punch schedule. This
+    class only tracks when each of them next needs attention, and hands that
+    work to a bounded pool of workers sharing a small set of browsers. The
+    browsers are either drivers lent to the workers, or worker processes the
+    managers send their browser work to.
+
+    Attributes
+    ----------
+    _drivers : DriverPool
+        The browsers shared between all of the accounts, None when the
+        browsers run in worker processes.
+
+    _browsers : BrowserWorkers
+        The worker processes running the browsers, None when drivers are
+        shared instead.
+
+    _sessions : SessionStore
+        Keeps the login cookies of every account across restarts.
+
+    _workers : int
+        The most accounts to work on at the same time.
+
+    _managers : dictionary
+        The punch card manager of each account, by account ID.
+
+    _pagers : dictionary
+        The pager of each account, by account ID.
+
+    _databases : dictionary
+        The database, and its holiday model, shared by accounts using the
+        same database file.
+
+    _scheduler : PunchScheduler
+        When each account next needs attention.
+
+    _finished : Queue
+        Accounts the workers are done with, and how long until they are due.
+
+    _running : bool
+        Whether the manager should keep dispatching work.
+
+    Methods
+    -------
+    add_account(config)
+        Sets up the models, pager and punch card manager for the account.
+
+    start()
+        Dispatches each account to the workers whenever it is due.
+
+    stop()
+        Stops dispatching once the running work is done.
+
+    _run(account_id)
+        Does what is due for the account, then hands it back.
+
+    _work(account_id)
+        Gives the account a browser and lets its manager do what is due.
+    """
+
+    def __init__(self, args: dict):
+        """
+        Instantiates the account manager.
+
+        Parameters
+        ----------
+        args : dictionary, required
+            Holds the account configs, either the shared drivers or the
+            browser worker processes, and optionally the session store and
+            the number of workers, which defaults to one per browser.
+        """
+        self._drivers = args.get('drivers')
+        self._browsers = args.get('browsers')
+        self._sessions = args.get('sessions')
+        self._workers = args.get(
+            'workers', len(self._browsers or self._drivers)
+        )
+
+        self._managers = {}
+        self._pagers = {}
+        self._databases = {}
+
+        for config in args['configs']:
+            self.add_account(config)
+
+        self._scheduler = PunchScheduler()
+        self._finished = Queue()
+        self._running = False
+
+    def add_account(self, config: Config) -> None:
+        """
+        Sets up the models, pager and punch card manager for the account.
+
+        Parameters
+        ----------
+        config : Config, required
+            The configuration of the account.
+
+        Raises
+        ------
+        ValueError
+            When the account has no ID, or the ID is already used.
+        """
+        account_id = config.get_account_id()
+
+        if account_id is None or account_id in self._managers:
+            raise ValueError('Each account needs a unique ID, got %s' % account_id)
+
+        # The database hands each worker thread its own connection, so
+        # accounts on the same file share it, along with the holidays.
+        path = config.get_db_path()
+        if path not in self._databases:
+            connection = Database(config)
+            self._databases[path] = (connection, Holiday(connection))
+
+        connection, holiday = self._databases[path]
+        pager = PagerDuty(config, SMTP_SSL())
+
+        http = None
+        if config.get_punch_backend() == 'http':
+            http = HttpPunchClient(config, Session())
+
+        self._pagers[account_id] = pager
+        self._managers[account_id] = PunchCardManager({
+            'config': config,
+            'driver': None,
+            'holiday': holiday,
+            'http': http,
+            'pager': pager,
+            'time_off': TimeOff(connection, account_id),
+            'punch': Punch(connection, account_id),
+            'sessions': self._sessions,
+            'browsers': self._browsers
+        })
+
+    def start(self) -> None:
+        """Dispatches each account to the workers whenever it is due."""
+        self._running = True
+
+        for account_id, manager in self._managers.items():
+            manager.prepare()
+            self._scheduler.schedule(datetime.now(timezone.utc), account_id)
+
+        with ThreadPoolExecutor(max_workers=self._workers) as pool:
+            while self._running:
+                wait = self._scheduler.seconds_until_next(datetime.now(timezone.utc))
+
+                if wait == 0:
+                    pool.submit(self._run, self._scheduler.pop()[1])
+                    continue
+
+                # Sleep until the next account is due, or one is handed back.
+                try:
+                    finished = self._finished.get(
+                        timeout=wait if wait > 0 else None
+                    )
+                except Empty:
+                    continue
+
+                if finished is None:
+                    continue
+
+                account_id, seconds = finished
+                due = datetime.now(timezone.utc) + timedelta(seconds=seconds)
+                self._scheduler.schedule(due, account_id)
+
+        # Send any pages still queued, then commit any batched writes, before
+        # handing back.
+        for pager in self._pagers.values():
+            pager.close()
+
+        for connection, _ in self._databases.values():
+            connection.close()
+
+    def stop(self) -> None:
+        """Stops dispatching, letting the work already running finish."""
+        self._running = False
+        self._finished.put(None)
+
+    def _run(self, account_id: str) -> None:
+        """
+        Does whatever is due for the account, then hands it back with how
+        long until it is due again.
+
+        Parameters
+        ----------
+        account_id : string, required
+            The account to work on.
+        """
+        self._finished.put((account_id, self._work(account_id)))
+
+    def _work(self, account_id: str) -> float:
+        """
+        Lends the account a browser and lets its manager do whatever is due.
+        A crash is paged to the account, and the account is tried again
+        later.
+
+        Parameters
+        ----------
+        account_id : string, required
+            The account to work on.
+
+        Returns
+        -------
+        float
+            The seconds until the account is due again.
+        """
+        manager = self._managers[account_id]
+
+        try:
+            if self._drivers is None:
+                # The browser work is sent on to the worker processes.
+                wait = manager.run_pending(datetime.now(timezone.utc))
+            else:
+                with self._drivers.acquire(account_id) as driver:
+                    manager.set_driver(driver)
+                    wait = manager.run_pending(datetime.now(timezone.utc))
+        except Exception:
+            exception_type, value = exc_info()[:2]
+            self._pagers[account_id].alert(
+                'Account %s crashed.\nException - %s\nValue - %s' %
+                (account_id, exception_type, value)
+            )
+            wait = RETRY_SECONDS
+
+        return wait
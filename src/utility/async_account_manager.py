@@ -0,0 +1,124 @@
+from concurrent.futures import ThreadPoolExecutor
+from .account_manager import AccountManager
+import asyncio
+
+
+# The most threads the blocking work of the accounts is run in by default.
+PLANNERS = 32
+
+
+class AsyncAccountManager(AccountManager):
+    """Runs the punch cards of many accounts from a single event loop.
+
+    Each account is a task that sleeps until it is next due, so an account
+    waiting on its next punch costs no more than the task. SQLite, SMTP and
+    Selenium only offer blocking calls, so the work that is due is handed to
+    a pool of planner threads and awaited. The pool is not sized by the
+    browsers, so planning from the database carries on while a login holds
+    every browser. Only the browser jobs are limited to the number of
+    browsers, by the browsers themselves. Pages are sent from each pager's
+    own thread, and only closing them is awaited.
+
+    Attributes
+    ----------
+    _planners : int
+        The most threads the blocking work of the accounts is run in.
+
+    _loop : AbstractEventLoop
+        The loop the accounts run on, None when not running.
+
+    _stopped : Event
+        Set to stop every account, waking any that are sleeping.
+
+    Methods
+    -------
+    start()
+        Runs every account on a new event loop until stopped.
+
+    serve()
+        Runs every account on the running event loop until stopped.
+
+    stop()
+        Stops every account once its running work is done.
+
+    _serve(account_id, pool)
+        Works on the account each time it is due.
+    """
+
+    def __init__(self, args: dict):
+        """
+        Instantiates the account manager.
+
+        Parameters
+        ----------
+        args : dictionary, required
+            Holds the account configs, either the shared drivers or the
+            browser worker processes, and optionally the session store and
+            the number of planner threads, which defaults to PLANNERS.
+        """
+        super().__init__(args)
+
+        self._planners = args.get('planners', PLANNERS)
+
+        self._loop = None
+        self._stopped = None
+
+    def start(self) -> None:
+        """Runs every account on a new event loop until stopped."""
+        asyncio.run(self.serve())
+
+    async def serve(self) -> None:
+        """Runs every account on the running event loop until stopped."""
+        self._loop = asyncio.get_running_loop()
+        self._stopped = asyncio.Event()
+        self._running = True
+
+        with ThreadPoolExecutor(max_workers=self._planners) as pool:
+            await asyncio.gather(*(
+                self._serve(account_id, pool) for account_id in self._managers
+            ))
+
+            # Send any pages still queued, then commit any batched writes,
+            # before handing back.
+            await asyncio.gather(*(
+                self._loop.run_in_executor(pool, pager.close)
+                for pager in self._pagers.values()
+            ))
+
+            for connection, _ in self._databases.values():
+                await self._loop.run_in_executor(pool, connection.close)
+
+        self._loop = None
+
+    def stop(self) -> None:
+        """
+        Stops every account once its running work is done. This can be
+        called from any thread, such as a signal handler or a worker.
+        """
+        self._running = False
+
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._stopped.set)
+
+    async def _serve(self, account_id: str, pool: ThreadPoolExecutor) -> None:
+        """
+        Does whatever is due for the account, then sleeps until it is due
+        again, until the manager is stopped.
+
+        Parameters
+        ----------
+        account_id : string, required
+            The account to work on.
+
+        pool : ThreadPoolExecutor, required
+            The planner threads the blocking work is run in.
+        """
+        await self._loop.run_in_executor(pool, self._managers[account_id].prepare)
+
+        while not self._stopped.is_set():
+            wait = await self._loop.run_in_executor(pool, self._work, account_id)
+
+            try:
+                await asyncio.wait_for(self._stopped.wait(), wait)
+            except asyncio.TimeoutError:
+                pass
@@ -0,0 +1,709 @@
+from multiprocessing import get_context
+from multiprocessing.connection import Connection
+from os.path import join
+from selenium.common.exceptions import (
+    ElementClickInterceptedException,
+    ElementNotInteractableException,
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+    WebDriverException
+)
+from threading import Condition, Timer
+from .driver_pool import hand_over
+import os
+import pickle
+import signal
+import time
+
+
+# How many seconds a job may take before its worker is taken to be hung.
+JOB_TIMEOUT = 300
+
+# How many jobs a worker runs before it is replaced with a fresh browser.
+MAX_JOBS = 50
+
+# How many hours a worker runs before it is replaced with a fresh browser.
+MAX_HOURS = 24
+
+# How often the idle workers are checked for being worn out.
+CHECK_SECONDS = 300
+
+# Where the memory of the processes is read from.
+PROC_DIR = '/proc'
+
+# How many seconds a worker is given to quit its browser before it is killed.
+STOP_SECONDS = 10
+
+# The driver errors about the page, which leave the browser working. Any
+# other driver error means the browser crashed, hung or lost its session.
+PAGE_ERRORS = (
+    ElementClickInterceptedException,
+    ElementNotInteractableException,
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException
+)
+
+
+def serve_jobs(
+    connection: Connection,
+    make_driver: callable,
+    build_manager: callable
+) -> None:
+    """
+    Runs in each worker process. Starts a browser, then calls the methods of
+    the account managers sent over the connection, sending back what each
+    returned or raised, until told to stop.
+
+    Parameters
+    ----------
+    connection : Connection, required
+        The worker's end of the pipe to the pool.
+
+    make_driver : callable, required
+        Starts the browser of the worker.
+
+    build_manager : callable, required
+        Builds the PunchCardManager of an account, given its ID and the
+        browser.
+    """
+    # The browser is started in a process group of its own, so a hung worker
+    # can be killed along with it.
+    if hasattr(os, 'setsid'):
+        os.setsid()
+
+    driver = make_driver()
+    managers = {}
+    owner = None
+
+    try:
+        while True:
+            try:
+                job = connection.recv()
+            except EOFError:
+                break
+
+            if job is None:
+                break
+
+            account_id, method, args = job
+
+            try:
+                # An account never picks up the session of another.
+                if owner not in (None, account_id):
+                    hand_over(driver)
+                owner = account_id
+
+                if account_id not in managers:
+                    managers[account_id] = build_manager(account_id, driver)
+
+                result = ('done', getattr(managers[account_id], method)(*args))
+            except Exception as exception:
+                result = ('error', exception)
+
+            try:
+                connection.send(result)
+            except (AttributeError, TypeError, pickle.PicklingError):
+                connection.send(('error', RuntimeError(repr(result[1]))))
+    finally:
+        driver.quit()
+
+
+def group_memory_mb(group: int) -> float:
+    """
+    Adds up the resident memory of every process in the group, such as a
+    worker along with its driver and browser processes.
+
+    Parameters
+    ----------
+    group : int, required
+        The ID of the process group.
+
+    Returns
+    -------
+    float
+        The memory in megabytes, 0 where it cannot be read.
+    """
+    try:
+        names = os.listdir(PROC_DIR)
+        page_size = os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return 0
+
+    pages = 0
+    for name in names:
+        if not name.isdigit():
+            continue
+
+        try:
+            with open(join(PROC_DIR, name, 'stat')) as stat_file:
+                stat = stat_file.read()
+
+            with open(join(PROC_DIR, name, 'statm')) as statm_file:
+                resident = int(statm_file.read().split()[1])
+        except (OSError, IndexError, ValueError):
+            # The process ended while being read.
+            continue
+
+        # The name of the command may hold spaces, the fields after it do not.
+        fields = stat.rsplit(')', 1)[1].split()
+
+        if int(fields[2]) == group:
+            pages += resident
+
+    return pages * page_size / 2 ** 20
+
+
+class BrowserWorker:
+    """One worker process, driving its own browser.
+
+    Attributes
+    ----------
+    jobs : int
+        The number of jobs the current process has run.
+
+    started_at : float
+        When the current process was started, from the monotonic clock.
+
+    _context : BaseContext
+        Starts the process.
+
+    _target : tuple
+        The browser and manager builders handed to the process.
+
+    _process : Process
+        The worker process, None until started.
+
+    _connection : Connection
+        The pool's end of the pipe to the process.
+
+    Methods
+    -------
+    start()
+        Starts a new worker process.
+
+    is_alive()
+        Returns true if the process is still running.
+
+    memory_mb()
+        Returns the memory used by the process and its browser.
+
+    call(account_id, method, args, timeout)
+        Runs the job in the process, waiting for the result.
+
+    stop()
+        Asks the process to quit its browser, killing it if it does not.
+
+    kill()
+        Kills the process along with its browser.
+
+    recycle()
+        Starts a fresh process, then stops the old one.
+
+    _stop(process, connection)
+        Asks the process to quit its browser, killing it if it does not.
+    """
+
+    def __init__(self, context, make_driver: callable, build_manager: callable):
+        """
+        Creates a new instance of the BrowserWorker, without starting it.
+
+        Parameters
+        ----------
+        context : BaseContext, required
+            The multiprocessing context to start the process with.
+
+        make_driver : callable, required
+            Starts the browser of the worker, in the worker.
+
+        build_manager : callable, required
+            Builds the PunchCardManager of an account, in the worker.
+        """
+        self.jobs = 0
+        self.started_at = None
+
+        self._context = context
+        self._target = (make_driver, build_manager)
+        self._process = None
+        self._connection = None
+
+    def start(self) -> None:
+        """Starts a new worker process."""
+        connection, child = self._context.Pipe()
+
+        self._process = self._context.Process(
+            target=serve_jobs, args=(child,) + self._target, daemon=True
+        )
+        self._process.start()
+
+        # Only the worker holds its end, so a crash is seen as the pipe closing.
+        child.close()
+
+        self._connection = connection
+        self.jobs = 0
+        self.started_at = time.monotonic()
+
+    def is_alive(self) -> bool:
+        """Returns true if the worker process is still running."""
+        return self._process is not None and self._process.is_alive()
+
+    def memory_mb(self) -> float:
+        """
+        Returns the memory used by the worker process, its driver and its
+        browser, which all share the worker's process group.
+
+        Returns
+        -------
+        float
+            The memory in megabytes, 0 where it cannot be read.
+        """
+        return group_memory_mb(self._process.pid)
+
+    def call(self, account_id: str, method: str, args: tuple, timeout: float) -> any:
+        """
+        Runs the method of the account's manager in the worker process.
+
+        Parameters
+        ----------
+        account_id : string, required
+            The account whose manager is called.
+
+        method : string, required
+            The name of the method to call.
+
+        args : tuple, required
+            The arguments to call the method with.
+
+        timeout : float, required
+            The most seconds to wait for the result.
+
+        Returns
+        -------
+        any
+            Whatever the method returned.
+
+        Raises
+        ------
+        ChildProcessError
+            When the worker or its browser crashed, or did not finish in
+            time.
+
+        Exception
+            Whatever else the method raised.
+        """
+        try:
+            self._connection.send((account_id, method, args))
+            finished = self._connection.poll(timeout)
+
+            if finished:
+                status, value = self._connection.recv()
+        except (EOFError, OSError):
+            raise ChildProcessError(
+                'The browser worker of %s died during %s' % (account_id, method)
+            )
+
+        if not finished:
+            raise ChildProcessError(
+                'The browser worker of %s took over %s seconds on %s'
+                % (account_id, timeout, method)
+            )
+
+        self.jobs += 1
+
+        if status != 'error':
+            return value
+
+        # A worker whose browser is gone is no use, so it is replaced.
+        if isinstance(value, WebDriverException) and not isinstance(value, PAGE_ERRORS):
+            raise ChildProcessError(
+                'The browser of %s failed during %s: %s'
+                % (account_id, method, value)
+            ) from value
+
+        raise value
+
+    def stop(self) -> None:
+        """Asks the worker to quit its browser, killing it if it does not."""
+        self._stop(self._process, self._connection)
+
+    def kill(self) -> None:
+        """Kills the worker process, along with the browser it started."""
+        try:
+            os.killpg(self._process.pid, signal.SIGKILL)
+        except (AttributeError, OSError):
+            self._process.kill()
+
+        self._process.join()
+        self._connection.close()
+
+    def recycle(self) -> None:
+        """
+        Replaces the process with a fresh one. The new browser is started
+        first, so it is warming up while the old one quits.
+        """
+        process, connection = self._process, self._connection
+
+        self.start()
+        self._stop(process, connection)
+
+    @staticmethod
+    def _stop(process, connection: Connection) -> None:
+        """
+        Asks the process to quit its browser, killing it along with the
+        browser if it does not in time.
+
+        Parameters
+        ----------
+        process : Process, required
+            The worker process.
+
+        connection : Connection, required
+            The pool's end of the pipe to the process.
+        """
+        try:
+            connection.send(None)
+        except OSError:
+            pass
+
+        process.join(STOP_SECONDS)
+
+        if process.is_alive():
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except (AttributeError, OSError):
+                process.kill()
+
+            process.join()
+
+        connection.close()
+
+
+class BrowserWorkers:
+    """A supervised pool of worker processes, each driving its own browser.
+
+    Browser work is sent to the workers as jobs, each a call to a method of an
+    account's PunchCardManager, made by a copy of that manager built in the
+    worker around the worker's browser. The browsers are spread over the
+    cores, and the scheduler never waits on one beyond the job timeout.
+
+    A worker that crashes, or hangs past the timeout, is killed along with
+    its browser and replaced, and the job raises a ChildProcessError instead
+    of taking the scheduler down.
+
+    A browser grows over weeks of uptime, so a worker is also replaced once
+    it has run a number of jobs, been running a number of hours, or uses
+    more memory than the watermark. Workers are checked after each job, and
+    every few minutes while idle, so the fresh browser is already started
+    before the next punch needs it.
+
+    Each worker builds the managers from settings of its own, so reload()
+    has every worker replaced before its next job, once the settings change.
+
+    Attributes
+    ----------
+    _timeout : float
+        The most seconds a job may take.
+
+    _max_jobs : int
+        How many jobs a worker runs before it is replaced.
+
+    _max_seconds : float
+        How long a worker runs before it is replaced, 0 for no limit.
+
+    _max_memory_mb : float
+        The memory a worker and its browser may use, 0 for no limit.
+
+    _reloaded_at : float
+        When the settings were last reloaded, from the monotonic clock.
+
+    _workers : list
+        Every worker of the pool.
+
+    _idle : list
+        The workers not currently running a job, least recently used first.
+
+    _owners : dictionary
+        The account each worker last ran a job for.
+
+    _available : Condition
+        Signals waiting callers when a worker is handed back.
+
+    _check_timer : Timer
+        Checks the idle workers next, None once closed.
+
+    Methods
+    -------
+    run(account_id, method, *args)
+        Runs the method of the account's manager in a worker.
+
+    reload()
+        Replaces every worker, so the managers are built again.
+
+    close()
+        Stops every worker, quitting their browsers.
+
+    _take(account_id)
+        Removes the best idle worker for the account from the idle list.
+
+    _replace(worker)
+        Kills the worker and starts a new one in its place.
+
+    _is_worn(worker)
+        Returns true if the worker should be replaced with a fresh one.
+
+    _check_idle()
+        Replaces the idle workers that are worn out.
+
+    _schedule_check()
+        Checks the idle workers again in a few minutes.
+    """
+
+    def __init__(
+        self,
+        make_driver: callable,
+        build_manager: callable,
+        size: int = 1,
+        timeout: float = JOB_TIMEOUT,
+        max_jobs: int = MAX_JOBS,
+        max_hours: float = MAX_HOURS,
+        max_memory_mb: float = 0
+    ):
+        """
+        Creates a new instance of the BrowserWorkers, starting the workers.
+
+        The builders are handed to the new processes, so they must be
+        functions importable from a module, or partials of them.
+
+        Parameters
+        ----------
+        make_driver : callable, required
+            Starts the browser of a worker, taking no arguments.
+
+        build_manager : callable, required
+            Builds the PunchCardManager of an account, given its ID and the
+            worker's browser.
+
+        size : int, optional
+            The number of workers.
+
+        timeout : float, optional
+            The most seconds a job may take.
+
+        max_jobs : int, optional
+            How many jobs a worker runs before it is replaced.
+
+        max_hours : float, optional
+            How many hours a worker runs before it is replaced, 0 for no
+            limit.
+
+        max_memory_mb : float, optional
+            The megabytes a worker and its browser may use before it is
+            replaced, 0 for no limit.
+        """
+        self._timeout = timeout
+        self._max_jobs = max_jobs
+        self._max_seconds = max_hours * 3600
+        self._max_memory_mb = max_memory_mb
+        self._reloaded_at = 0.0
+
+        # Spawned, rather than forked, as the parent is running threads.
+        context = get_context('spawn')
+        self._workers = [
+            BrowserWorker(context, make_driver, build_manager)
+            for _ in range(size)
+        ]
+
+        for worker in self._workers:
+            worker.start()
+
+        self._idle = list(self._workers)
+        self._owners = {}
+        self._available = Condition()
+
+        self._check_timer = None
+        self._schedule_check()
+
+    def __len__(self) -> int:
+        """Returns the number of workers in the pool."""
+        return len(self._workers)
+
+    def run(self, account_id: str, method: str, *args) -> any:
+        """
+        Runs the method of the account's manager in an idle worker, waiting
+        for one if they are all busy. A worker that already ran a job for
+        the account is preferred, as its browser holds the account's session.
+
+        Parameters
+        ----------
+        account_id : string, required
+            The account whose manager is called.
+
+        method : string, required
+            The name of the method to call.
+
+        *args
+            The arguments to call the method with.
+
+        Returns
+        -------
+        any
+            Whatever the method returned.
+
+        Raises
+        ------
+        ChildProcessError
+            When the worker or its browser crashed, or did not finish in
+            time. The worker is replaced.
+
+        Exception
+            Whatever else the method raised.
+        """
+        with self._available:
+            while not self._idle:
+                self._available.wait()
+
+            worker = self._take(account_id)
+
+        try:
+            # A worker that died while idle is started again, and one that
+            # still holds the old settings is replaced.
+            if not worker.is_alive():
+                worker.start()
+                self._owners.pop(worker, None)
+            elif worker.started_at < self._reloaded_at:
+                worker.recycle()
+                self._owners.pop(worker, None)
+
+            result = worker.call(account_id, method, args, self._timeout)
+            self._owners[worker] = account_id
+
+            return result
+        except ChildProcessError:
+            self._replace(worker)
+            raise
+        finally:
+            # Replaced now, so the next punch gets a browser already started.
+            if self._is_worn(worker):
+                worker.recycle()
+                self._owners.pop(worker, None)
+
+            with self._available:
+                self._idle.append(worker)
+                self._available.notify()
+
+    def reload(self) -> None:
+        """
+        Has every worker replaced, so the managers are built again from the
+        settings as they are now. Nothing is waited on, so it can be called
+        from a signal handler. A worker is replaced before its next job, or
+        on the next check while idle.
+        """
+        self._reloaded_at = time.monotonic()
+
+    def close(self) -> None:
+        """Stops every worker, once it is done with its job."""
+        with self._available:
+            while len(self._idle) < len(self._workers):
+                self._available.wait()
+
+            self._check_timer.cancel()
+            self._check_timer = None
+
+            for worker in self._workers:
+                worker.stop()
+
+    def _take(self, account_id: str) -> BrowserWorker:
+        """
+        Removes an idle worker from the idle list, preferring the one that
+        last ran a job for the account, then the least recently used one.
+
+        Parameters
+        ----------
+        account_id : string, required
+            The account the worker will be used for.
+
+        Returns
+        -------
+        BrowserWorker
+        """
+        for position, worker in enumerate(self._idle):
+            if self._owners.get(worker) == account_id:
+                return self._idle.pop(position)
+
+        return self._idle.pop(0)
+
+    def _replace(self, worker: BrowserWorker) -> None:
+        """
+        Kills the worker's process and browser, and starts a new process in
+        its place. The new browser holds no session.
+
+        Parameters
+        ----------
+        worker : BrowserWorker, required
+            The worker to replace.
+        """
+        worker.kill()
+        worker.start()
+        self._owners.pop(worker, None)
+
+    def _is_worn(self, worker: BrowserWorker) -> bool:
+        """
+        Determines if the worker has run too many jobs, for too long, has
+        grown past the memory watermark, or was started before a reload.
+
+        Parameters
+        ----------
+        worker : BrowserWorker, required
+            The worker to check.
+
+        Returns
+        -------
+        bool
+            True if the worker should be replaced with a fresh one.
+        """
+        if worker.jobs >= self._max_jobs:
+            return True
+
+        if worker.started_at < self._reloaded_at:
+            return True
+
+        age = time.monotonic() - worker.started_at
+        if self._max_seconds and age >= self._max_seconds:
+            return True
+
+        # A fresh browser is left alone, so a low watermark cannot loop.
+        if not self._max_memory_mb or not worker.jobs:
+            return False
+
+        return worker.memory_mb() > self._max_memory_mb
+
+    def _check_idle(self) -> None:
+        """
+        Replaces the idle workers that are worn out, so browsers that sit
+        between punches for hours are not left to grow.
+        """
+        with self._available:
+            if self._check_timer is None:
+                return
+
+            worn = [worker for worker in self._idle if self._is_worn(worker)]
+            for worker in worn:
+                self._idle.remove(worker)
+
+        for worker in worn:
+            worker.recycle()
+            self._owners.pop(worker, None)
+
+        with self._available:
+            self._idle.extend(worn)
+            self._available.notify(len(worn))
+
+            if self._check_timer is not None:
+                self._schedule_check()
+
+    def _schedule_check(self) -> None:
+        """Checks the idle workers again in a few minutes."""
+        self._check_timer = Timer(CHECK_SECONDS, self._check_idle)
+        self._check_timer.daemon = True
+        self._check_timer.start()
@@ -0,0 +1,43 @@
+from selenium.webdriver.chrome.options import Options
+
+
+# Launch flags keeping a long running headless Chrome small.
+CHROME_FLAGS = (
+    '--headless',
+    # Nothing is ever drawn or played, so none of it is loaded.
+    '--disable-gpu',
+    '--blink-settings=imagesEnabled=false',
+    '--mute-audio',
+    # Nothing runs beside the page.
+    '--disable-extensions',
+    '--disable-background-networking',
+    '--disable-component-update',
+    '--disable-default-apps',
+    '--disable-sync',
+    '--no-first-run',
+    # One renderer, sharing memory through /tmp as /dev/shm is tiny on a Pi.
+    '--renderer-process-limit=1',
+    '--disable-dev-shm-usage',
+    '--window-size=1280,800'
+)
+
+
+def chrome_options(flags: tuple = CHROME_FLAGS) -> Options:
+    """
+    Returns the options to launch Chrome with.
+
+    Parameters
+    ----------
+    flags : tuple, optional
+        The command line flags of the browser.
+
+    Returns
+    -------
+    Options
+    """
+    options = Options()
+
+    for flag in flags:
+        options.add_argument(flag)
+
+    return options
@@ -0,0 +1,156 @@
+from contextlib import contextmanager
+from selenium.webdriver.chrome.webdriver import WebDriver
+from threading import Condition, Lock
+from weakref import WeakKeyDictionary
+
+
+# How many times each browser was handed from one account to another.
+_handovers = WeakKeyDictionary()
+_handovers_lock = Lock()
+
+
+def hand_over(driver: WebDriver) -> None:
+    """
+    Clears the cookies for every domain before the browser is used by
+    another account, so the account does not pick up the session of the
+    last one, and counts the handover.
+
+    Parameters
+    ----------
+    driver : WebDriver, required
+        The browser changing hands.
+    """
+    driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+
+    with _handovers_lock:
+        _handovers[driver] = _handovers.get(driver, 0) + 1
+
+
+def count_handovers(driver: WebDriver) -> int:
+    """
+    Returns how many times the browser has changed hands between accounts,
+    so a page left open can be told apart from one another account used.
+
+    Parameters
+    ----------
+    driver : WebDriver, required
+        The browser to count for.
+
+    Returns
+    -------
+    int
+    """
+    with _handovers_lock:
+        return _handovers.get(driver, 0)
+
+
+class DriverPool:
+    """A small set of web drivers shared between many accounts.
+
+    Each driver is only ever handed to one worker at a time, and workers wait
+    for a driver to be returned when all of them are busy. The pool remembers
+    which account each driver was last logged in as, so an account gets its
+    own warm session back whenever that driver is free.
+
+    Attributes
+    ----------
+    _idle : list
+        The drivers not currently being used, least recently used first.
+
+    _owners : dictionary
+        The account each driver last held a session for.
+
+    _size : int
+        The number of drivers in the pool.
+
+    _available : Condition
+        Signals waiting workers when a driver is returned.
+
+    Methods
+    -------
+    acquire(account_id)
+        Context manager lending out a driver, and taking it back afterwards.
+
+    _take(account_id)
+        Removes the best idle driver for the account from the idle list.
+    """
+
+    def __init__(self, drivers: list):
+        """
+        Creates a new instance of the DriverPool.
+
+        Parameters
+        ----------
+        drivers : list, required
+            The web drivers to share.
+        """
+        self._idle = list(drivers)
+        self._owners = {}
+        self._size = len(drivers)
+        self._available = Condition()
+
+    def __len__(self) -> int:
+        """Returns the number of drivers in the pool."""
+        return self._size
+
+    @contextmanager
+    def acquire(self, account_id: str = None) -> WebDriver:
+        """
+        Lends out an idle driver, waiting for one if they are all in use. A
+        driver already holding the account's session is preferred. Otherwise
+        the cookies for every domain are cleared before lending it, so the
+        account does not pick up the session of another.
+
+        Parameters
+        ----------
+        account_id : string, optional
+            The account the driver will be used for.
+
+        Yields
+        ------
+        WebDriver
+            The driver to navigate with.
+        """
+        with self._available:
+            while not self._idle:
+                self._available.wait()
+
+            driver = self._take(account_id)
+
+        if self._owners.get(driver, account_id) != account_id:
+            hand_over(driver)
+
+        self._owners[driver] = account_id
+
+        try:
+            yield driver
+        finally:
+            with self._available:
+                self._idle.append(driver)
+                self._available.notify()
+
+    def _take(self, account_id: str) -> WebDriver:
+        """
+        Removes the best idle driver for the account from the idle list. That
+        is one holding its session, then one never used, then the one idle
+        for the longest.
+
+        Parameters
+        ----------
+        account_id : string, required
+            The account the driver will be used for.
+
+        Returns
+        -------
+        WebDriver
+            The driver taken out of the idle list.
+        """
+        for driver in self._idle:
+            if self._owners.get(driver) == account_id:
+                break
+        else:
+            unused = [d for d in self._idle if d not in self._owners]
+            driver = unused[0] if unused else self._idle[0]
+
+        self._idle.remove(driver)
+        return driver
@@ -0,0 +1,262 @@
+from html.parser import HTMLParser
+from requests import Session
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError, HTTPError, RequestException
+from src.config import Config
+from src.pages import LAST_PUNCH_ID, parse_last_punch
+
+
+# The names of the dashboard buttons submitted for each punch.
+BUTTONS = {
+    'Clock In': 'ClockIn',
+    'Start Lunch': 'StartLunch',
+    'End Lunch': 'EndLunch',
+    'Clock Out': 'ClockOut'
+}
+
+
+class PunchFormParser(HTMLParser):
+    """Collects the fields the dashboard's punch form would submit.
+
+    Attributes
+    ----------
+    fields : dictionary
+        The hidden inputs of the page, such as the anti-forgery token.
+
+    buttons : dictionary
+        The value of each named button on the page.
+
+    last_punch : string
+        The text of the element showing the latest punch.
+
+    _depth : int
+        How deep inside the latest punch's element the parser is, 0 when
+        outside of it.
+    """
+
+    def __init__(self):
+        """Creates a new instance of the PunchFormParser."""
+        super().__init__()
+        self.fields = {}
+        self.buttons = {}
+        self.last_punch = ''
+        self._depth = 0
+
+    def handle_starttag(self, tag: str, attrs: list) -> None:
+        """
+        Records hidden inputs and named buttons as they are parsed.
+
+        Parameters
+        ----------
+        tag : string, required
+            The name of the tag.
+
+        attrs : list, required
+            The (name, value) pairs of the tag's attributes.
+        """
+        attributes = dict(attrs)
+        name = attributes.get('name')
+
+        if self._depth or attributes.get('id') == LAST_PUNCH_ID:
+            self._depth += 1
+
+        if name is None:
+            return
+
+        if tag == 'input' and attributes.get('type') == 'hidden':
+            self.fields[name] = attributes.get('value') or ''
+        elif tag == 'button' or attributes.get('type') == 'submit':
+            self.buttons[name] = attributes.get('value') or ''
+
+    def handle_endtag(self, tag: str) -> None:
+        """
+        Notes leaving the latest punch's element.
+
+        Parameters
+        ----------
+        tag : string, required
+            The name of the tag.
+        """
+        if self._depth:
+            self._depth -= 1
+
+    def handle_data(self, data: str) -> None:
+        """
+        Collects the text inside the latest punch's element.
+
+        Parameters
+        ----------
+        data : string, required
+            The text found between tags.
+        """
+        if self._depth:
+            self.last_punch += data
+
+
+class HttpPunchClient:
+    """Punches over plain HTTP, without rendering the dashboard in a browser.
+
+    It replays the form the dashboard buttons submit, using the cookies of a
+    session logged in through the browser. Any failure before the form is
+    submitted, including an expired session, raises so the caller can fall
+    back to the browser. Once the form may have reached Paylocity, the punch
+    is left unconfirmed instead, as sending it again could punch twice.
+
+    Attributes
+    ----------
+    _config : Config
+        Holds onto the URLs of the dashboard, punch form and login page.
+
+    _session : Session
+        Keeps the cookies, and a pool of connections, between punches.
+
+    _timeout : float
+        The most seconds to wait on Paylocity for each request.
+
+    Methods
+    -------
+    set_cookies(cookies)
+        Replaces the session's cookies with those of the browser.
+
+    punch(action_str)
+        Submits the punch form for the action, returning the latest punch.
+
+    clock_in()
+        Submits the form for clocking in.
+
+    start_lunch()
+        Submits the form for starting lunch.
+
+    end_lunch()
+        Submits the form for ending lunch.
+
+    clock_out()
+        Submits the form for clocking out.
+
+    _check(response)
+        Raises when the request failed or the session has expired.
+    """
+
+    def __init__(self, config: Config, session: Session):
+        """
+        Creates a new instance of the HttpPunchClient.
+
+        Parameters
+        ----------
+        config : Config, required
+            Configuration object holding the Paylocity URLs.
+
+        session : Session, required
+            The session to send the requests through.
+        """
+        self._config = config
+        self._session = session
+        self._timeout = config.get_implicit_wait()
+        self._session.mount('https://', HTTPAdapter(pool_maxsize=4))
+
+    def set_cookies(self, cookies: list) -> None:
+        """
+        Replaces the session's cookies with those taken from the browser.
+
+        Parameters
+        ----------
+        cookies : list, required
+            The cookies, as given by the browser or the session store.
+        """
+        self._session.cookies.clear()
+
+        for cookie in cookies:
+            self._session.cookies.set(
+                cookie['name'],
+                cookie['value'],
+                domain=cookie.get('domain', ''),
+                path=cookie.get('path', '/')
+            )
+
+    def punch(self, action_str: str) -> str:
+        """
+        Loads the dashboard for the form's fields, then submits the form as if
+        the button for the action was clicked. The dashboard sent back shows
+        the latest punch, which is read to confirm this one registered. When
+        the form may have been received, but no dashboard came back, the
+        punch is left unconfirmed.
+
+        Parameters
+        ----------
+        action_str : string, required
+            The name of the punch, such as 'Clock In'.
+
+        Returns
+        -------
+        string
+            The latest punch shown after submitting, None if not shown.
+
+        Raises
+        ------
+        RequestException
+            When the punch was not submitted.
+        """
+        # A stalled request times out, so the browser can take over.
+        page = self._session.get(
+            self._config.get_dashboard_url(), timeout=self._timeout
+        )
+        self._check(page)
+
+        parser = PunchFormParser()
+        parser.feed(page.text)
+
+        button = BUTTONS[action_str]
+        data = dict(parser.fields)
+        data[button] = parser.buttons.get(button, '')
+
+        try:
+            response = self._session.post(
+                self._config.get_punch_url(), data=data, timeout=self._timeout
+            )
+            self._check(response)
+        except ConnectionError:
+            # Paylocity was never reached, so the browser can punch instead.
+            raise
+        except RequestException as exception:
+            print('Could not read back %s: %s' % (action_str, exception))
+            return None
+
+        result = PunchFormParser()
+        result.feed(response.text)
+
+        return parse_last_punch(result.last_punch)
+
+    def clock_in(self) -> str:
+        """Submits the punch form for clocking in."""
+        return self.punch('Clock In')
+
+    def start_lunch(self) -> str:
+        """Submits the punch form for starting lunch."""
+        return self.punch('Start Lunch')
+
+    def end_lunch(self) -> str:
+        """Submits the punch form for ending lunch."""
+        return self.punch('End Lunch')
+
+    def clock_out(self) -> str:
+        """Submits the punch form for clocking out."""
+        return self.punch('Clock Out')
+
+    def _check(self, response) -> None:
+        """
+        Raises if the request failed, or was sent back to the login page.
+
+        Parameters
+        ----------
+        response : Response, required
+            The response to check.
+
+        Raises
+        ------
+        HTTPError
+            When the request failed or the session has expired.
+        """
+        response.raise_for_status()
+
+        if response.url.startswith(self._config.get_login_url()):
+            raise HTTPError('Session has expired', response=response)
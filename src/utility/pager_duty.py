@@ -1,14 +1,33 @@
+from queue import Queue
+from smtplib import SMTP_SSL, SMTPException
 from src.config import Config
-from smtplib import SMTP_SSL
+from threading import Lock, Thread, Timer
+from types import SimpleNamespace
+from .token_bucket import TokenBucket
+import time
 
 
 GMAIL_DOMAIN = 'smtp.gmail.com'
 GMAIL_PORT = 465
 
+# Levels that can wait to be sent together in a digest.
+DIGEST_LEVELS = ('INFO', 'WARNING')
+
+# The queues messages are sent from, ALERTs never wait behind the others.
+LANES = ('ALERT', 'PACED')
+
 
 class PagerDuty:
     """A class responsible for pager duty, sending alerts.
 
+    ALERT messages are always sent straight away, from a queue of their own
+    so they never wait behind a message held up by the rate limit. When a
+    digest window is configured, INFO and WARNING messages to the same
+    destination are held for that long and then sent together as one
+    message. When a rate is configured, messages to the same destination
+    share a token bucket, and everything but an ALERT waits for a token
+    before being sent.
+
     Attributes
     ----------
     _from : string
@@ -23,11 +42,67 @@ class PagerDuty:
     _email_server : SMTP_SSL
         The e-mail server that will be connected to, for sending messages.
 
+    _connected : bool
+        Whether the e-mail server is connected and logged in.
+
+    _queues : dictionary
+        The messages waiting to be sent in the background, for each lane.
+
+    _workers : dictionary
+        The thread sending the messages of each lane, started with its first
+        message.
+
+    _worker_lock : Lock
+        Makes sure only one worker is started for each lane.
+
+    _send_lock : Lock
+        Keeps the workers from using the e-mail server at the same time.
+
+    _digest_seconds : float
+        How long INFO and WARNING messages are held, 0 to send right away.
+
+    _digest : SimpleNamespace
+        The (level, message) pairs held for the next digest to the
+        destination, the timer sending it, and the lock guarding both.
+
+    _bucket : TokenBucket
+        The rate limit for the destination, None for no limit.
+
+    _buckets : dictionary
+        The rate limits of every destination, shared by all pagers.
+
+    _digests : dictionary
+        The held messages of every destination, shared by all pagers.
+
+    _shared_lock : Lock
+        Guards the rate limits and digests shared by all pagers.
+
     Methods
     -------
     _page(level, message)
-        Logs into e-mail, and sends message.
-    
+        Queues the message to be sent in the background.
+
+    flush()
+        Waits until every queued message has been sent.
+
+    send_digest()
+        Sends the held INFO and WARNING messages as one message now.
+
+    close()
+        Sends what is queued, then logs out of the e-mail server.
+
+    _work(lane)
+        Sends the lane's queued messages for as long as the pager is open.
+
+    _enqueue(level, body)
+        Queues the message for the worker, starting it if need be.
+
+    _send(body)
+        Sends the message, connecting or reconnecting as needed.
+
+    _connect()
+        Connects and logs into the e-mail server.
+
     alert(message)
         Sends an alert level message when something goes wrong.
 
@@ -38,6 +113,10 @@ class PagerDuty:
         Sends an info message for record keeping
     """
 
+    _buckets = {}
+    _digests = {}
+    _shared_lock = Lock()
+
     def __init__(self, config: Config, smtp_ssl: SMTP_SSL):
         """
         Creates a new instance of the PagerDuty object.
@@ -54,16 +133,45 @@ class PagerDuty:
         self._to = pager_duty_info['to']
 
         self._email_server = smtp_ssl
+        self._connected = False
+
+        self._queues = {lane: Queue() for lane in LANES}
+        self._workers = {}
+        self._worker_lock = Lock()
+        self._send_lock = Lock()
 
         self._has_email_credentials = False
 
         if self._from and self._password and self._to:
             self._has_email_credentials = True
 
+        limits = config.get_pager_limits()
+
+        self._digest_seconds = limits['digest_seconds']
+        self._bucket = None
+
+        with PagerDuty._shared_lock:
+            if self._to not in PagerDuty._digests:
+                PagerDuty._digests[self._to] = SimpleNamespace(
+                    held=[], timer=None, lock=Lock()
+                )
+
+            self._digest = PagerDuty._digests[self._to]
+
+            if limits['messages_per_hour'] > 0:
+                if self._to not in PagerDuty._buckets:
+                    PagerDuty._buckets[self._to] = TokenBucket(
+                        limits['messages_per_hour'] / 3600, limits['burst']
+                    )
+
+                self._bucket = PagerDuty._buckets[self._to]
+
     def _page(self, level: str, message: str) -> None:
         """
-        This method signs into the Google server, and send the text message
-        to the provided phone number.
+        This method queues the text message for the provided phone number. It
+        is sent in the background, so the caller never waits on the e-mail
+        server. INFO and WARNING messages are held for the digest instead,
+        when there is a digest window.
 
         Parameters
         ----------
@@ -78,10 +186,174 @@ class PagerDuty:
             print(body)
             return
 
+        if level in DIGEST_LEVELS and self._digest_seconds > 0:
+            with self._digest.lock:
+                self._digest.held.append((level, message))
+
+                # The pager opening the window sends everything held in it.
+                if self._digest.timer is None:
+                    self._digest.timer = Timer(
+                        self._digest_seconds, self.send_digest
+                    )
+                    self._digest.timer.daemon = True
+                    self._digest.timer.start()
+            return
+
+        self._enqueue(level, body)
+
+    def send_digest(self) -> None:
+        """
+        Sends the INFO and WARNING messages held for the destination now,
+        whichever pager they came from. A single held message is sent as it
+        was, several are combined into one DIGEST message.
+        """
+        with self._digest.lock:
+            if self._digest.timer is not None:
+                self._digest.timer.cancel()
+                self._digest.timer = None
+
+            held = self._digest.held
+            self._digest.held = []
+
+        if not held:
+            return
+
+        if len(held) == 1:
+            level, message = held[0]
+            self._enqueue(level, 'Level - %s\nMessage - %s' % (level, message))
+            return
+
+        lines = '\n'.join('%s - %s' % pair for pair in held)
+        self._enqueue(
+            'DIGEST',
+            'Level - DIGEST\nMessage - %d messages\n%s' % (len(held), lines)
+        )
+
+    def flush(self) -> None:
+        """Waits until every queued message has been sent, or given up on."""
+        for lane in list(self._workers):
+            self._queues[lane].join()
+
+    def close(self) -> None:
+        """Sends what is held and queued, then logs out of the e-mail server."""
+        self.send_digest()
+
+        with self._worker_lock:
+            if not self._workers:
+                return
+
+            for lane in self._workers:
+                self._queues[lane].put(None)
+
+            for worker in self._workers.values():
+                worker.join()
+
+            self._workers = {}
+
+        if self._connected:
+            try:
+                self._email_server.quit()
+            except (SMTPException, OSError):
+                pass
+
+            self._connected = False
+
+    def _enqueue(self, level: str, body: str) -> None:
+        """
+        Queues the message for the background worker of its lane, starting
+        the worker with the lane's first message.
+
+        Parameters
+        ----------
+        level : string, required
+            The level of the message, ALERT skips the rate limit.
+
+        body : string, required
+            The text of the message.
+        """
+        lane = 'ALERT' if level == 'ALERT' else 'PACED'
+
+        with self._worker_lock:
+            if lane not in self._workers:
+                self._workers[lane] = Thread(
+                    target=self._work, args=(lane,), daemon=True
+                )
+                self._workers[lane].start()
+
+        self._queues[lane].put((level, body))
+
+    def _work(self, lane: str) -> None:
+        """
+        Sends each message queued in the lane in turn, until told to stop.
+        Messages wait for the rate limit, except ALERTs which only use up a
+        token. A message that cannot be sent is printed and dropped, so it
+        never holds up the ones behind it.
+
+        Parameters
+        ----------
+        lane : string, required
+            The lane to send the messages of, ALERT or PACED.
+        """
+        queue = self._queues[lane]
+
+        while True:
+            item = queue.get()
+
+            try:
+                if item is None:
+                    return
+
+                level, body = item
+
+                if self._bucket is not None:
+                    wait = self._bucket.take()
+                    if wait > 0 and level != 'ALERT':
+                        time.sleep(wait)
+
+                try:
+                    self._send(body)
+                except Exception as exception:
+                    print('Could not send page (%s):\n%s' % (exception, body))
+            finally:
+                queue.task_done()
+
+    def _send(self, body: str) -> None:
+        """
+        Sends the message over the open connection, connecting first if need
+        be. A dropped connection is reopened and the message tried once more,
+        after that it is printed rather than lost silently.
+
+        Parameters
+        ----------
+        body : string, required
+            The text of the message.
+        """
+        # Both lanes share the one connection.
+        with self._send_lock:
+            for _ in range(2):
+                try:
+                    if not self._connected:
+                        self._connect()
+
+                    self._email_server.sendmail(self._from, self._to, body)
+                    return
+                except (SMTPException, OSError) as exception:
+                    self._connected = False
+                    error = exception
+
+        print('Could not send page (%s):\n%s' % (error, body))
+
+    def _connect(self) -> None:
+        """Connects and logs into the Google server."""
+        # Drop whatever is left of an old connection before opening a new one.
+        self._email_server.close()
         self._email_server.connect(GMAIL_DOMAIN, GMAIL_PORT)
+
+        # The greeting of the old connection is kept by the server object,
+        # and login only greets a server it has not greeted before.
+        self._email_server.ehlo()
         self._email_server.login(self._from.split('@')[0], self._password)
-        self._email_server.sendmail(self._from, self._to, body)
-        self._email_server.quit()
+        self._connected = True
 
     def alert(self, message: str) -> None:
         """
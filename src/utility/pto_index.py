@@ -0,0 +1,124 @@
+from bisect import bisect_right
+from datetime import datetime, timedelta
+
+
+class PtoIndex:
+    """A sorted index of the approved days off, read from the PTO grid.
+
+    The records are sorted by their first day, alongside the furthest last day
+    seen so far. A lookup finds the records starting on or before the date
+    with a binary search, then only has to compare against that furthest last
+    day, so overlapping requests are handled without walking the list.
+
+    The index remembers when it was loaded, so the caller knows when the grid
+    should be read again.
+
+    Attributes
+    ----------
+    _refresh : timedelta
+        How long the records are trusted before they are read again.
+
+    _starts : list
+        The first day of each approved record, sorted.
+
+    _reaches : list
+        The furthest last day among the records up to each position.
+
+    _loaded_at : datetime
+        When the records were last loaded, None if they never have been.
+
+    Methods
+    -------
+    load(records, now)
+        Replaces the index with the approved records.
+
+    contains(date)
+        Determines if the date falls in an approved day off.
+
+    is_stale(now)
+        Determines if the records should be read again.
+    """
+
+    def __init__(self, refresh_hours: float):
+        """
+        Creates a new, empty instance of the PtoIndex.
+
+        Parameters
+        ----------
+        refresh_hours : float, required
+            How many hours the records are trusted before being read again.
+        """
+        self._refresh = timedelta(hours=refresh_hours)
+        self._starts = []
+        self._reaches = []
+        self._loaded_at = None
+
+    def load(self, records: list, now: datetime) -> None:
+        """
+        Replaces the index with the approved records, ignoring the rest.
+
+        Parameters
+        ----------
+        records : list, required
+            The PtoRecords read from the grid.
+
+        now : datetime, required
+            When the records were read.
+        """
+        approved = sorted(
+            (record for record in records if record.is_approved),
+            key=lambda record: record.start
+        )
+
+        self._starts = [record.start for record in approved]
+        self._reaches = []
+
+        reach = None
+        for record in approved:
+            reach = record.end if reach is None else max(reach, record.end)
+            self._reaches.append(reach)
+
+        self._loaded_at = now
+
+    def contains(self, date: datetime) -> bool:
+        """
+        Determines if the date falls in an approved day off.
+
+        Parameters
+        ----------
+        date : datetime, required
+            The day to look up.
+
+        Returns
+        -------
+        bool
+            True if an approved record covers the date.
+        """
+        if isinstance(date, datetime):
+            date = date.date()
+
+        position = bisect_right(self._starts, date)
+
+        if position == 0:
+            return False
+
+        return self._reaches[position - 1] >= date
+
+    def is_stale(self, now: datetime) -> bool:
+        """
+        Determines if the records should be read from the grid again.
+
+        Parameters
+        ----------
+        now : datetime, required
+            The current time.
+
+        Returns
+        -------
+        bool
+            True if the records were never loaded, or are too old.
+        """
+        if self._loaded_at is None:
+            return True
+
+        return now - self._loaded_at >= self._refresh
@@ -1,11 +1,34 @@
-from datetime import date, datetime, timedelta
-from src.pages import Dashboard, Login
+from datetime import datetime, timedelta, timezone
+from src.pages import Dashboard, Login, RequestBlocker
 from random import randint
-from selenium.common.exceptions import NoSuchElementException
-from src.database.models import Holiday, Punch
+from requests.exceptions import RequestException
+from selenium.common.exceptions import NoSuchElementException, WebDriverException
+from selenium.webdriver.chrome.webdriver import WebDriver
+from src.database.models import Holiday, Punch, TimeOff
+from .driver_pool import count_handovers
+from .pto_index import PtoIndex
+from .punch_scheduler import PunchScheduler
 import time
 
 
+# The range of minutes each punch waits after the punch it is timed from.
+DELAYS = {
+    'Start Lunch': (4 * 60 + 1, 4 * 60 + 30),
+    'End Lunch': (31, 35),
+    'Clock Out': (8 * 60 + 40, 8 * 60 + 45)
+}
+
+# How many times a punch is sent while the dashboard shows it has not
+# registered.
+PUNCH_ATTEMPTS = 2
+
+# The punches timed from each punch, once it has been performed.
+FOLLOW_UPS = {
+    'Clock In': ('Start Lunch', 'Clock Out'),
+    'Start Lunch': ('End Lunch',)
+}
+
+
 class PunchCardManager:
     """This class is the general manager of the system.
 
@@ -28,28 +51,134 @@ class PunchCardManager:
     _punch : Punch
         Model controlling the interactions with the punches table.
 
+    _sessions : SessionStore
+        Keeps the login cookies across restarts, None to always log in.
+
+    _http : HttpPunchClient
+        Punches without the browser, None to always use the browser.
+
+    _browsers : BrowserWorkers
+        Runs the browser work in worker processes, None to use the driver.
+
+    _account_id : string
+        The account the sessions are saved under.
+
     _start_hour : int
         The hour which each day will start, not variable.
 
+    _zone : tzinfo
+        The timezone the day, and the start hour, of the account are in.
+
+    _warm_up_seconds : float
+        How long before a punch the browser logs in, 0 to log in when due.
+
+    _warmed_for : datetime
+        The due time of the punch last logged in ahead of.
+
+    _parked : Dashboard
+        The dashboard left open for the next punch, None if there is none.
+
+    _parked_handovers : int
+        How many times the browser had changed hands between accounts when
+        the dashboard was left open.
+
+    _scheduler : PunchScheduler
+        The queue of punches still due today.
+
+    _planned_day : date
+        The day the scheduler was last planned for.
+
+    _db_actions : dictionary
+        The model callbacks recording each punch action.
+
+    _time_off : TimeOff
+        Keeps the days off read from the PTO grid between restarts, if given.
+
+    _pto_index : PtoIndex
+        The approved days off, read from the PTO grid now and then.
+
     Methods
     -------
     start()
         Starts the system working.
 
+    prepare()
+        Makes sure there is a punch card to work from.
+
+    run_pending(now)
+        Performs the punch that is due, returning the seconds until the next.
+
+    set_driver(driver)
+        Swaps in the web driver to use for the next actions.
+
+    warm_up()
+        Logs in ahead of a punch, leaving the dashboard open to click.
+
     login_to_paylocity()
         Handles the actions of logging into paylocity.
 
+    open_dashboard()
+        Returns the page object of the dashboard the browser is on.
+
+    has_session()
+        Returns true if the browser is still logged into paylocity.
+
+    restore_session()
+        Puts the saved login cookies back into the browser.
+
+    save_session()
+        Saves the login cookies of the browser.
+
     is_clock_in_day(now, dashboard_page)
         Returns true if punches are supposed to occur for the day.
 
     check_resources(now)
         This checks day of week, holiday table, and PTO table.
 
-    perform_action(action, action_str, time_of_action, db_action)
+    refresh_pto(now)
+        Reads the PTO grid into the index, when it is out of date.
+
+    read_pto_records()
+        Logs into Paylocity and reads every row of the PTO grid.
+
+    perform_action(action_str, time_of_action, db_action)
         Performs the punch action based on the time of day.
 
-    get_punch(punch_id, position)
-        Gets the column from the punches table to compare datetimes.
+    confirm_punch(action_str)
+        Sends the punch until the latest punch read back shows it.
+
+    send_punch(action_str)
+        Punches over HTTP or through the browser, reading back the result.
+
+    http_punch(action_str)
+        Punches over HTTP with the saved session.
+
+    browser_punch(action_str)
+        Punches by clicking the button on the dashboard.
+
+    _take_parked()
+        Hands over the dashboard left open, if the browser is still on it.
+
+    _click(dashboard, action_str)
+        Clicks the button for the action on the dashboard.
+
+    plan_day(punch_card, now)
+        Schedules the punches still needed for the day.
+
+    schedule_follow_ups(action_str, time_of_action)
+        Schedules the punches timed from the action just performed.
+
+    seconds_until_tomorrow(now)
+        Returns the seconds left until the next day starts.
+
+    _localize(datetime_obj)
+        Puts the time in the timezone of the account.
+
+    _to_utc(datetime_obj)
+        Puts the time in UTC, the way times are kept.
+
+    get_datetime_from_date_string(date_str)
+        Parses the datetime strings stored in the punches table.
     """
 
     def __init__(self, args: dict):
@@ -66,60 +195,339 @@ class PunchCardManager:
         self._holiday = args['holiday']
         self._pager = args['pager']
         self._punch = args['punch']
+        self._time_off = args.get('time_off')
+        self._sessions = args.get('sessions')
+        self._http = args.get('http')
+        self._browsers = args.get('browsers')
 
+        self._account_id = self._config.get_account_id()
         self._start_hour = self._config.get_start_hour()
+        self._zone = self._config.get_timezone()
+        self._warm_up_seconds = self._config.get_warm_up_seconds()
+
+        self._warmed_for = None
+        self._parked = None
+        self._parked_handovers = None
+
+        self._scheduler = PunchScheduler()
+        self._planned_day = None
+        self._db_actions = {
+            'Clock In': self._punch.in_,
+            'Start Lunch': self._punch.start,
+            'End Lunch': self._punch.end,
+            'Clock Out': self._punch.out
+        }
+        self._pto_index = PtoIndex(self._config.get_pto_refresh_hours())
 
     def start(self) -> None:
         """This function runs the show, making everything mesh together."""
-        if self._punch.get_most_recent_day() is None:
-            self._punch.insert_new_day()
+        self.prepare()
 
         while True:
-            punch_card = self._punch.get_most_recent_day()
+            wait = self.run_pending(datetime.now(timezone.utc))
+
+            if wait > 0:
+                time.sleep(wait)
+
+    def prepare(self) -> None:
+        """
+        Makes sure there is a punch card to work from before starting, dated
+        by the account's clock rather than the host's.
+        """
+        if self._punch.get_most_recent_day() is None:
+            today = self._localize(datetime.now(timezone.utc)).date()
+            self._punch.insert_new_day(today)
+
+    def run_pending(self, now: datetime) -> float:
+        """
+        Performs the punch that is due, if there is one, and returns how long
+        to wait before calling again. The day is worked out in the timezone
+        of the account, while punches are scheduled and recorded in UTC, so
+        a change of daylight saving time moves neither. Once a punch is
+        within the warm up, the browser logs in ahead of it, so only the
+        click is left for when it is due.
+
+        Parameters
+        ----------
+        now : datetime, required
+            The current time, taken to be in the account's timezone if it
+            has none.
+
+        Returns
+        -------
+        float
+            The number of seconds until something else needs doing.
+        """
+        now = self._localize(now)
+        punch_card = self._punch.get_most_recent_day()
+
+        date_str = '%s 00:00:00.000' % punch_card[1]
+        cur_punch_day = self.get_datetime_from_date_string(date_str).date()
+
+        if now.date() - cur_punch_day >= timedelta(days=1):
+            self._punch.insert_new_day(now.date())
+            return 0
+
+        if not self.is_clock_in_day(now):
+            # Nothing will be due today, so wait for the next day.
+            return self.seconds_until_tomorrow(now)
+
+        if self._planned_day != cur_punch_day:
+            self.plan_day(punch_card, now)
+            self._planned_day = cur_punch_day
+
+        utc_now = self._to_utc(now)
+        wait = self._scheduler.seconds_until_next(utc_now)
+
+        if wait < 0:
+            # Every punch for the day is done.
+            return self.seconds_until_tomorrow(now)
+
+        if wait > 0:
+            due = self._scheduler.peek()[0]
+
+            if wait <= self._warm_up_seconds and self._warmed_for != due:
+                self._warmed_for = due
+                self.warm_up()
+                # Logging in took a while, so the wait is measured again.
+                return 0
+
+            return wait
+
+        action_str = self._scheduler.pop()[1]
+
+        # A punch that was not made has nothing to time the next ones from,
+        # the same as when the day is planned again after a restart.
+        if self.perform_action(action_str, utc_now, self._db_actions[action_str]):
+            self.schedule_follow_ups(action_str, utc_now)
+
+        return 0
+
+    def set_driver(self, driver: WebDriver) -> None:
+        """
+        Swaps in the web driver to use for the next actions, when browsers are
+        shared between several accounts.
+
+        Parameters
+        ----------
+        driver : WebDriver, required
+            The web driver to navigate with.
+        """
+        # A dashboard left open in another browser is of no use.
+        if driver is not self._driver:
+            self._parked = None
+
+        self._driver = driver
+
+    def warm_up(self) -> None:
+        """
+        Logs into Paylocity ahead of a punch, in a worker process when there
+        are any, and leaves the browser on the dashboard. The punch then
+        only has to click the button when it is due. Should the login fail,
+        it is tried again when the punch is due.
+        """
+        try:
+            if self._browsers is not None:
+                self._browsers.run(self._account_id, 'warm_up')
+                return
+
+            self._parked = self.login_to_paylocity()
+            self._parked_handovers = count_handovers(self._driver)
+        except (WebDriverException, ChildProcessError) as exception:
+            self._parked = None
+            print('Could not log in ahead of the punch: %s' % exception)
+
+    def plan_day(self, punch_card: tuple, now: datetime) -> None:
+        """
+        Fills the scheduler with the punches still needed for the day, based
+        on what the punch card has already recorded. Each wait is drawn once
+        here, rather than on every check.
+
+        Parameters
+        ----------
+        punch_card : tuple, required
+            The row of the punches table for today.
+
+        now : datetime, required
+            The current time.
+        """
+        self._scheduler.clear()
+
+        if punch_card[3] is None:
+            # The start hour is on the account's clock, whatever its offset.
+            start = self._to_utc(self._localize(now).replace(
+                hour=self._start_hour, minute=0, second=0, microsecond=0
+            ))
+            # Clocking in is only done within the starting hour.
+            if self._to_utc(now) < start + timedelta(hours=1):
+                self._scheduler.schedule(start, 'Clock In')
+            return
+
+        clock_in = self.get_datetime_from_date_string(punch_card[3])
+
+        if punch_card[4] is None:
+            self._schedule_after('Start Lunch', clock_in)
+        elif punch_card[5] is None:
+            lunch_start = self.get_datetime_from_date_string(punch_card[4])
+            self._schedule_after('End Lunch', lunch_start)
+
+        if punch_card[6] is None:
+            self._schedule_after('Clock Out', clock_in)
+
+    def schedule_follow_ups(self, action_str: str, time_of_action: datetime) -> None:
+        """
+        Schedules the punches that are timed from the action just performed.
+
+        Parameters
+        ----------
+        action_str : string, required
+            The name of the action that was performed.
 
-            date_str = '%s 00:00:00.000' % punch_card[1]
-            cur_punch_day = self.get_datetime_from_date_string(date_str).date()
+        time_of_action : datetime, required
+            The time at which the action occurred.
+        """
+        for follow_up in FOLLOW_UPS.get(action_str, ()):
+            self._schedule_after(follow_up, time_of_action)
+
+    def _schedule_after(self, action_str: str, previous_punch: datetime) -> None:
+        """
+        Schedules the action a random delay after the punch it follows.
 
-            if date.today() - cur_punch_day >= timedelta(days=1):
-                self._punch.insert_new_day()
+        Parameters
+        ----------
+        action_str : string, required
+            The name of the action to schedule.
 
-            now = datetime.now()
+        previous_punch : datetime, required
+            The time of the punch the action is timed from.
+        """
+        low, high = DELAYS[action_str]
+        delay = timedelta(minutes=randint(low, high))
 
-            if not self.is_clock_in_day(now):
-                # If it is not a day to clock in, sleep for greater intervals.
-                time.sleep(300)
-                continue
+        # Added in UTC, so the delay is the time worked even across a change
+        # of daylight saving time.
+        self._scheduler.schedule(self._to_utc(previous_punch) + delay, action_str)
 
-            if punch_card[3] is None and now.hour == self._start_hour:
-                self.perform_action('Clock In', now, self._punch.in_)
-            elif self.should_punch(punch_card, 3, 4, now, timedelta(hours=4, minutes=randint(1, 30))):
-                self.perform_action('Start Lunch', now, self._punch.start)
-            elif self.should_punch(punch_card, 4, 5, now, timedelta(minutes=randint(31, 35))):
-                self.perform_action('End Lunch', now, self._punch.end)
-            elif self.should_punch(punch_card, 3, 6, now, timedelta(hours=8, minutes=randint(40, 45))):
-                self.perform_action('Clock Out', now, self._punch.out)
+    @staticmethod
+    def seconds_until_tomorrow(now: datetime) -> float:
+        """
+        Returns the number of seconds between now and the next midnight, in
+        the timezone of now.
 
-            time.sleep(60)
+        Parameters
+        ----------
+        now : datetime, required
+            The time to measure from.
+
+        Returns
+        -------
+        float
+            Seconds left in the day, fewer or more on a daylight saving day.
+        """
+        tomorrow = datetime.combine(
+            now.date() + timedelta(days=1), datetime.min.time(), now.tzinfo
+        )
+
+        # Measured in UTC, as times sharing a zone are subtracted by the clock.
+        utc = timezone.utc
+        return (tomorrow.astimezone(utc) - now.astimezone(utc)).total_seconds()
 
     def login_to_paylocity(self) -> Dashboard:
         """
         This function logs into Paylocity and bypasses the secret question
-        page if that pops up.
+        page if that pops up. When the browser still holds a live session, the
+        login is skipped altogether.
 
         Returns
         -------
         Dashboard
             The Dashboard page object.
         """
+        if self.has_session() or self.restore_session():
+            return self.open_dashboard()
+
         # The sequence of steps below is contingent on the time.
         login_page = Login(self._config, self._driver)
         question_page = login_page.login()
 
         # The login might've gone straight to the dashboard
         if not question_page.is_on_question_page():
-            return Dashboard(self._driver)
+            dashboard = self.open_dashboard()
+        else:
+            dashboard = question_page.answer_question()
+
+        self.save_session()
+
+        return dashboard
+
+    def open_dashboard(self) -> Dashboard:
+        """
+        Returns the page object of the dashboard the browser is on.
+
+        Returns
+        -------
+        Dashboard
+            The Dashboard page object.
+        """
+        return Dashboard(
+            self._driver,
+            self._config.get_implicit_wait(),
+            self._config.get_after_punch_url(),
+            self._config.get_blocked_urls()
+        )
+
+    def has_session(self) -> bool:
+        """
+        Loads the dashboard to check if the browser is still logged in. An
+        expired session is sent back to the login page.
+
+        Returns
+        -------
+        bool
+            True if the dashboard loaded without needing to log in.
+        """
+        blocker = RequestBlocker(self._driver, self._config.get_blocked_urls())
+        blocker.block('dashboard')
+
+        self._driver.get(self._config.get_dashboard_url())
+
+        return not self._driver.current_url.startswith(
+            self._config.get_login_url()
+        )
+
+    def restore_session(self) -> bool:
+        """
+        Puts the saved cookies of the account back into the browser, and
+        checks they still hold a live session. Saved cookies that no longer
+        work are thrown away.
+
+        Returns
+        -------
+        bool
+            True if the saved session was restored.
+        """
+        if self._sessions is None:
+            return False
+
+        cookies = self._sessions.load(self._account_id)
+        if not cookies:
+            return False
+
+        self._driver.execute_cdp_cmd('Network.setCookies', {'cookies': cookies})
 
-        return question_page.answer_question()
+        if self.has_session():
+            return True
+
+        self._sessions.remove(self._account_id)
+        return False
+
+    def save_session(self) -> None:
+        """Saves the cookies of the browser, so a restart can skip logging in."""
+        if self._sessions is None:
+            return
+
+        cookies = self._driver.execute_cdp_cmd('Network.getAllCookies', {})
+        self._sessions.save(self._account_id, cookies['cookies'])
 
     def is_clock_in_day(self, now: datetime) -> bool:
         """
@@ -152,8 +560,8 @@ class PunchCardManager:
         This method validates against the various resources if this is an
         appropriate day to clock in or not. It starts with the day of the week
         and holidays as they are the quickest checks. Then, if those do not
-        apply, logs into Paylocity and checks the PTO charts. This will later
-        be saved so this function is only run once a day.
+        apply, checks the days off read from the PTO grid. The grid is only
+        read again, by logging into Paylocity, once the index is out of date.
 
         Parameters
         ----------
@@ -171,15 +579,75 @@ class PunchCardManager:
             return False
 
         # If it is not holiday or weekend, check PTO.
+        self.refresh_pto(now)
+        return not self._pto_index.contains(now)
+
+    def refresh_pto(self, now: datetime) -> None:
+        """
+        Logs into Paylocity and reads the whole PTO grid into the index, if
+        it has not been read within the refresh interval. After a restart,
+        the days off last read are taken from the database first, so the
+        grid is only read if those are out of date too. Only the rows that
+        changed are written back. Should the grid not be read, the days off
+        last read are kept, and the grid is read again on the next check.
+
+        Parameters
+        ----------
+        now : datetime, required
+            The current time.
+        """
+        now = self._localize(now)
+
+        if not self._pto_index.is_stale(now):
+            return
+
+        if self._time_off is not None:
+            synced_at = self._time_off.get_synced_at()
+
+            if synced_at is not None:
+                self._pto_index.load(
+                    self._time_off.get_records(), self._localize(synced_at)
+                )
+
+                if not self._pto_index.is_stale(now):
+                    return
+
+        try:
+            records = self.read_pto_records()
+        except (WebDriverException, ChildProcessError):
+            self._pager.alert('Could not read the days off, using the last read.')
+            return
+
+        self._pto_index.load(records, now)
+
+        if self._time_off is None:
+            return
+
+        if self._time_off.sync(records, self._to_utc(now)) < 0:
+            self._pager.warning('Could not save the days off to the database.')
+
+    def read_pto_records(self) -> list:
+        """
+        Logs into Paylocity and reads every row of the PTO grid, in a worker
+        process when there are any.
+
+        Returns
+        -------
+        list
+            The PtoRecords of the grid.
+        """
+        if self._browsers is not None:
+            return self._browsers.run(self._account_id, 'read_pto_records')
+
         dashboard_page = self.login_to_paylocity()
-        return not dashboard_page.go_to_pto().is_pto_day(now)
+        return dashboard_page.go_to_pto().get_pto_records()
 
-    def perform_action(self, action_str: str, time_of_action: datetime, db_action: callable) -> None:
+    def perform_action(self, action_str: str, time_of_action: datetime, db_action: callable) -> bool:
         """
         This function handles the action and error handling for each punch
-        for the day. It will alert if anything is at critical. Currently, even
-        INFO level messages will be sent to PagerDuty. Later, a .env var will
-        be included to set level of pages.
+        for the day. It will alert if anything is at critical, including a
+        browser that crashed or hung. The punch is only logged in the
+        database once it has registered, or could not be read back to check.
 
         Parameters
         ----------
@@ -187,76 +655,253 @@ class PunchCardManager:
             The name of the action being performed.
 
         time_of_action : datetime, required
-            The time at which the action is occurring.
+            The time at which the action is occurring, recorded in UTC.
 
         db_action : callback, required
             The action of logging in the database.
+
+        Returns
+        -------
+        bool
+            True if the punch was made, even if it could not be logged.
         """
-        dashboard = self.login_to_paylocity()
-        action = {
-            'Clock In': dashboard.clock_in,
-            'Start Lunch': dashboard.start_lunch,
-            'End Lunch': dashboard.end_lunch,
-            'Clock Out': dashboard.clock_out
-        }
         try:
-            action[action_str]()
-            self._pager.info(
-                '%s at %s' % (action_str, time_of_action.strftime('%c'))
-            )
-        except NoSuchElementException:
+            registered = self.confirm_punch(action_str)
+        except (WebDriverException, ChildProcessError):
             self._pager.alert('Did not %s successfully.' % action_str)
+            return False
+
+        if not registered:
+            self._pager.alert(
+                '%s did not register after %d tries.'
+                % (action_str, PUNCH_ATTEMPTS)
+            )
+            return False
 
-        if not db_action(time_of_action):
+        self._pager.info(
+            '%s at %s' % (action_str, self._localize(time_of_action).strftime('%c'))
+        )
+
+        if not db_action(self._to_utc(time_of_action)):
             self._pager.warning('Did not log %s to database' % action_str)
 
-    def should_punch(self, punch_card: tuple, prev_punch_pos: int, cur_punch_pos: int, now: datetime, delta: timedelta) -> bool:
+        return True
+
+    def confirm_punch(self, action_str: str) -> bool:
         """
-        This function takes the ID of the punch, and the position desired for
-        clocking in and out.
+        Sends the punch, then checks the latest punch read back is the one
+        sent. A punch that did not register is sent again, up to
+        PUNCH_ATTEMPTS times. When the latest punch cannot be read, the punch
+        is trusted rather than risking a second one.
 
         Parameters
         ----------
-        punch_card : tuple, required
-            This is the collection from the database.
+        action_str : string, required
+            The name of the action being performed.
 
-        prev_punch_pos : int, required
-            The position of the column desired to compare against.
+        Returns
+        -------
+        bool
+            False if the punch never showed up as the latest, True otherwise.
+        """
+        for attempt in range(PUNCH_ATTEMPTS):
+            last_punch = self.send_punch(action_str)
 
-        cur_punch_pos : int, required
-            Check to make sure the punch is None so we don't over punch it.
+            if last_punch is None:
+                self._pager.warning('Could not confirm %s registered.' % action_str)
+                return True
 
-        now : datetime, required
-            Going to ensure we pass the timedelta.
+            if last_punch == action_str:
+                return True
+
+            print(
+                'Try %d of %s did not register, latest punch is %s'
+                % (attempt + 1, action_str, last_punch)
+            )
 
-        delta : timedelta, required
-            The delta to cover.
+        return False
+
+    def send_punch(self, action_str: str) -> str:
+        """
+        Punches over HTTP, when the account is set up to, falling back to the
+        browser when the punch was not submitted.
+
+        Parameters
+        ----------
+        action_str : string, required
+            The name of the action being performed.
 
         Returns
         -------
-        bool
-            Returns if we should perform the action or not.
+        string
+            The latest punch read back, None if it could not be read.
         """
-        if punch_card[cur_punch_pos] is not None:
-            return False
+        if self._http is not None:
+            try:
+                return self.http_punch(action_str)
+            except RequestException as exception:
+                print(exception)
 
-        last_punch_str = punch_card[prev_punch_pos]
-        if last_punch_str is None:
-            return False
+        return self.browser_punch(action_str)
 
-        last_punch = self.get_datetime_from_date_string(last_punch_str)
+    def http_punch(self, action_str: str) -> str:
+        """
+        Punches over HTTP with the saved session.
+
+        Parameters
+        ----------
+        action_str : string, required
+            The name of the action being performed.
 
-        return now - last_punch > delta
+        Returns
+        -------
+        string
+            The latest punch read back, None if it could not be read.
+
+        Raises
+        ------
+        RequestException
+            When the punch could not be submitted.
+        """
+        if self._sessions is not None:
+            self._http.set_cookies(self._sessions.load(self._account_id))
+
+        return self._http.punch(action_str)
+
+    def browser_punch(self, action_str: str) -> str:
+        """
+        Clicks the button for the action on the dashboard left open by the
+        warm up, or logs in first when there is none, in a worker process
+        when there are any. When the button cannot be found on the dashboard
+        left open, nothing was sent, so it is given up on for a fresh login.
+        Once the button is clicked, the punch is never sent again here.
+
+        Parameters
+        ----------
+        action_str : string, required
+            The name of the action being performed.
+
+        Returns
+        -------
+        string
+            The latest punch read back, None if it could not be read.
+
+        Raises
+        ------
+        ChildProcessError
+            When the worker process crashed, or hung.
+
+        TimeoutException
+            When the dashboard did not reload after the click.
+        """
+        if self._browsers is not None:
+            return self._browsers.run(
+                self._account_id, 'browser_punch', action_str
+            )
+
+        dashboard = self._take_parked()
+
+        if dashboard is not None:
+            try:
+                return self._click(dashboard, action_str)
+            except NoSuchElementException:
+                print('The dashboard left open has no button, logging in again.')
+
+        return self._click(self.login_to_paylocity(), action_str)
+
+    def _take_parked(self) -> Dashboard:
+        """
+        Hands over the dashboard left open by the warm up, as long as no
+        other account has used the browser since. Every account's dashboard
+        has the same URL, so it is the handovers of the browser that are
+        checked. It is only handed over once.
+
+        Returns
+        -------
+        Dashboard
+            The Dashboard page object, None if there is none to use.
+        """
+        dashboard, self._parked = self._parked, None
+
+        if dashboard is None:
+            return None
+
+        if count_handovers(self._driver) != self._parked_handovers:
+            return None
+
+        return dashboard
+
+    @staticmethod
+    def _click(dashboard: Dashboard, action_str: str) -> str:
+        """
+        Clicks the button for the action on the dashboard.
+
+        Parameters
+        ----------
+        dashboard : Dashboard, required
+            The page object of the dashboard the browser is on.
+
+        action_str : string, required
+            The name of the action being performed.
+
+        Returns
+        -------
+        string
+            The latest punch read back, None if it could not be read.
+        """
+        action = {
+            'Clock In': dashboard.clock_in,
+            'Start Lunch': dashboard.start_lunch,
+            'End Lunch': dashboard.end_lunch,
+            'Clock Out': dashboard.clock_out
+        }
+        return action[action_str]()
+
+    def _localize(self, datetime_obj: datetime) -> datetime:
+        """
+        Puts the time in the timezone of the account. A time without a zone,
+        such as one recorded before times were kept in UTC, is taken to
+        already be in it.
+
+        Parameters
+        ----------
+        datetime_obj : datetime, required
+            The time to convert.
+
+        Returns
+        -------
+        datetime
+        """
+        if datetime_obj.tzinfo is None:
+            return datetime_obj.replace(tzinfo=self._zone)
+
+        return datetime_obj.astimezone(self._zone)
+
+    def _to_utc(self, datetime_obj: datetime) -> datetime:
+        """
+        Puts the time in UTC, the way punches are scheduled and recorded.
+
+        Parameters
+        ----------
+        datetime_obj : datetime, required
+            The time to convert.
+
+        Returns
+        -------
+        datetime
+        """
+        return self._localize(datetime_obj).astimezone(timezone.utc)
 
     @staticmethod
     def get_datetime_from_date_string(date_str: str) -> datetime:
         """
-        Converts a string from given format into a datetime object.
+        Converts a string from given format into a datetime object. Punches
+        recorded in UTC keep their offset, older punches have none.
 
         Examples
         --------
         2020-01-01 01:01:01.010101
-        1923-06-12 15:42:59.326458
+        1923-06-12 15:42:59.326458+00:00
 
         Parameters
         ----------
@@ -268,4 +913,4 @@ class PunchCardManager:
         datetime
             The datetime object that was parsed from the string passed in.
         """
-        return datetime.strptime(date_str, '%Y-%m-%d %H:%M:%S.%f')
+        return datetime.fromisoformat(date_str)
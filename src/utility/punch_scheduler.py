@@ -0,0 +1,114 @@
+from datetime import datetime
+from itertools import count
+import heapq
+
+
+class PunchScheduler:
+    """A timer queue holding the punches that are due, earliest first.
+
+    The queue is backed by a heap so that adding a punch and finding the next
+    one due are both cheap, no matter how many punches are waiting.
+
+    Attributes
+    ----------
+    _queue : list
+        The heap of (due, sequence, action) entries.
+
+    _sequence : count
+        Breaks ties between punches due at the same moment, keeping them in the
+        order they were scheduled.
+
+    Methods
+    -------
+    schedule(due, action)
+        Adds the action to the queue to be run at the due time.
+
+    peek()
+        Returns the next due time and action without removing it.
+
+    pop()
+        Removes and returns the next due time and action.
+
+    clear()
+        Removes everything from the queue.
+
+    seconds_until_next(now)
+        Returns how long to wait until the next action is due.
+    """
+
+    def __init__(self):
+        """Creates a new, empty instance of the PunchScheduler."""
+        self._queue = []
+        self._sequence = count()
+
+    def __len__(self) -> int:
+        """Returns the number of actions waiting in the queue."""
+        return len(self._queue)
+
+    def schedule(self, due: datetime, action: any) -> None:
+        """
+        Adds the action to the queue, to be run at the due time.
+
+        Parameters
+        ----------
+        due : datetime, required
+            The time at which the action should be run.
+
+        action : any, required
+            The action to hand back once it is due.
+        """
+        heapq.heappush(self._queue, (due, next(self._sequence), action))
+
+    def peek(self) -> tuple:
+        """
+        Returns the next due time and action, leaving it in the queue.
+
+        Returns
+        -------
+        tuple
+            The due time and action, or an empty tuple if nothing is queued.
+        """
+        if not self._queue:
+            return ()
+
+        due, _, action = self._queue[0]
+        return due, action
+
+    def pop(self) -> tuple:
+        """
+        Removes the next action from the queue and returns it.
+
+        Returns
+        -------
+        tuple
+            The due time and action, or an empty tuple if nothing is queued.
+        """
+        if not self._queue:
+            return ()
+
+        due, _, action = heapq.heappop(self._queue)
+        return due, action
+
+    def clear(self) -> None:
+        """Removes all of the actions from the queue."""
+        self._queue = []
+
+    def seconds_until_next(self, now: datetime) -> float:
+        """
+        Returns the number of seconds to wait until the next action is due.
+
+        Parameters
+        ----------
+        now : datetime, required
+            The time to measure from.
+
+        Returns
+        -------
+        float
+            Seconds until the next action, 0 if it is already due, or -1 if
+            there is nothing in the queue.
+        """
+        if not self._queue:
+            return -1
+
+        return max((self._queue[0][0] - now).total_seconds(), 0)
@@ -0,0 +1,200 @@
+from cryptography.fernet import Fernet, InvalidToken
+from os.path import exists, join
+from src.config import Config
+import json
+import os
+import re
+
+
+# Only these fields are needed to put a cookie back into the browser.
+COOKIE_FIELDS = (
+    'name', 'value', 'domain', 'path', 'secure', 'httpOnly', 'sameSite',
+    'expires'
+)
+
+
+class SessionStore:
+    """Keeps each account's login cookies on disk, encrypted.
+
+    After a restart, the cookies can be put back into a fresh browser. The
+    login and secret question pages are then skipped for as long as the
+    session stays alive on Paylocity's side. The cookies are encrypted with a
+    key kept in a local file, which is created on first use.
+
+    Attributes
+    ----------
+    _directory : string
+        The directory holding one session file per account.
+
+    _fernet : Fernet
+        Encrypts and decrypts the session files.
+
+    Methods
+    -------
+    save(account_id, cookies)
+        Encrypts and writes the cookies for the account.
+
+    load(account_id)
+        Reads back the cookies for the account.
+
+    remove(account_id)
+        Deletes the session file for the account.
+
+    _strip(cookie)
+        Keeps only the fields needed to set the cookie again.
+
+    _path(account_id)
+        Returns the path of the account's session file.
+
+    _load_key(path)
+        Reads the encryption key, creating it if there is none yet.
+    """
+
+    def __init__(self, config: Config):
+        """
+        Creates a new instance of the SessionStore.
+
+        Parameters
+        ----------
+        config : Config, required
+            Configuration object holding the session paths.
+        """
+        self._directory = config.get_session_dir()
+        os.makedirs(self._directory, exist_ok=True)
+
+        self._fernet = Fernet(self._load_key(config.get_session_key_path()))
+
+    def save(self, account_id: str, cookies: list) -> bool:
+        """
+        Encrypts and writes the cookies for the account, replacing any that
+        were saved before.
+
+        Parameters
+        ----------
+        account_id : string, required
+            The account the cookies belong to.
+
+        cookies : list, required
+            The cookies as given by the browser.
+
+        Returns
+        -------
+        bool
+            True if the cookies were written.
+        """
+        cookies = [self._strip(cookie) for cookie in cookies]
+        token = self._fernet.encrypt(json.dumps(cookies).encode())
+
+        try:
+            with open(self._path(account_id), 'wb') as session_file:
+                session_file.write(token)
+        except OSError as exception:
+            print(exception)
+            return False
+
+        return True
+
+    def load(self, account_id: str) -> list:
+        """
+        Reads back the cookies saved for the account.
+
+        Parameters
+        ----------
+        account_id : string, required
+            The account to read the cookies of.
+
+        Returns
+        -------
+        list
+            The saved cookies, empty if there are none or they cannot be read.
+        """
+        try:
+            with open(self._path(account_id), 'rb') as session_file:
+                token = session_file.read()
+        except OSError:
+            return []
+
+        try:
+            return json.loads(self._fernet.decrypt(token))
+        except (InvalidToken, ValueError):
+            return []
+
+    def remove(self, account_id: str) -> None:
+        """
+        Deletes the session file for the account, if there is one.
+
+        Parameters
+        ----------
+        account_id : string, required
+            The account to forget the session of.
+        """
+        try:
+            os.remove(self._path(account_id))
+        except OSError:
+            pass
+
+    @staticmethod
+    def _strip(cookie: dict) -> dict:
+        """
+        Keeps only the fields needed to set the cookie again. Cookies that end
+        with the browser session carry no expiry.
+
+        Parameters
+        ----------
+        cookie : dictionary, required
+            The cookie as given by the browser.
+
+        Returns
+        -------
+        dictionary
+        """
+        stripped = {key: cookie[key] for key in COOKIE_FIELDS if key in cookie}
+
+        if cookie.get('session'):
+            stripped.pop('expires', None)
+
+        return stripped
+
+    def _path(self, account_id: str) -> str:
+        """
+        Returns the path of the account's session file.
+
+        Parameters
+        ----------
+        account_id : string, required
+            The account the file belongs to, None for a single account.
+
+        Returns
+        -------
+        string
+        """
+        name = re.sub(r'[^\w.-]', '_', account_id or 'default')
+        return join(self._directory, '%s.session' % name)
+
+    @staticmethod
+    def _load_key(path: str) -> bytes:
+        """
+        Reads the encryption key from the path, creating it when missing. A
+        new key file is only readable by the current user.
+
+        Parameters
+        ----------
+        path : string, required
+            Where the key is kept.
+
+        Returns
+        -------
+        bytes
+            The encryption key.
+        """
+        if exists(path):
+            with open(path, 'rb') as key_file:
+                return key_file.read()
+
+        key = Fernet.generate_key()
+        descriptor = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+
+        with os.fdopen(descriptor, 'wb') as key_file:
+            key_file.write(key)
+
+        return key
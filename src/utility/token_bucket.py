@@ -0,0 +1,73 @@
+from threading import Lock
+import time
+
+
+class TokenBucket:
+    """A token bucket rate limiter.
+
+    Tokens refill at a steady rate up to the capacity, and each message sent
+    takes one. Taking a token from an empty bucket is allowed, but the caller
+    is told how long to wait so the rate is kept on average.
+
+    Attributes
+    ----------
+    _rate : float
+        Tokens added per second.
+
+    _capacity : float
+        The most tokens the bucket holds, the size of a burst.
+
+    _tokens : float
+        Tokens currently in the bucket, negative when waits are owed.
+
+    _updated : float
+        When the tokens were last refilled, from the monotonic clock.
+
+    _lock : Lock
+        Keeps concurrent takers from double counting.
+
+    Methods
+    -------
+    take()
+        Takes a token, returning how long to wait before using it.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Creates a new, full instance of the TokenBucket.
+
+        Parameters
+        ----------
+        rate : float, required
+            Tokens added per second.
+
+        capacity : float, required
+            The most tokens the bucket holds.
+        """
+        self._rate = rate
+        self._capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = Lock()
+
+    def take(self) -> float:
+        """
+        Takes a token from the bucket.
+
+        Returns
+        -------
+        float
+            Seconds to wait before the token may be used, 0 for right away.
+        """
+        with self._lock:
+            now = time.monotonic()
+            refill = (now - self._updated) * self._rate
+            self._tokens = min(self._capacity, self._tokens + refill)
+            self._updated = now
+
+            self._tokens -= 1
+
+            if self._tokens >= 0:
+                return 0
+
+            return -self._tokens / self._rate
@@ -1,68 +1,134 @@
+from datetime import datetime
+from os.path import join
+from zoneinfo import ZoneInfo
+import pytest
+
+
 # Unit under test
-from src.config import Config
+from src.config import Config, Settings
+
+
+REQUIRED = {
+    'COMPANY_CODE': 'someId',
+    'USERNAME': 'someUsername',
+    'PASSWORD': 'somePassword',
+    'PAYLOCITY_LOGIN_URL': 'someUrl',
+    'PAYLOCITY_BASE_URL': 'someDashboardUrl',
+    'IMPLICIT_WAIT': '10',
+    'STARTING_HOUR': '8',
+    'SECRET_Q_1': 'q1',
+    'SECRET_A_1': 'a1',
+    'SECRET_Q_2': 'q2',
+    'SECRET_A_2': 'a2',
+    'SECRET_Q_3': 'q3',
+    'SECRET_A_3': 'a3'
+}
+
+OPTIONAL = (
+    'DB_SYNCHRONOUS', 'DB_CACHE_SIZE', 'DB_COMMIT_BATCH_SIZE',
+    'DB_COMMIT_INTERVAL', 'DB_BUSY_TIMEOUT', 'EMAIL_ADDRESS', 'EMAIL_PASSWORD',
+    'SMS_GATEWAY', 'PAGER_DIGEST_SECONDS', 'PAGER_MESSAGES_PER_HOUR',
+    'PAGER_BURST', 'ACCOUNT_ID', 'PAYLOCITY_PUNCH_URL', 'PUNCH_BACKEND',
+    'PTO_REFRESH_HOURS', 'WARM_UP_SECONDS', 'AFTER_PUNCH',
+    'PAYLOCITY_LOGOUT_URL', 'TIMEZONE', 'BROWSER_MAX_JOBS',
+    'BROWSER_MAX_HOURS', 'BROWSER_MAX_MB', 'BLOCKED_RESOURCES',
+    'BLOCKED_URLS_LOGIN', 'BLOCKED_URLS_DASHBOARD', 'BLOCKED_URLS_PTO',
+    'BROWSERS', 'ACCOUNT_PROFILES'
+)
+
+
+@pytest.fixture()
+def env(monkeypatch):
+    for name, value in REQUIRED.items():
+        monkeypatch.setenv(name, value)
 
+    for name in OPTIONAL:
+        monkeypatch.delenv(name, raising=False)
 
-def test_get_login_returns_credentials(monkeypatch):
-    monkeypatch.setenv('COMPANY_CODE', 'someId')
-    monkeypatch.setenv('USERNAME', 'someUsername')
-    monkeypatch.setenv('PASSWORD', 'somePassword')
+    return monkeypatch
 
+
+def test_get_login_returns_credentials(env):
     expected = {
         'companyId': 'someId',
         'username': 'someUsername',
         'password': 'somePassword'
     }
 
-    login = Config.get_login()
+    login = Config().get_login()
 
     assert login == expected
 
 
-def test_get_login_url_returns_url_string(monkeypatch):
-    monkeypatch.setenv('PAYLOCITY_LOGIN_URL', 'someUrl')
+def test_get_login_url_returns_url_string(env):
+    assert Config().get_login_url() == 'someUrl'
 
-    assert Config.get_login_url() == 'someUrl'
 
+def test_get_dashboard_url_returns_url_string(env):
+    assert Config().get_dashboard_url() == 'someDashboardUrl'
 
-def test_get_dashboard_url_returns_url_string(monkeypatch):
-    monkeypatch.setenv('PAYLOCITY_BASE_URL', 'someDashboardUrl')
 
-    assert Config.get_dashboard_url() == 'someDashboardUrl'
+def test_get_implicit_wait_returns_number_of_seconds(env):
+    assert Config().get_implicit_wait() == 10
 
 
-def test_get_implicit_wait_returns_number_of_seconds(monkeypatch):
-    monkeypatch.setenv('IMPLICIT_WAIT', '10')
+def test_get_db_path_returns_file_path_to_dotdb_file(env):
+    assert 'database.db' in Config().get_db_path()
 
-    assert Config.get_implicit_wait() == 10
 
+def test_get_db_settings_returns_dictionary(env):
+    env.setenv('DB_SYNCHRONOUS', 'full')
+    env.setenv('DB_CACHE_SIZE', '-4000')
+    env.setenv('DB_COMMIT_BATCH_SIZE', '10')
+    env.setenv('DB_COMMIT_INTERVAL', '0.5')
 
-def test_get_db_path_returns_file_path_to_dotdb_file():
-    assert 'database.db' in Config.get_db_path()
+    expected = {
+        'synchronous': 'FULL',
+        'cache_size': -4000,
+        'commit_batch_size': 10,
+        'commit_interval': 0.5,
+        'busy_timeout': 5.0
+    }
 
+    assert Config().get_db_settings() == expected
 
-def test_get_questions_returns_dictionary_of_questions_answers(monkeypatch):
-    monkeypatch.setenv('SECRET_Q_1', 'q1')
-    monkeypatch.setenv('SECRET_Q_2', 'q2')
-    monkeypatch.setenv('SECRET_Q_3', 'q3')
-    monkeypatch.setenv('SECRET_A_1', 'a1')
-    monkeypatch.setenv('SECRET_A_2', 'a2')
-    monkeypatch.setenv('SECRET_A_3', 'a3')
 
+def test_get_db_settings_has_defaults(env):
+    expected = {
+        'synchronous': 'NORMAL',
+        'cache_size': -2000,
+        'commit_batch_size': 1,
+        'commit_interval': 1.0,
+        'busy_timeout': 5.0
+    }
+
+    assert Config().get_db_settings() == expected
+
+
+def test_get_session_dir_returns_path_in_data(env):
+    assert Config().get_session_dir().endswith(join('data', 'sessions'))
+
+
+def test_get_session_key_path_returns_path_in_data(env):
+    assert Config().get_session_key_path().endswith(join('data', 'session.key'))
+
+
+def test_get_questions_returns_dictionary_of_questions_answers(env):
     expected = {
         'q1': 'a1',
         'q2': 'a2',
         'q3': 'a3'
     }
 
-    questions = Config.get_questions()
+    questions = Config().get_questions()
 
     assert questions == expected
 
 
-def test_get_pager_duty_info_returns_dictionary(monkeypatch):
-    monkeypatch.setenv('EMAIL_ADDRESS', 'email')
-    monkeypatch.setenv('EMAIL_PASSWORD', 'password')
-    monkeypatch.setenv('SMS_GATEWAY', 'phone')
+def test_get_pager_duty_info_returns_dictionary(env):
+    env.setenv('EMAIL_ADDRESS', 'email')
+    env.setenv('EMAIL_PASSWORD', 'password')
+    env.setenv('SMS_GATEWAY', 'phone')
 
     expected = {
         'from': 'email',
@@ -70,12 +136,225 @@ def test_get_pager_duty_info_returns_dictionary(monkeypatch):
         'to': 'phone'
     }
 
-    pager_duty = Config.get_pager_duty_info()
+    pager_duty = Config().get_pager_duty_info()
 
     assert expected == pager_duty
 
 
-def test_get_start_hour_returns_number(monkeypatch):
-    monkeypatch.setenv('STARTING_HOUR', '8')
+def test_get_pager_limits_returns_dictionary(env):
+    env.setenv('PAGER_DIGEST_SECONDS', '900')
+    env.setenv('PAGER_MESSAGES_PER_HOUR', '6')
+    env.setenv('PAGER_BURST', '2')
+
+    expected = {
+        'digest_seconds': 900,
+        'messages_per_hour': 6,
+        'burst': 2
+    }
+
+    assert Config().get_pager_limits() == expected
+
+
+def test_get_start_hour_returns_number(env):
+    assert Config().get_start_hour() == 8
+
+
+def test_get_account_id_returns_string(env):
+    env.setenv('ACCOUNT_ID', 'someAccount')
+
+    assert Config().get_account_id() == 'someAccount'
+
+
+def test_get_account_id_returns_none_when_empty(env):
+    env.setenv('ACCOUNT_ID', '')
+
+    assert Config().get_account_id() is None
+
+
+def test_get_punch_url_returns_url_string(env):
+    env.setenv('PAYLOCITY_PUNCH_URL', 'somePunchUrl')
+
+    assert Config().get_punch_url() == 'somePunchUrl'
+
+
+@pytest.mark.parametrize('value,expected', [
+    ('http', 'http'),
+    ('', 'browser')
+])
+def test_get_punch_backend_returns_backend(env, value, expected):
+    env.setenv('PUNCH_BACKEND', value)
+    env.setenv('PAYLOCITY_PUNCH_URL', 'somePunchUrl')
+
+    assert Config().get_punch_backend() == expected
+
+
+def test_get_pto_refresh_hours_has_default(env):
+    assert Config().get_pto_refresh_hours() == 72
+
+
+def test_get_warm_up_seconds_has_default(env):
+    assert Config().get_warm_up_seconds() == 120
+
+
+def test_get_browser_limits_has_defaults(env):
+    expected = {'max_jobs': 50, 'max_hours': 24, 'max_memory_mb': 600}
+
+    assert dict(Config().get_browser_limits()) == expected
+
+
+def test_get_browsers_has_default(env):
+    assert Config().get_browsers() == 1
+
+
+def test_get_account_profiles_returns_none_when_empty(env):
+    assert Config().get_account_profiles() is None
+
+
+def test_init_only_checks_shared_settings_with_profiles(env, tmp_path):
+    env.delenv('USERNAME')
+    env.setenv('ACCOUNT_PROFILES', str(tmp_path))
+
+    assert Config().get_account_profiles() == str(tmp_path)
+
+    # A profile names its account, so its own settings are checked.
+    env.setenv('ACCOUNT_ID', 'someAccount')
+
+    with pytest.raises(ValueError) as error:
+        Config()
+
+    assert 'USERNAME' in str(error.value)
+
+
+def test_get_blocked_urls_blocks_every_resource_by_default(env):
+    blocked_urls = Config().get_blocked_urls()
+
+    assert set(blocked_urls) == {'login', 'dashboard', 'pto'}
+    assert '*.png*' in blocked_urls['login']
+    assert '*google-analytics.com*' in blocked_urls['pto']
+
+
+def test_get_blocked_urls_adds_page_patterns(env):
+    env.setenv('BLOCKED_RESOURCES', 'font')
+    env.setenv('BLOCKED_URLS_PTO', '*/widgets/* , *.css')
+
+    blocked_urls = Config().get_blocked_urls()
+
+    assert blocked_urls['login'] == blocked_urls['dashboard']
+    assert blocked_urls['pto'] == blocked_urls['login'] + ('*/widgets/*', '*.css')
+    assert '*.png*' not in blocked_urls['pto']
+
+
+def test_get_blocked_urls_blocks_nothing_for_none(env):
+    env.setenv('BLOCKED_RESOURCES', 'none')
+
+    assert Config().get_blocked_urls()['login'] == ()
+
+
+def test_get_timezone_returns_named_zone(env):
+    env.setenv('TIMEZONE', 'America/Chicago')
+
+    assert Config().get_timezone() == ZoneInfo('America/Chicago')
+
+
+def test_get_timezone_defaults_to_host_zone(env):
+    now = datetime(2020, 3, 18, 9)
+    zone = Config().get_timezone()
+
+    assert now.replace(tzinfo=zone).utcoffset() == now.astimezone().utcoffset()
+
+
+@pytest.mark.parametrize('value,expected', [
+    ('', 'about:blank'),
+    ('blank', 'about:blank'),
+    ('logout', 'someLogoutUrl'),
+    ('stay', None)
+])
+def test_get_after_punch_url_returns_url(env, value, expected):
+    env.setenv('AFTER_PUNCH', value)
+    env.setenv('PAYLOCITY_LOGOUT_URL', 'someLogoutUrl')
+
+    assert Config().get_after_punch_url() == expected
+
+
+@pytest.mark.parametrize('name,value', [
+    ('USERNAME', ''),
+    ('IMPLICIT_WAIT', 'ten'),
+    ('STARTING_HOUR', '24'),
+    ('DB_SYNCHRONOUS', 'sometimes'),
+    ('DB_COMMIT_BATCH_SIZE', '0'),
+    ('DB_COMMIT_INTERVAL', '5'),
+    ('PUNCH_BACKEND', 'carrier pigeon'),
+    ('AFTER_PUNCH', 'google'),
+    ('AFTER_PUNCH', 'logout'),
+    ('TIMEZONE', 'Mars/Olympus_Mons'),
+    ('BROWSER_MAX_JOBS', '0'),
+    ('BROWSERS', '0'),
+    ('ACCOUNT_PROFILES', '/no/such/profiles.json'),
+    ('WARM_UP_SECONDS', '-1'),
+    ('BLOCKED_RESOURCES', 'image,javascript')
+])
+def test_init_raises_on_bad_setting(env, name, value):
+    env.setenv(name, value)
+
+    with pytest.raises(ValueError) as error:
+        Config()
+
+    assert name in str(error.value) or 'PAYLOCITY_LOGOUT_URL' in str(error.value)
+
+
+def test_init_lists_every_bad_setting(env):
+    env.delenv('USERNAME')
+    env.setenv('STARTING_HOUR', 'noon')
+
+    with pytest.raises(ValueError) as error:
+        Config()
+
+    assert 'USERNAME' in str(error.value)
+    assert 'STARTING_HOUR' in str(error.value)
+
+
+def test_init_loads_env_file(env, tmp_path):
+    env.delenv('USERNAME')
+    path = tmp_path / '.env'
+    path.write_text('USERNAME="fromFile"\n')
+
+    assert Config(str(path)).get_login()['username'] == 'fromFile'
+
+
+def test_settings_cannot_be_changed(env):
+    config = Config()
+
+    with pytest.raises(TypeError):
+        config.get_questions()['q1'] = 'changed'
+
+    with pytest.raises(AttributeError):
+        config._settings.start_hour = 9
+
+    assert isinstance(config._settings, Settings)
+    assert not hasattr(config._settings, '__dict__')
+
+
+def test_getters_do_not_read_environment_again(env):
+    config = Config()
+    env.setenv('STARTING_HOUR', '9')
+
+    assert config.get_start_hour() == 8
+
+
+def test_reload_reads_env_file_again(env, tmp_path):
+    path = tmp_path / '.env'
+    path.write_text('STARTING_HOUR="8"\n')
+    config = Config(str(path))
+
+    path.write_text('STARTING_HOUR="6"\n')
+
+    assert config.reload() is True
+    assert config.get_start_hour() == 6
+
+
+def test_reload_keeps_old_settings_when_invalid(env):
+    config = Config()
+    env.setenv('STARTING_HOUR', '25')
 
-    assert Config.get_start_hour() == 8
+    assert config.reload() is False
+    assert config.get_start_hour() == 8
@@ -0,0 +1,132 @@
+import json
+import pytest
+
+
+# Unit under test
+from src.config import ProfileStore
+
+
+SHARED = {
+    'COMPANY_CODE': 'someId',
+    'PAYLOCITY_LOGIN_URL': 'someUrl',
+    'PAYLOCITY_BASE_URL': 'someDashboardUrl',
+    'IMPLICIT_WAIT': '10',
+    'SECRET_Q_1': 'q1',
+    'SECRET_Q_2': 'q2',
+    'SECRET_Q_3': 'q3'
+}
+
+
+def profile(account_id: str, **values) -> dict:
+    return {
+        'ACCOUNT_ID': account_id,
+        'USERNAME': 'user-%s' % account_id,
+        'PASSWORD': 'password',
+        'STARTING_HOUR': 8,
+        'SECRET_A_1': 'a1',
+        'SECRET_A_2': 'a2',
+        'SECRET_A_3': 'a3',
+        **values
+    }
+
+
+def write(path, profiles) -> str:
+    path.write_text(json.dumps(profiles))
+
+    return str(path)
+
+
+def test_reads_a_list_of_profiles_from_a_file(tmp_path):
+    path = write(tmp_path / 'profiles.json', [profile('b'), profile('a')])
+
+    store = ProfileStore(path, str(tmp_path / 'key'), SHARED)
+
+    assert store.get_account_ids() == ['a', 'b']
+
+
+def test_reads_a_profile_per_file_named_by_account(tmp_path):
+    values = profile('ignored')
+    del values['ACCOUNT_ID']
+    write(tmp_path / 'alice.json', values)
+    write(tmp_path / 'bob.json', profile('robert'))
+    (tmp_path / 'notes.txt').write_text('not a profile')
+
+    store = ProfileStore(str(tmp_path), str(tmp_path / 'key'), SHARED)
+
+    assert store.get_account_ids() == ['alice', 'robert']
+
+
+def test_raises_on_profile_without_account_id(tmp_path):
+    values = profile('a')
+    del values['ACCOUNT_ID']
+    path = write(tmp_path / 'profiles.json', [values])
+
+    with pytest.raises(ValueError):
+        ProfileStore(path, str(tmp_path / 'key'), SHARED)
+
+
+def test_raises_on_repeated_account_id(tmp_path):
+    path = write(tmp_path / 'profiles.json', [profile('a'), profile('a')])
+
+    with pytest.raises(ValueError):
+        ProfileStore(path, str(tmp_path / 'key'), SHARED)
+
+
+def test_get_config_lays_profile_over_shared_settings(tmp_path):
+    path = write(tmp_path / 'profiles.json', [profile('a', STARTING_HOUR=6)])
+
+    config = ProfileStore(path, str(tmp_path / 'key'), SHARED).get_config('a')
+
+    assert config.get_login()['companyId'] == 'someId'
+    assert config.get_login()['username'] == 'user-a'
+    assert config.get_start_hour() == 6
+    assert config.get_account_id() == 'a'
+
+
+def test_get_config_builds_each_config_once(tmp_path):
+    path = write(tmp_path / 'profiles.json', [profile('a'), profile('b')])
+    store = ProfileStore(path, str(tmp_path / 'key'), SHARED)
+
+    assert store.get_config('a') is store.get_config('a')
+    assert store.get_configs() == [store.get_config('a'), store.get_config('b')]
+
+
+def test_get_config_checks_settings_on_first_use(tmp_path):
+    path = write(tmp_path / 'profiles.json', [profile('a', STARTING_HOUR=30)])
+    store = ProfileStore(path, str(tmp_path / 'key'), SHARED)
+
+    with pytest.raises(ValueError):
+        store.get_config('a')
+
+
+def test_encrypted_values_are_decrypted_when_handed_out(tmp_path):
+    key_path = str(tmp_path / 'key')
+    empty = write(tmp_path / 'empty.json', [])
+    encrypted = ProfileStore(empty, key_path, SHARED).encrypt('hunter2')
+
+    path = write(tmp_path / 'profiles.json', [profile('a', PASSWORD=encrypted)])
+    config = ProfileStore(path, key_path, SHARED).get_config('a')
+
+    assert 'hunter2' not in repr(config._settings)
+    assert config.get_login()['password'] == 'hunter2'
+
+
+def test_encrypted_value_with_wrong_key_raises(tmp_path):
+    encrypted = ProfileStore(
+        write(tmp_path / 'empty.json', []), str(tmp_path / 'key'), SHARED
+    ).encrypt('hunter2')
+
+    path = write(tmp_path / 'profiles.json', [profile('a', PASSWORD=encrypted)])
+    config = ProfileStore(path, str(tmp_path / 'other'), SHARED).get_config('a')
+
+    with pytest.raises(ValueError):
+        config.get_login()
+
+
+def test_key_is_created_readable_only_by_owner(tmp_path):
+    key_path = tmp_path / 'key'
+    store = ProfileStore(write(tmp_path / 'empty.json', []), str(key_path), SHARED)
+
+    store.encrypt('value')
+
+    assert key_path.stat().st_mode & 0o777 == 0o600
@@ -1,4 +1,5 @@
-from unittest.mock import Mock, patch
+from threading import Event, Thread
+from unittest.mock import call, Mock, patch
 import sqlite3
 import pytest
 
@@ -7,6 +8,15 @@ import pytest
 from src.database import Database
 
 
+config = Mock()
+config.get_db_settings = Mock(return_value={
+    'synchronous': 'NORMAL',
+    'cache_size': -2000,
+    'commit_batch_size': 1,
+    'commit_interval': 1,
+    'busy_timeout': 5
+})
+
 cursor = Mock()
 cursor.execute = Mock()
 cursor.fetchall = Mock()
@@ -19,7 +29,7 @@ connection.cursor = Mock(return_value=cursor)
 
 def test_commit():
     with patch.object(sqlite3, 'connect', return_value=connection):
-        db = Database(Mock())
+        db = Database(config)
         db.commit()
 
     connection.commit.assert_called_once()
@@ -28,7 +38,7 @@ def test_commit():
 @pytest.mark.parametrize('sql,data', [('some sql', (1,)), ('more sql', None)])
 def test_execute(sql, data):
     with patch.object(sqlite3, 'connect', return_value=connection):
-        db = Database(Mock())
+        db = Database(config)
         if data is not None:
             db.execute(sql, data)
         else:
@@ -46,7 +56,7 @@ def test_fetchall():
     expected = [(1,), (2,)]
     cursor.fetchall.return_value = expected
     with patch.object(sqlite3, 'connect', return_value=connection):
-        db = Database(Mock())
+        db = Database(config)
         actual = db.fetchall()
 
     cursor.fetchall.assert_called_once()
@@ -57,7 +67,7 @@ def test_fetchone():
     expected = (1,)
     cursor.fetchone.return_value = expected
     with patch.object(sqlite3, 'connect', return_value=connection):
-        db = Database(Mock())
+        db = Database(config)
         actual = db.fetchone()
 
     cursor.fetchone.assert_called_once()
@@ -68,7 +78,216 @@ def test_get_last_row_id():
     expected = 123
     cursor.lastrowid = expected
     with patch.object(sqlite3, 'connect', return_value=connection):
-        db = Database(Mock())
+        db = Database(config)
         actual = db.get_last_row_id()
 
-    assert actual is expected
\ No newline at end of file
+    assert actual is expected
+
+def thread_connection():
+    thread_cursor = Mock()
+    thread_connection = Mock()
+    thread_connection.cursor = Mock(return_value=thread_cursor)
+
+    return thread_connection
+
+
+def test_each_thread_gets_its_own_connection():
+    connections = [thread_connection(), thread_connection()]
+
+    with patch.object(sqlite3, 'connect', side_effect=connections):
+        db = Database(config)
+        db.execute('main thread')
+
+        worker = Thread(target=db.execute, args=('worker thread',))
+        worker.start()
+        worker.join()
+
+        db.execute('main thread again')
+
+    main_cursor = connections[0].cursor.return_value
+    worker_cursor = connections[1].cursor.return_value
+
+    assert main_cursor.execute.call_count == 2
+    worker_cursor.execute.assert_called_once_with('worker thread', ())
+
+
+def test_unit_of_work_commits_once_at_the_end():
+    unit_connection = thread_connection()
+
+    with patch.object(sqlite3, 'connect', return_value=unit_connection):
+        db = Database(config)
+
+        with db.unit_of_work():
+            db.execute('first')
+            db.commit()
+            with db.unit_of_work():
+                db.execute('second')
+                db.commit()
+
+            unit_connection.commit.assert_not_called()
+
+    unit_connection.commit.assert_called_once()
+
+
+def test_unit_of_work_rolls_back_on_error():
+    unit_connection = thread_connection()
+
+    with patch.object(sqlite3, 'connect', return_value=unit_connection):
+        db = Database(config)
+
+        with pytest.raises(sqlite3.OperationalError):
+            with db.unit_of_work():
+                db.execute('first')
+                raise sqlite3.OperationalError()
+
+        # The thread can carry on committing after the failed unit of work.
+        db.commit()
+
+    unit_connection.rollback.assert_called_once()
+    unit_connection.commit.assert_called_once()
+
+
+def test_close_closes_every_thread_connection():
+    connections = [thread_connection(), thread_connection()]
+
+    with patch.object(sqlite3, 'connect', side_effect=connections):
+        db = Database(config)
+        db.execute('main thread')
+
+        worker = Thread(target=db.execute, args=('worker thread',))
+        worker.start()
+        worker.join()
+
+        db.close()
+
+    for closed in connections:
+        closed.close.assert_called_once()
+
+
+def test_connect_sets_wal_and_pragmas():
+    pragma_connection = thread_connection()
+
+    with patch.object(sqlite3, 'connect', return_value=pragma_connection) as connect:
+        db = Database(config)
+        db.execute('some sql')
+
+    assert connect.call_args[1]['timeout'] == 5
+    pragma_connection.execute.assert_has_calls([
+        call('PRAGMA journal_mode=WAL'),
+        call('PRAGMA synchronous=NORMAL'),
+        call('PRAGMA cache_size=-2000')
+    ])
+
+
+def test_init_raises_for_unknown_synchronous_mode():
+    bad_config = Mock()
+    bad_config.get_db_settings = Mock(return_value={'synchronous': 'SOMETIMES'})
+
+    with pytest.raises(ValueError):
+        Database(bad_config)
+
+
+@pytest.fixture()
+def batched_config():
+    batched = Mock()
+    batched.get_db_settings = Mock(return_value={
+        'synchronous': 'NORMAL',
+        'cache_size': -2000,
+        'commit_batch_size': 3,
+        'commit_interval': 60,
+        'busy_timeout': 120
+    })
+
+    return batched
+
+
+def test_commit_waits_for_batch_to_fill(batched_config):
+    batch_connection = thread_connection()
+
+    with patch.object(sqlite3, 'connect', return_value=batch_connection):
+        db = Database(batched_config)
+        db.commit()
+        db.commit()
+
+        batch_connection.commit.assert_not_called()
+
+        db.commit()
+
+    batch_connection.commit.assert_called_once()
+
+
+def test_commit_flushes_after_interval(batched_config):
+    batched_config.get_db_settings.return_value['commit_interval'] = 0.01
+    batch_connection = thread_connection()
+    flushed = Event()
+    batch_connection.commit = Mock(side_effect=lambda: flushed.set())
+
+    with patch.object(sqlite3, 'connect', return_value=batch_connection):
+        db = Database(batched_config)
+        db.commit()
+
+    assert flushed.wait(5)
+    batch_connection.commit.assert_called_once()
+
+
+def test_close_flushes_batched_commits(batched_config):
+    batch_connection = thread_connection()
+
+    with patch.object(sqlite3, 'connect', return_value=batch_connection):
+        db = Database(batched_config)
+        db.commit()
+        db.close()
+
+    batch_connection.commit.assert_called_once()
+    batch_connection.close.assert_called_once()
+
+
+def test_unit_of_work_flushes_batch_before_starting(batched_config):
+    batch_connection = thread_connection()
+
+    with patch.object(sqlite3, 'connect', return_value=batch_connection):
+        db = Database(batched_config)
+        db.commit()
+
+        with pytest.raises(sqlite3.OperationalError):
+            with db.unit_of_work():
+                raise sqlite3.OperationalError()
+
+    batch_connection.commit.assert_called_once()
+    batch_connection.rollback.assert_called_once()
+
+
+def test_batch_of_one_thread_does_not_lock_out_another(tmp_path):
+    shared = Mock()
+    shared.get_db_path = Mock(return_value=str(tmp_path / 'database.db'))
+    shared.get_db_settings = Mock(return_value={
+        'synchronous': 'NORMAL',
+        'cache_size': -2000,
+        'commit_batch_size': 10,
+        'commit_interval': 0.2,
+        'busy_timeout': 2
+    })
+
+    db = Database(shared)
+    db.execute('CREATE TABLE punches (action TEXT)')
+    db.flush()
+
+    # The first thread's batch holds the write lock until the interval.
+    db.execute('INSERT INTO punches VALUES (?)', ('Clock In',))
+    db.commit()
+
+    errors = []
+
+    def write():
+        try:
+            db.execute('INSERT INTO punches VALUES (?)', ('Clock Out',))
+            db.commit()
+        except sqlite3.OperationalError as exception:
+            errors.append(exception)
+
+    thread = Thread(target=write)
+    thread.start()
+    thread.join()
+    db.close()
+
+    assert errors == []
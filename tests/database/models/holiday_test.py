@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import date, datetime
 from random import randint
 from sqlite3 import OperationalError
 from unittest.mock import Mock
@@ -6,7 +6,7 @@ import pytest
 
 
 # Unit under test
-from src.database.models import Holiday
+from src.database.models import Holiday, from_date_key, to_date_key
 
 
 @pytest.fixture()
@@ -15,6 +15,7 @@ def connection():
     connection.commit = Mock()
     connection.execute = Mock()
     connection.fetchall = Mock()
+    connection.fetchone = Mock()
     connection.get_last_row_id = Mock()
 
     return connection
@@ -33,6 +34,13 @@ def test_add_holiday_returns_row_id(connection):
     assert actual is expected
 
 
+def test_add_holiday_writes_date_key(connection):
+    holiday = Holiday(connection)
+    holiday.add_holiday(datetime(2020, 12, 25))
+
+    assert connection.execute.call_args[0][1] == ('December', 25, 2020, 20201225)
+
+
 def test_add_holiday_returns_negative_one_on_exception_thrown(connection):
     connection.commit.side_effect = OperationalError()
 
@@ -44,7 +52,7 @@ def test_add_holiday_returns_negative_one_on_exception_thrown(connection):
 
 def test_get_row_id_by_date_returns_row_id(connection):
     expected = randint(1,999)
-    connection.fetchall.return_value = [(expected,)]
+    connection.fetchone.return_value = (expected,)
 
     holiday = Holiday(connection)
     actual = holiday.get_row_id_by_date(datetime.now())
@@ -53,6 +61,17 @@ def test_get_row_id_by_date_returns_row_id(connection):
     assert actual is expected
 
 
+def test_get_row_id_by_date_looks_up_date_key(connection):
+    connection.fetchone.return_value = (1,)
+
+    holiday = Holiday(connection)
+    holiday.get_row_id_by_date(datetime(2020, 11, 26))
+
+    connection.execute.assert_called_once_with(
+        'SELECT id FROM holidays WHERE date_key=?', (20201126,)
+    )
+
+
 def test_get_row_id_by_date_returns_negative_one_on_exception(connection):
     connection.execute.side_effect = OperationalError()
 
@@ -62,6 +81,36 @@ def test_get_row_id_by_date_returns_negative_one_on_exception(connection):
     assert actual is -1
 
 
+def test_get_row_id_by_date_returns_negative_one_when_not_found(connection):
+    connection.fetchone.return_value = None
+
+    holiday = Holiday(connection)
+    actual = holiday.get_row_id_by_date(datetime.now())
+
+    assert actual == -1
+
+
+def test_get_holidays_between_returns_dates(connection):
+    connection.fetchall.return_value = [(20201126,), (20201127,)]
+
+    holiday = Holiday(connection)
+    actual = holiday.get_holidays_between(
+        datetime(2020, 11, 1), datetime(2020, 11, 30)
+    )
+
+    assert connection.execute.call_args[0][1] == (20201101, 20201130)
+    assert actual == [date(2020, 11, 26), date(2020, 11, 27)]
+
+
+def test_get_holidays_between_returns_empty_list_on_exception(connection):
+    connection.execute.side_effect = OperationalError()
+
+    holiday = Holiday(connection)
+    actual = holiday.get_holidays_between(datetime.now(), datetime.now())
+
+    assert actual == []
+
+
 def test_is_holiday_returns_false_for_no_records_found(connection):
     connection.fetchall.return_value = []
 
@@ -72,7 +121,8 @@ def test_is_holiday_returns_false_for_no_records_found(connection):
 
 
 def test_is_holiday_returns_true_when_finds_record(connection):
-    connection.fetchall.return_value = [('some date found',)]
+    now = datetime.now()
+    connection.fetchall.return_value = [(20200101,), (to_date_key(now),)]
 
     holiday = Holiday(connection)
     actual = holiday.is_holiday(datetime.now())
@@ -89,6 +139,40 @@ def test_is_holiday_returns_true_when_exception_thrown(connection):
     assert actual is True
 
 
+def test_is_holiday_only_reads_table_once(connection):
+    connection.fetchall.return_value = [(20200101,)]
+
+    holiday = Holiday(connection)
+    holiday.is_holiday(datetime(2020, 1, 1))
+    actual = holiday.is_holiday(datetime(2020, 1, 2))
+
+    connection.execute.assert_called_once()
+    assert actual is False
+
+
+def test_add_holiday_is_seen_without_reading_table_again(connection):
+    connection.fetchall.return_value = []
+
+    holiday = Holiday(connection)
+    holiday.is_holiday(datetime(2020, 7, 3))
+    holiday.add_holiday(datetime(2020, 7, 3))
+
+    assert holiday.is_holiday(datetime(2020, 7, 3)) is True
+    assert connection.fetchall.call_count == 1
+
+
+def test_remove_holiday_reads_table_again(connection):
+    connection.fetchall.return_value = [(20200703,)]
+
+    holiday = Holiday(connection)
+    holiday.is_holiday(datetime(2020, 7, 3))
+    holiday.remove_holiday(randint(1,999))
+    connection.fetchall.return_value = []
+
+    assert holiday.is_holiday(datetime(2020, 7, 3)) is False
+    assert connection.fetchall.call_count == 2
+
+
 def test_remove_holiday_returns_true_on_success(connection):
     holiday = Holiday(connection)
     actual = holiday.remove_holiday(randint(1,999))
@@ -103,3 +187,12 @@ def test_remove_holiday_returns_false_on_exception_throw(connection):
     actual = holiday.remove_holiday(randint(1,999))
 
     assert actual is False
+
+
+@pytest.mark.parametrize('value,key', [
+    (date(2020, 1, 1), 20200101),
+    (date(1999, 12, 31), 19991231)
+])
+def test_date_key_round_trip(value, key):
+    assert to_date_key(value) == key
+    assert from_date_key(key) == value
@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import date, datetime
 from sqlite3 import OperationalError
 from unittest.mock import call, Mock
 import pytest
@@ -9,6 +9,9 @@ from src.database.models import Punch
 
 
 ALL_BOOLEANS = [(True,), (False,)]
+MOST_RECENT_SQL = (
+    'SELECT * FROM punches WHERE account_id IS ? ORDER BY id DESC LIMIT 1'
+)
 
 
 @pytest.fixture()
@@ -63,7 +66,7 @@ def test_get_punch_by_id_returns_empty_tuple_on_error(connection):
 ])
 def test_punch_actions(connection, error, action, db_column, expected):
     id_ = 1
-    connection.fetchone.return_value = (id_,)
+    connection.fetchone.return_value = (id_, '2020-01-01', 1, None, None, None, None, None)
     connection.execute.side_effect = [None, error]
 
     punch = Punch(connection)
@@ -86,7 +89,7 @@ def test_punch_actions(connection, error, action, db_column, expected):
     expected_sql = 'UPDATE punches SET %s=? WHERE id=?' % (db_column,)
     connection.execute.assert_has_calls(
         [
-            call('SELECT * FROM punches ORDER BY id DESC LIMIT 1'),
+            call(MOST_RECENT_SQL, (None,)),
             call(expected_sql, (punch_time, id_))
         ]
     )
@@ -102,6 +105,33 @@ def test_insert_new_day_returns_true_on_insert(connection):
     assert actual is True
 
 
+def test_insert_new_day_records_account(connection):
+    punch = Punch(connection, 'some-account')
+    punch.insert_new_day()
+
+    sql, data = connection.execute.call_args[0]
+    assert sql == 'INSERT INTO punches(punch_day, account_id) VALUES(?, ?)'
+    assert data[1] == 'some-account'
+
+
+def test_insert_new_day_records_given_day(connection):
+    punch = Punch(connection)
+    punch.insert_new_day(date(2020, 3, 18))
+
+    assert connection.execute.call_args[0][1][0] == date(2020, 3, 18)
+
+
+def test_get_most_recent_day_filters_by_account(connection):
+    connection.fetchone.return_value = None
+
+    punch = Punch(connection, 'some-account')
+    punch.get_most_recent_day()
+
+    connection.execute.assert_called_once_with(
+        MOST_RECENT_SQL, ('some-account',)
+    )
+
+
 def test_insert_new_day_returns_false_on_failure(connection):
     connection.execute.side_effect = OperationalError()
 
@@ -121,8 +151,7 @@ def test_get_most_recent_day_returns_day(connection):
     punch = Punch(connection)
     actual = punch.get_most_recent_day()
 
-    sql = 'SELECT * FROM punches ORDER BY id DESC LIMIT 1'
-    connection.execute.assert_called_once_with(sql)
+    connection.execute.assert_called_once_with(MOST_RECENT_SQL, (None,))
     assert actual is expected
 
 
@@ -180,3 +209,61 @@ def test_update_is_work_day_returns_false_on_failure(connection):
 
     connection.commit.assert_not_called()
     assert actual is False
+
+
+@pytest.fixture()
+def cached_punch(connection):
+    connection.get_last_row_id = Mock(return_value=7)
+
+    punch = Punch(connection, 'some-account')
+    punch.insert_new_day()
+    connection.execute.reset_mock()
+
+    return punch
+
+
+def test_insert_new_day_caches_new_row(connection, cached_punch):
+    row = cached_punch.get_most_recent_day()
+
+    connection.execute.assert_not_called()
+    assert row[0] == 7
+    assert row[1] == str(date.today())
+    assert row[2:] == (None, None, None, None, None, 'some-account')
+
+
+def test_get_most_recent_day_reads_database_once(connection):
+    expected = (1, '2020-01-01', None, None, None, None, None, None)
+    connection.fetchone.return_value = expected
+
+    punch = Punch(connection)
+    punch.get_most_recent_day()
+    actual = punch.get_most_recent_day()
+
+    connection.execute.assert_called_once()
+    assert actual == expected
+
+
+def test_punch_writes_through_cache(connection, cached_punch):
+    punch_time = datetime(2020, 1, 1, 8, 0, 0, 123456)
+
+    assert cached_punch.in_(punch_time) is True
+    assert cached_punch.update_is_work_day(True) is True
+
+    # Only the updates are sent, the row is never read back.
+    connection.execute.assert_has_calls([
+        call('UPDATE punches SET clock_in=? WHERE id=?', (punch_time, 7)),
+        call('UPDATE punches SET is_work_day=? WHERE id=?', (True, 7))
+    ])
+    assert connection.execute.call_count == 2
+
+    row = cached_punch.get_most_recent_day()
+    assert row[2] == 1
+    assert row[3] == '2020-01-01 08:00:00.123456'
+    assert cached_punch.get_punch_by_id(7) == row
+
+
+def test_failed_punch_leaves_cache_untouched(connection, cached_punch):
+    connection.execute.side_effect = OperationalError()
+
+    assert cached_punch.out(datetime.now()) is False
+    assert cached_punch.get_most_recent_day()[6] is None
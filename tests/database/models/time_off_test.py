@@ -0,0 +1,131 @@
+from datetime import date, datetime
+from sqlite3 import OperationalError
+from unittest.mock import MagicMock, Mock, call
+from src.records import PtoRecord
+import pytest
+
+
+# Unit under test
+from src.database.models import TimeOff
+
+
+NOW = datetime(2020, 3, 1, 9)
+
+
+@pytest.fixture()
+def connection():
+    connection = Mock()
+    connection.commit = Mock()
+    connection.execute = Mock()
+    connection.fetchall = Mock(return_value=[])
+    connection.fetchone = Mock()
+    connection.unit_of_work = MagicMock()
+
+    return connection
+
+
+def writes(connection):
+    return [
+        args[0].split()[0] for args, _ in connection.execute.call_args_list[1:-2]
+    ]
+
+
+def test_sync_inserts_new_approved_records(connection):
+    pto = TimeOff(connection, 'abc')
+    actual = pto.sync(
+        [
+            PtoRecord(date(2020, 3, 2), date(2020, 3, 3), 16, 'Approved'),
+            PtoRecord(date(2020, 3, 9), date(2020, 3, 9), 8, 'Pending')
+        ],
+        NOW
+    )
+
+    assert actual == 1
+    assert writes(connection) == ['INSERT']
+    assert connection.execute.call_args_list[1][0][1] == ('abc', 20200302, 20200303, 16,)
+    connection.unit_of_work.return_value.__enter__.assert_called_once()
+
+
+def test_sync_only_writes_changed_rows(connection):
+    connection.fetchall.return_value = [
+        (1, 20200302, 20200303, 16),
+        (2, 20200309, 20200309, 8),
+        (3, 20200316, 20200316, 8)
+    ]
+
+    pto = TimeOff(connection, 'abc')
+    actual = pto.sync(
+        [
+            PtoRecord(date(2020, 3, 2), date(2020, 3, 3), 16, 'Approved'),
+            PtoRecord(date(2020, 3, 9), date(2020, 3, 10), 12, 'Approved')
+        ],
+        NOW
+    )
+
+    assert actual == 2
+    assert writes(connection) == ['UPDATE', 'DELETE']
+    assert connection.execute.call_args_list[1][0][1] == (20200310, 12, 2,)
+    assert connection.execute.call_args_list[2][0][1] == (3,)
+
+
+def test_sync_records_when_it_ran(connection):
+    pto = TimeOff(connection, 'abc')
+    pto.sync([], NOW)
+
+    assert connection.execute.call_args_list[-1][0][1] == ('abc', str(NOW),)
+
+
+def test_sync_returns_negative_one_on_error(connection):
+    connection.execute.side_effect = OperationalError()
+
+    pto = TimeOff(connection)
+    actual = pto.sync([], NOW)
+
+    assert actual == -1
+
+
+def test_get_records_returns_approved_records(connection):
+    connection.fetchall.return_value = [(20200302, 20200303, 16)]
+
+    pto = TimeOff(connection)
+    actual = pto.get_records()
+
+    assert actual == [
+        PtoRecord(date(2020, 3, 2), date(2020, 3, 3), 16, 'Approved')
+    ]
+
+
+def test_get_records_returns_empty_on_error(connection):
+    connection.execute.side_effect = OperationalError()
+
+    pto = TimeOff(connection)
+
+    assert pto.get_records() == []
+
+
+@pytest.mark.parametrize('row,expected', [(None, None), ((str(NOW),), NOW)])
+def test_get_synced_at(connection, row, expected):
+    connection.fetchone.return_value = row
+
+    pto = TimeOff(connection)
+
+    assert pto.get_synced_at() == expected
+
+
+@pytest.mark.parametrize('row,expected', [(None, False), ((1,), True)])
+def test_is_pto_day_uses_date_key(connection, row, expected):
+    connection.fetchone.return_value = row
+
+    pto = TimeOff(connection, 'abc')
+    actual = pto.is_pto_day(datetime(2020, 3, 2, 9))
+
+    assert connection.execute.call_args[0][1] == ('abc', 20200302, 20200302,)
+    assert actual is expected
+
+
+def test_is_pto_day_returns_true_on_error(connection):
+    connection.execute.side_effect = OperationalError()
+
+    pto = TimeOff(connection)
+
+    assert pto.is_pto_day(NOW) is True
@@ -0,0 +1,68 @@
+from selenium.common.exceptions import WebDriverException
+from unittest.mock import call, Mock
+
+
+# Unit under test
+from src.pages import RequestBlocker
+
+
+BLOCKED_URLS = {
+    'login': ('*.png*', '*.woff*'),
+    'dashboard': ('*.png*', '*.woff*'),
+    'pto': ('*.png*',)
+}
+
+
+def test_block_enables_network_and_blocks_page_urls():
+    driver = Mock()
+
+    RequestBlocker(driver, BLOCKED_URLS).block('login')
+
+    driver.execute_cdp_cmd.assert_has_calls([
+        call('Network.enable', {}),
+        call('Network.setBlockedURLs', {'urls': ['*.png*', '*.woff*']})
+    ])
+
+
+def test_block_only_tells_browser_of_changes():
+    driver = Mock()
+
+    RequestBlocker(driver, BLOCKED_URLS).block('login')
+    RequestBlocker(driver, BLOCKED_URLS).block('dashboard')
+    RequestBlocker(driver, BLOCKED_URLS).block('pto')
+
+    assert driver.execute_cdp_cmd.call_args_list == [
+        call('Network.enable', {}),
+        call('Network.setBlockedURLs', {'urls': ['*.png*', '*.woff*']}),
+        call('Network.setBlockedURLs', {'urls': ['*.png*']})
+    ]
+
+
+def test_block_keeps_browsers_apart():
+    first, second = Mock(), Mock()
+
+    RequestBlocker(first, BLOCKED_URLS).block('pto')
+    RequestBlocker(second, BLOCKED_URLS).block('pto')
+
+    second.execute_cdp_cmd.assert_called_with(
+        'Network.setBlockedURLs', {'urls': ['*.png*']}
+    )
+
+
+def test_block_without_urls_does_nothing():
+    driver = Mock()
+
+    RequestBlocker(driver).block('login')
+
+    driver.execute_cdp_cmd.assert_not_called()
+
+
+def test_block_ignores_browser_that_cannot_block():
+    driver = Mock()
+    driver.execute_cdp_cmd = Mock(side_effect=WebDriverException('unknown command'))
+
+    RequestBlocker(driver, BLOCKED_URLS).block('login')
+    RequestBlocker(driver, BLOCKED_URLS).block('login')
+
+    # Not remembered as blocked, so it is tried again on the next page.
+    assert driver.execute_cdp_cmd.call_count == 2
@@ -1,4 +1,10 @@
-from src.pages import PaidTimeOff
+from src.pages import LAST_PUNCH_ID, PaidTimeOff, parse_last_punch
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException
+)
+from selenium.webdriver.common.by import By
 from unittest.mock import Mock
 import pytest
 
@@ -13,14 +19,37 @@ def test_init_returns_instance_of_dashboard():
     assert isinstance(dashboard, Dashboard)
 
 
-@pytest.fixture()
-def dash_and_action():
+def clicked_element():
+    # The page reloads once the form is submitted, leaving the button stale.
     mock_element = Mock()
     mock_element.click = Mock()
+    mock_element.is_displayed = Mock(return_value=True)
+    mock_element.is_enabled = Mock(
+        side_effect=[True, StaleElementReferenceException()]
+    )
+
+    return mock_element
+
+
+def page(button, last_punch_text='Clock In 8:01 AM'):
+    last_punch = Mock(text=last_punch_text)
+    last_punch.is_displayed = Mock(return_value=True)
+
+    elements = {LAST_PUNCH_ID: last_punch}
 
     driver = Mock()
     driver.get = Mock()
-    driver.find_element_by_name = Mock(return_value=mock_element)
+    driver.find_element = Mock(
+        side_effect=lambda by, value: elements.get(value, button)
+    )
+
+    return driver
+
+
+@pytest.fixture()
+def dash_and_action():
+    mock_element = clicked_element()
+    driver = page(mock_element)
 
     dash = Dashboard(driver)
 
@@ -58,20 +87,98 @@ def test_clock_out_calls_click_and_nav_away(dash_and_action):
 def test_go_to_pto_clicks_element_and_returns_page_object():
     mock_element = Mock()
     mock_element.click = Mock()
+    mock_element.is_displayed = Mock(return_value=True)
 
     driver = Mock()
     driver.get = Mock()
-    driver.find_element_by_xpath = Mock(return_value=mock_element)
+    driver.find_element = Mock(return_value=mock_element)
 
     dash = Dashboard(driver)
     page = dash.go_to_pto()
 
-    driver.find_element_by_xpath.assert_called_once_with('//a[text()="Launch Time & Attendance"]')
+    driver.find_element.assert_called_once_with(
+        By.XPATH, '//a[text()="Launch Time & Attendance"]'
+    )
     mock_element.click.assert_called_once()
     assert isinstance(page, PaidTimeOff)
 
 
+def test_go_to_pto_blocks_pto_requests_before_clicking():
+    mock_element = Mock()
+    mock_element.is_displayed = Mock(return_value=True)
+
+    driver = Mock()
+    driver.find_element = Mock(return_value=mock_element)
+    mock_element.click = Mock(
+        side_effect=lambda: driver.execute_cdp_cmd.assert_called_with(
+            'Network.setBlockedURLs', {'urls': ['*.png*']}
+        )
+    )
+
+    dash = Dashboard(driver, blocked_urls={'pto': ('*.png*',)})
+    dash.go_to_pto()
+
+    mock_element.click.assert_called_once()
+
+
+@pytest.mark.parametrize(
+    'leave_to,expected',
+    [('about:blank', ['about:blank']), ('https://logout', ['https://logout']), (None, [])]
+)
+def test_click_and_nav_away_leaves_to_configured_page(leave_to, expected):
+    driver = page(clicked_element())
+
+    dash = Dashboard(driver, leave_to=leave_to)
+    dash.clock_in()
+
+    assert [args[0] for args, _ in driver.get.call_args_list] == expected
+
+
+def test_click_and_nav_away_raises_when_punch_does_not_register():
+    mock_element = Mock()
+    mock_element.is_displayed = Mock(return_value=True)
+    mock_element.is_enabled = Mock(return_value=True)
+
+    driver = Mock()
+    driver.find_element = Mock(return_value=mock_element)
+
+    dash = Dashboard(driver, timeout=0.2)
+
+    # Not a missing button, as the punch may have been sent.
+    with pytest.raises(TimeoutException):
+        dash.clock_out()
+
+    mock_element.click.assert_called_once()
+    driver.get.assert_not_called()
+
+
+def test_click_and_nav_away_returns_latest_punch():
+    driver = page(clicked_element(), ' Last punch: START  LUNCH\n12:01 PM ')
+
+    dash = Dashboard(driver)
+
+    assert dash.start_lunch() == 'Start Lunch'
+
+
+def test_get_last_punch_returns_none_when_missing():
+    driver = Mock()
+    driver.find_element = Mock(side_effect=NoSuchElementException())
+
+    dash = Dashboard(driver, timeout=0.2)
+
+    assert dash.get_last_punch() is None
+
+
+@pytest.mark.parametrize('text,expected', [
+    ('Clock In 8:01 AM', 'Clock In'),
+    ('clock  out\n5:00 PM', 'Clock Out'),
+    ('No punches today', None)
+])
+def test_parse_last_punch(text, expected):
+    assert parse_last_punch(text) == expected
+
+
 def _run_action_assertions(action, driver):
-    driver.find_element_by_name.assert_called_once()
+    assert driver.find_element.call_args_list[0][0][0] == By.NAME
     action.click.assert_called_once()
-    driver.get.assert_called_once()
+    driver.get.assert_called_once_with('about:blank')
@@ -0,0 +1,65 @@
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.common.by import By
+from unittest.mock import Mock
+import pytest
+
+
+# Unit under test
+from src.pages import Locator
+
+
+def test_find_returns_element_once_present():
+    element = Mock()
+
+    driver = Mock()
+    driver.find_element = Mock(side_effect=[NoSuchElementException(), element])
+
+    actual = Locator(driver, 1).find(By.ID, 'thing')
+
+    assert actual is element
+    assert driver.find_element.call_count == 2
+
+
+def test_find_raises_no_such_element_after_timeout():
+    driver = Mock()
+    driver.find_element = Mock(side_effect=NoSuchElementException())
+
+    with pytest.raises(NoSuchElementException):
+        Locator(driver, 0.2).find(By.ID, 'thing')
+
+
+def test_clickable_waits_for_element_to_be_enabled():
+    element = Mock()
+    element.is_displayed = Mock(return_value=True)
+    element.is_enabled = Mock(side_effect=[False, True])
+
+    driver = Mock()
+    driver.find_element = Mock(return_value=element)
+
+    actual = Locator(driver, 1).clickable(By.NAME, 'ClockIn')
+
+    assert actual is element
+    assert element.is_enabled.call_count == 2
+
+
+def test_first_of_returns_whichever_shows_up_first():
+    element = Mock()
+    found = {'second': [element]}
+
+    driver = Mock()
+    driver.find_elements = Mock(side_effect=lambda by, value: found.get(value, []))
+
+    actual = Locator(driver, 1).first_of({
+        'one': (By.ID, 'first'),
+        'two': (By.ID, 'second')
+    })
+
+    assert actual == ('two', element)
+
+
+def test_first_of_raises_when_none_show_up():
+    driver = Mock()
+    driver.find_elements = Mock(return_value=[])
+
+    with pytest.raises(NoSuchElementException):
+        Locator(driver, 0.2).first_of({'one': (By.ID, 'first')})
@@ -13,12 +13,15 @@ password = "password"
 
 company_id_element = Mock()
 company_id_element.send_keys = Mock()
+company_id_element.is_displayed = Mock(return_value=True)
 
 username_element = Mock()
 username_element.send_keys = Mock()
+username_element.is_displayed = Mock(return_value=True)
 
 password_element = Mock()
 password_element.send_keys = Mock()
+password_element.is_displayed = Mock(return_value=True)
 
 elements = {
     "CompanyId": company_id_element,
@@ -27,8 +30,8 @@ elements = {
 }
 
 
-def mock_find_element_by_id(arg):
-    return elements[arg]
+def mock_find_element(by, value):
+    return elements[value]
 
 
 def test_login_sends_credentials_and_returns_question():
@@ -42,10 +45,14 @@ def test_login_sends_credentials_and_returns_question():
     config = Mock()
     config.get_login = Mock(return_value=login_creds)
     config.get_login_url = Mock(return_value=fake_url)
+    config.get_implicit_wait = Mock(return_value=1)
+    config.get_blocked_urls = Mock(
+        return_value={'login': ('*.png*',), 'dashboard': ('*.woff*',)}
+    )
 
     driver = Mock()
     driver.get = Mock()
-    driver.find_element_by_id = mock_find_element_by_id
+    driver.find_element = mock_find_element
 
     login_page = Login(config, driver)
 
@@ -58,3 +65,10 @@ def test_login_sends_credentials_and_returns_question():
     username_element.send_keys.assert_called_once_with(username)
     password_element.send_keys.assert_has_calls([call(password), call(Keys.RETURN)])
     assert isinstance(question_page, Question)
+
+    # Each page's requests are blocked before it loads.
+    driver.execute_cdp_cmd.assert_has_calls([
+        call('Network.enable', {}),
+        call('Network.setBlockedURLs', {'urls': ['*.png*']}),
+        call('Network.setBlockedURLs', {'urls': ['*.woff*']})
+    ])
@@ -1,39 +1,39 @@
 from datetime import datetime, timedelta
-from unittest.mock import Mock, patch
-from selenium.common.exceptions import TimeoutException
-from selenium.webdriver.support.ui import WebDriverWait
+from unittest.mock import call, Mock
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.common.by import By
 import pytest
 
 
 # Unit under test
-from src.pages import PaidTimeOff
+from src.pages import PaidTimeOff, PtoRecord
 
 
-clickable_element = Mock()
-clickable_element.click = Mock()
+def element(**kwargs):
+    return Mock(is_displayed=Mock(return_value=True), **kwargs)
 
 
-def driver(start_date='01/01/01', hours='8', status='Approved'):
-    table = Mock(text='%s x %s x %s x' % (start_date, hours, status))
+def driver(start_date='01/01/01', hours='8', status='Approved', text=None):
+    if text is None:
+        text = '%s x %s x %s x' % (start_date, hours, status)
 
-    parent_element = Mock()
-    parent_element.click = Mock()
-    parent_element.find_element_by_class_name = Mock(return_value=table)
+    elements = {'#BenefitsWidget .k-grid-content': element(text=text)}
 
-    nav_bar_element = Mock()
-    nav_bar_element.click = Mock()
+    def find_element(by, value):
+        if value not in elements:
+            elements[value] = element()
+
+        return elements[value]
 
     driver_mock = Mock()
-    driver_mock.find_element_by_id = Mock(return_value=parent_element)
-    driver_mock.find_element_by_class_name = Mock(return_value=nav_bar_element)
+    driver_mock.find_element = Mock(side_effect=find_element)
+    driver_mock.elements = elements
 
     return driver_mock
 
 
-@patch('selenium.webdriver.support.ui.WebDriverWait.until')
-def test_is_pto_day_returns_false_when_request_not_approved(mock_until):
+def test_is_pto_day_returns_false_when_request_not_approved():
     driver_mock = driver(status='Not')
-    mock_until.return_value = clickable_element
 
     pto = PaidTimeOff(driver_mock)
     actual = pto.is_pto_day(datetime.now())
@@ -41,15 +41,29 @@ def test_is_pto_day_returns_false_when_request_not_approved(mock_until):
     assert actual is False
 
 
-@patch('time.sleep')
-def test_navigate_back_to_dash_throws_timeout(mock_sleep):
+def test_navigate_back_to_dash_waits_for_menu_to_open():
     driver_mock = driver(status='Does not matter in this test')
 
-    with patch.object(WebDriverWait, 'until', side_effect=TimeoutException()):
-        pto = PaidTimeOff(driver_mock)
-        pto.is_pto_day(datetime.now())
+    pto = PaidTimeOff(driver_mock)
+    pto.is_pto_day(datetime.now())
+
+    driver_mock.find_element.assert_has_calls([
+        call(By.CLASS_NAME, 'unav-main-menu-title'),
+        call(By.CLASS_NAME, 'unav-drawer-item-title')
+    ])
+    driver_mock.elements['unav-drawer-item-title'].click.assert_called_once()
+
 
-    mock_sleep.assert_called_once()
+def test_navigate_back_to_dash_raises_when_menu_never_opens():
+    driver_mock = driver()
+    hidden = Mock()
+    hidden.is_displayed = Mock(return_value=False)
+    driver_mock.elements['unav-drawer-item-title'] = hidden
+
+    pto = PaidTimeOff(driver_mock, timeout=0.2)
+
+    with pytest.raises(NoSuchElementException):
+        pto.is_pto_day(datetime.now())
 
 
 @pytest.mark.parametrize("delta,expected", [(-3, False), (1, False), (0, True)])
@@ -57,8 +71,30 @@ def test_is_pto_day_returns_boolean_based_on_bounds(delta, expected):
     start_date = (datetime.now() + timedelta(days=delta)).strftime('%m/%d/%Y')
     mock_driver = driver(start_date=start_date, hours='16')
 
-    with patch.object(WebDriverWait, 'until', return_value=clickable_element):
-        pto = PaidTimeOff(mock_driver)
-        actual = pto.is_pto_day(datetime.now())
+    pto = PaidTimeOff(mock_driver)
+    actual = pto.is_pto_day(datetime.now())
+
+    assert actual is expected
+
+
+def test_get_pto_records_reads_every_row():
+    mock_driver = driver(
+        text='03/02/2020 x 8 x Approved x\n03/09/2020 x 20 x Pending x'
+    )
+
+    pto = PaidTimeOff(mock_driver)
+    actual = pto.get_pto_records()
+
+    assert actual == [
+        PtoRecord(datetime(2020, 3, 2).date(), datetime(2020, 3, 2).date(), 8, 'Approved'),
+        PtoRecord(datetime(2020, 3, 9).date(), datetime(2020, 3, 11).date(), 20, 'Pending')
+    ]
+
+
+def test_get_pto_records_skips_unreadable_rows():
+    mock_driver = driver(start_date='No records')
+
+    pto = PaidTimeOff(mock_driver)
+    actual = pto.get_pto_records()
 
-    assert actual is expected
\ No newline at end of file
+    assert actual == []
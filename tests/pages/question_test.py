@@ -1,5 +1,5 @@
 from src.pages import Dashboard
-from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from unittest.mock import call, Mock
 import pytest
@@ -19,6 +19,7 @@ def config():
 
     config = Mock()
     config.get_questions = Mock(return_value=questions)
+    config.get_implicit_wait = Mock(return_value=0.2)
 
     return config
 
@@ -28,41 +29,61 @@ def driver():
     driver = Mock()
 
     question_element = Mock(text=question_text)
-    driver.find_element_by_xpath = Mock(return_value=question_element)
+    question_element.is_displayed = Mock(return_value=True)
+    answer_element = Mock()
+    answer_element.is_displayed = Mock(return_value=True)
+    answer_element.send_keys = Mock()
+
+    elements = {
+        '//label[@for="ChallengeAnswer"]': question_element,
+        'ChallengeAnswer': answer_element
+    }
+    driver.find_element = Mock(side_effect=lambda by, value: elements[value])
+    driver.answer_element = answer_element
 
     return driver
 
 
+def landing(found):
+    return lambda by, value: [Mock()] if value == found else []
+
+
 def test_is_on_question_page_returns_false(config, driver):
-    driver.find_element_by_class_name = Mock()
+    driver.find_elements = Mock(side_effect=landing('header-nav'))
 
     question_page = Question(config, driver)
     actual = question_page.is_on_question_page()
 
-    driver.find_element_by_class_name.assert_called_once_with('header-nav')
+    driver.find_elements.assert_called_once_with(By.CLASS_NAME, 'header-nav')
     assert actual is False
 
 
-def test_is_on_question_page_throws_and_returns_true(config, driver):
-    driver.find_element_by_class_name = Mock(side_effect=NoSuchElementException())
+def test_is_on_question_page_returns_true_once_question_loads(config, driver):
+    driver.find_elements = Mock(side_effect=landing('ChallengeAnswer'))
 
     question_page = Question(config, driver)
     actual = question_page.is_on_question_page()
 
-    driver.find_element_by_class_name.assert_called_once_with('header-nav')
+    driver.find_elements.assert_called_with(By.ID, 'ChallengeAnswer')
     assert actual is True
 
 
-def test_answer_question(config, driver):
-    question_element = Mock()
-    question_element.send_keys = Mock()
+def test_is_on_question_page_times_out_and_returns_true(config, driver):
+    driver.find_elements = Mock(return_value=[])
 
-    driver.find_element_by_id = Mock(return_value=question_element)
+    question_page = Question(config, driver)
+    actual = question_page.is_on_question_page()
 
+    assert actual is True
+
+
+def test_answer_question(config, driver):
     question_page = Question(config, driver)
     dash_page = question_page.answer_question()
 
-    driver.find_element_by_xpath.assert_called_once_with('//label[@for="ChallengeAnswer"]')
-    driver.find_element_by_id.assert_called_once_with('ChallengeAnswer')
-    question_element.send_keys.assert_has_calls([call(answer_text), call(Keys.RETURN)])
+    driver.find_element.assert_has_calls([
+        call(By.XPATH, '//label[@for="ChallengeAnswer"]'),
+        call(By.ID, 'ChallengeAnswer')
+    ])
+    driver.answer_element.send_keys.assert_has_calls([call(answer_text), call(Keys.RETURN)])
     assert isinstance(dash_page, Dashboard)
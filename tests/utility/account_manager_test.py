@@ -0,0 +1,117 @@
+from unittest.mock import Mock, patch
+import pytest
+
+
+# Unit under test
+from src.utility import AccountManager, DriverPool
+
+
+def test_add_account_builds_manager_per_account(args, managers, account_config):
+    args['configs'] = [account_config('a'), account_config('b')]
+
+    account_manager = AccountManager(args)
+
+    assert set(account_manager._managers) == {'a', 'b'}
+    assert account_manager._managers['a'] is not account_manager._managers['b']
+
+
+def test_add_account_shares_database_between_accounts(args, managers, account_config):
+    args['configs'] = [account_config('a'), account_config('b')]
+
+    with patch('src.utility.account_manager.Database') as database, \
+            patch('src.utility.account_manager.Punch') as punch:
+        AccountManager(args)
+
+    database.assert_called_once()
+    assert punch.call_args_list[0][0][0] is punch.call_args_list[1][0][0]
+
+
+@pytest.mark.parametrize('ids', [[None], ['a', 'a']])
+def test_add_account_raises_without_unique_id(args, managers, account_config, ids):
+    args['configs'] = [account_config(id_) for id_ in ids]
+
+    with pytest.raises(ValueError):
+        AccountManager(args)
+
+
+def test_workers_default_to_one_per_driver(args):
+    args['drivers'] = DriverPool([Mock(), Mock(), Mock()])
+
+    assert AccountManager(args)._workers == 3
+
+
+def test_run_hands_account_back_with_wait(args, managers, account_config):
+    driver = Mock()
+    args['drivers'] = DriverPool([driver])
+    args['configs'] = [account_config('a')]
+
+    account_manager = AccountManager(args)
+    manager = account_manager._managers['a']
+    manager.run_pending = Mock(return_value=42)
+
+    account_manager._run('a')
+
+    manager.set_driver.assert_called_once_with(driver)
+    assert account_manager._finished.get_nowait() == ('a', 42)
+
+
+def test_run_sends_browser_work_to_worker_processes(args, managers, account_config):
+    browsers = Mock()
+    browsers.__len__ = Mock(return_value=2)
+    args['browsers'] = browsers
+    args['configs'] = [account_config('a')]
+    del args['drivers']
+
+    with patch('src.utility.account_manager.PunchCardManager') as manager:
+        manager.side_effect = lambda account_args: Mock()
+        account_manager = AccountManager(args)
+
+    assert manager.call_args[0][0]['browsers'] is browsers
+    assert account_manager._workers == 2
+
+    account_manager._managers['a'].run_pending = Mock(return_value=42)
+    account_manager._run('a')
+
+    account_manager._managers['a'].set_driver.assert_not_called()
+    assert account_manager._finished.get_nowait() == ('a', 42)
+
+
+def test_run_alerts_and_retries_on_crash(args, managers, account_config):
+    args['configs'] = [account_config('a')]
+
+    account_manager = AccountManager(args)
+    account_manager._managers['a'].run_pending = Mock(side_effect=Exception())
+
+    account_manager._run('a')
+
+    account_manager._pagers['a'].alert.assert_called_once()
+    assert account_manager._finished.get_nowait() == ('a', 60)
+
+
+def test_start_runs_every_account_until_stopped(args, managers, account_config):
+    args['configs'] = [account_config('a'), account_config('b')]
+
+    account_manager = AccountManager(args)
+
+    ran = []
+
+    def run_pending(account_id):
+        def run(now):
+            ran.append(account_id)
+            if len(ran) == 2:
+                account_manager.stop()
+            return 3600
+        return run
+
+    for account_id, manager in account_manager._managers.items():
+        manager.run_pending = Mock(side_effect=run_pending(account_id))
+
+    account_manager.start()
+
+    assert sorted(ran) == ['a', 'b']
+    for manager in account_manager._managers.values():
+        manager.prepare.assert_called_once()
+    for pager in account_manager._pagers.values():
+        pager.close.assert_called_once()
+    for connection, _ in account_manager._databases.values():
+        connection.close.assert_called_once()
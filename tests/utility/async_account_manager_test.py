@@ -0,0 +1,139 @@
+from threading import Event, current_thread
+from unittest.mock import Mock
+
+
+# Unit under test
+from src.utility import AsyncAccountManager
+from src.utility.async_account_manager import PLANNERS
+
+
+def test_start_runs_every_account_until_stopped(args, managers, account_config):
+    args['configs'] = [account_config('a'), account_config('b')]
+
+    account_manager = AsyncAccountManager(args)
+
+    ran = []
+
+    def run_pending(account_id):
+        def run(now):
+            ran.append(account_id)
+            if len(ran) == 2:
+                account_manager.stop()
+            return 3600
+        return run
+
+    for account_id, manager in account_manager._managers.items():
+        manager.run_pending = Mock(side_effect=run_pending(account_id))
+
+    account_manager.start()
+
+    assert sorted(ran) == ['a', 'b']
+    for manager in account_manager._managers.values():
+        manager.prepare.assert_called_once()
+    for pager in account_manager._pagers.values():
+        pager.close.assert_called_once()
+    for connection, _ in account_manager._databases.values():
+        connection.close.assert_called_once()
+
+
+def test_start_runs_account_again_once_due(args, managers, account_config):
+    args['configs'] = [account_config('a')]
+
+    account_manager = AsyncAccountManager(args)
+
+    def run(now):
+        if manager.run_pending.call_count == 3:
+            account_manager.stop()
+        return 0.01
+
+    manager = account_manager._managers['a']
+    manager.run_pending = Mock(side_effect=run)
+
+    account_manager.start()
+
+    assert manager.run_pending.call_count == 3
+
+
+def test_start_waits_for_many_accounts_on_one_loop(args, managers, account_config):
+    args['configs'] = [account_config(str(n)) for n in range(500)]
+
+    account_manager = AsyncAccountManager(args)
+
+    ran = []
+    threads = set()
+
+    def run(now):
+        threads.add(current_thread().name)
+        if len(ran) == 500:
+            account_manager.stop()
+        return 3600
+
+    for account_id, manager in account_manager._managers.items():
+        manager.run_pending = Mock(
+            side_effect=lambda now, account_id=account_id:
+                ran.append(account_id) or run(now)
+        )
+
+    account_manager.start()
+
+    # Sleeping accounts hold no thread, the work shares the planners.
+    assert len(ran) == 500
+    assert len(threads) <= PLANNERS
+
+
+def test_start_plans_accounts_while_browser_is_busy(managers, account_config):
+    browsers = Mock()
+    browsers.__len__ = Mock(return_value=1)
+    args = {
+        'configs': [account_config('a'), account_config('b')],
+        'browsers': browsers
+    }
+
+    account_manager = AsyncAccountManager(args)
+
+    logging_in = Event()
+    planned = Event()
+
+    def log_in(now):
+        # Holds the only browser until the other account has been planned.
+        logging_in.set()
+        planned.wait(5)
+        account_manager.stop()
+        return 3600
+
+    def plan(now):
+        logging_in.wait(5)
+        planned.set()
+        return 3600
+
+    account_manager._managers['a'].run_pending = Mock(side_effect=log_in)
+    account_manager._managers['b'].run_pending = Mock(side_effect=plan)
+
+    account_manager.start()
+
+    assert planned.is_set()
+
+
+def test_start_alerts_on_crashed_account(args, managers, account_config):
+    args['configs'] = [account_config('a')]
+
+    account_manager = AsyncAccountManager(args)
+
+    def run(now):
+        account_manager.stop()
+        raise Exception()
+
+    manager = account_manager._managers['a']
+    manager.run_pending = Mock(side_effect=run)
+
+    account_manager.start()
+
+    account_manager._pagers['a'].alert.assert_called_once()
+
+
+def test_stop_before_start_is_ignored(args, managers):
+    account_manager = AsyncAccountManager(args)
+
+    account_manager.stop()
+
+    assert account_manager._loop is None
@@ -0,0 +1,196 @@
+from selenium.common.exceptions import NoSuchElementException, WebDriverException
+import os
+import pytest
+import time
+
+
+# Unit under test
+from src.utility import BrowserWorkers
+from src.utility import browser_workers
+
+
+# The workers are separate processes, so they are given builders they can
+# import from this module.
+class FakeDriver:
+    def execute_cdp_cmd(self, cmd, params):
+        pass
+
+    def quit(self):
+        pass
+
+
+class FakeManager:
+    def __init__(self, account_id):
+        self._account_id = account_id
+
+    def browser_punch(self, action_str):
+        return action_str
+
+    def where(self):
+        return self._account_id, os.getpid()
+
+    def fail(self):
+        raise NoSuchElementException('missing')
+
+    def crash(self):
+        os._exit(1)
+
+    def lose_browser(self):
+        raise WebDriverException('chrome not reachable')
+
+    def hang(self):
+        time.sleep(60)
+
+
+def make_driver():
+    return FakeDriver()
+
+
+def build_manager(account_id, driver):
+    return FakeManager(account_id)
+
+
+@pytest.fixture()
+def workers():
+    pool = BrowserWorkers(make_driver, build_manager, timeout=5)
+    yield pool
+    pool.close()
+
+
+def test_run_calls_manager_in_worker_process(workers):
+    assert workers.run('a', 'browser_punch', 'Clock In') == 'Clock In'
+
+    account_id, pid = workers.run('a', 'where')
+    assert account_id == 'a'
+    assert pid != os.getpid()
+
+
+def test_run_raises_what_manager_raised(workers):
+    with pytest.raises(NoSuchElementException):
+        workers.run('a', 'fail')
+
+    # The worker survives an error raised by the page objects.
+    assert workers.run('a', 'browser_punch', 'Clock Out') == 'Clock Out'
+
+
+def test_run_replaces_crashed_worker(workers):
+    pid = workers.run('a', 'where')[1]
+
+    with pytest.raises(ChildProcessError):
+        workers.run('a', 'crash')
+
+    assert workers.run('a', 'where')[1] != pid
+
+
+def test_run_replaces_worker_whose_browser_failed(workers):
+    pid = workers.run('a', 'where')[1]
+
+    with pytest.raises(ChildProcessError) as error:
+        workers.run('a', 'lose_browser')
+
+    assert isinstance(error.value.__cause__, WebDriverException)
+    assert workers.run('a', 'where')[1] != pid
+
+
+def test_run_replaces_hung_worker():
+    workers = BrowserWorkers(make_driver, build_manager, timeout=3)
+    pid = workers.run('a', 'where')[1]
+
+    with pytest.raises(ChildProcessError):
+        workers.run('a', 'hang')
+
+    assert workers.run('a', 'where')[1] != pid
+    workers.close()
+
+
+def test_run_recycles_worker_after_max_jobs():
+    workers = BrowserWorkers(make_driver, build_manager, max_jobs=2)
+
+    pids = [workers.run('a', 'where')[1] for _ in range(3)]
+
+    assert pids[0] == pids[1] != pids[2]
+    workers.close()
+
+
+def test_run_prefers_worker_of_account():
+    workers = BrowserWorkers(make_driver, build_manager, size=2)
+
+    first = workers.run('a', 'where')[1]
+    workers.run('b', 'where')
+
+    assert workers.run('a', 'where')[1] == first
+    assert len(workers) == 2
+    workers.close()
+
+
+def test_run_recycles_worker_after_max_hours():
+    workers = BrowserWorkers(make_driver, build_manager, max_hours=1e-9)
+
+    first = workers.run('a', 'where')[1]
+
+    assert workers.run('a', 'where')[1] != first
+    workers.close()
+
+
+def test_run_recycles_worker_over_memory_watermark():
+    workers = BrowserWorkers(make_driver, build_manager, max_memory_mb=0.001)
+
+    first = workers.run('a', 'where')[1]
+
+    assert workers.run('a', 'where')[1] != first
+    workers.close()
+
+
+def test_check_idle_recycles_worn_idle_worker(workers):
+    first = workers.run('a', 'where')[1]
+    workers._max_seconds = 1e-9
+
+    workers._check_idle()
+
+    workers._max_seconds = 0
+    assert workers.run('a', 'where')[1] != first
+
+
+def test_reload_replaces_worker_before_next_job(workers):
+    first = workers.run('a', 'where')[1]
+
+    workers.reload()
+
+    second = workers.run('a', 'where')[1]
+    assert second != first
+    assert workers.run('a', 'where')[1] == second
+
+
+def test_check_idle_replaces_worker_after_reload(workers):
+    first = workers.run('a', 'where')[1]
+
+    workers.reload()
+    workers._check_idle()
+
+    worker = workers._idle[0]
+    assert worker.started_at >= workers._reloaded_at
+    assert workers.run('a', 'where')[1] != first
+
+
+def test_group_memory_mb_adds_up_group(tmp_path, monkeypatch):
+    processes = {
+        '10': ('10 (python) S 1 10 10', '100 256 0'),
+        '11': ('11 (chrome renderer) S 10 10 10', '100 512 0'),
+        '12': ('12 (bash) S 1 12 12', '100 1024 0')
+    }
+    for pid, (stat, statm) in processes.items():
+        (tmp_path / pid).mkdir()
+        (tmp_path / pid / 'stat').write_text(stat)
+        (tmp_path / pid / 'statm').write_text(statm)
+    (tmp_path / 'self').mkdir()
+
+    monkeypatch.setattr(browser_workers, 'PROC_DIR', str(tmp_path))
+
+    expected = 768 * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+    assert browser_workers.group_memory_mb(10) == expected
+
+
+def test_group_memory_mb_without_proc(tmp_path, monkeypatch):
+    monkeypatch.setattr(browser_workers, 'PROC_DIR', str(tmp_path / 'missing'))
+
+    assert browser_workers.group_memory_mb(10) == 0
@@ -0,0 +1,14 @@
+# Unit under test
+from src.utility import chrome_options
+from src.utility.chrome import CHROME_FLAGS
+
+
+def test_chrome_options_adds_every_flag():
+    options = chrome_options()
+
+    assert options.arguments == list(CHROME_FLAGS)
+    assert '--headless' in options.arguments
+
+
+def test_chrome_options_takes_other_flags():
+    assert chrome_options(('--headless',)).arguments == ['--headless']
@@ -0,0 +1,37 @@
+from unittest.mock import Mock, patch
+from src.utility import DriverPool
+import pytest
+
+
+# Shared by the tests of the AccountManager and the AsyncAccountManager.
+def build_account_config(account_id):
+    config = Mock()
+    config.get_account_id = Mock(return_value=account_id)
+    config.get_start_hour = Mock(return_value=8)
+    config.get_db_path = Mock(return_value='database.db')
+
+    return config
+
+
+@pytest.fixture()
+def account_config():
+    return build_account_config
+
+
+@pytest.fixture()
+def args():
+    return {
+        'configs': [],
+        'drivers': DriverPool([Mock()])
+    }
+
+
+@pytest.fixture()
+def managers():
+    with patch('src.utility.account_manager.Database'), \
+            patch('src.utility.account_manager.SMTP_SSL'), \
+            patch('src.utility.account_manager.PagerDuty') as pager, \
+            patch('src.utility.account_manager.PunchCardManager') as manager:
+        manager.side_effect = lambda account_args: Mock()
+        pager.side_effect = lambda config, smtp: Mock()
+        yield
@@ -0,0 +1,100 @@
+from unittest.mock import Mock
+import pytest
+
+
+# Unit under test
+from src.utility import DriverPool
+from src.utility.driver_pool import count_handovers
+
+
+def test_acquire_lends_driver_and_takes_it_back():
+    driver = Mock()
+    pool = DriverPool([driver])
+
+    with pool.acquire() as lent:
+        assert lent is driver
+
+    with pool.acquire() as lent:
+        assert lent is driver
+
+
+def test_acquire_keeps_cookies_for_same_account():
+    driver = Mock()
+    pool = DriverPool([driver])
+
+    with pool.acquire('a'):
+        pass
+
+    with pool.acquire('a'):
+        pass
+
+    driver.execute_cdp_cmd.assert_not_called()
+
+
+def test_acquire_clears_cookies_when_account_changes():
+    driver = Mock()
+    pool = DriverPool([driver])
+
+    with pool.acquire('a'):
+        pass
+
+    with pool.acquire('b'):
+        driver.execute_cdp_cmd.assert_called_once_with(
+            'Network.clearBrowserCookies', {}
+        )
+
+
+def test_acquire_counts_handovers_between_accounts():
+    driver = Mock()
+    pool = DriverPool([driver])
+
+    for account_id in ('a', 'a', 'b', 'a'):
+        with pool.acquire(account_id):
+            pass
+
+    assert count_handovers(driver) == 2
+
+
+def test_acquire_prefers_driver_holding_account_session():
+    first, second = Mock(), Mock()
+    pool = DriverPool([first, second])
+
+    with pool.acquire('a'), pool.acquire('b') as lent:
+        assert lent is second
+
+    # Both are idle again, the one holding each session is handed back.
+    with pool.acquire('b') as lent:
+        assert lent is second
+
+    with pool.acquire('a') as lent:
+        assert lent is first
+
+    first.execute_cdp_cmd.assert_not_called()
+    second.execute_cdp_cmd.assert_not_called()
+
+
+def test_acquire_prefers_unused_driver_over_others_session():
+    first, second = Mock(), Mock()
+    pool = DriverPool([first, second])
+
+    with pool.acquire('a'):
+        pass
+
+    with pool.acquire('b') as lent:
+        assert lent is second
+
+
+def test_acquire_returns_driver_when_work_raises():
+    driver = Mock()
+    pool = DriverPool([driver])
+
+    with pytest.raises(RuntimeError):
+        with pool.acquire():
+            raise RuntimeError()
+
+    with pool.acquire() as lent:
+        assert lent is driver
+
+
+def test_len_is_number_of_drivers():
+    assert len(DriverPool([Mock(), Mock()])) == 2
@@ -0,0 +1,172 @@
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from requests import Session
+from requests.exceptions import RequestException
+from threading import Thread
+from unittest.mock import Mock
+from urllib.parse import parse_qs
+import pytest
+import time
+
+
+# Unit under test
+from src.utility import HttpPunchClient
+from src.pages import parse_last_punch
+from src.utility.http_punch_client import BUTTONS, PunchFormParser
+
+
+DASHBOARD = '''
+<form method="post">
+    <input type="hidden" name="__RequestVerificationToken" value="token" />
+    <input type="text" name="Ignored" value="visible" />
+    <button name="ClockIn" value="in">Clock In</button>
+    <button name="StartLunch">Start Lunch</button>
+</form>
+'''
+
+
+class StubPaylocity(BaseHTTPRequestHandler):
+    """Serves the dashboard, and records each punch form posted."""
+
+    posted = []
+    logged_in = True
+    stall = 0
+    punch_status = 200
+
+    def do_GET(self):
+        time.sleep(StubPaylocity.stall)
+
+        if self.path == '/login':
+            self._respond(200, 'Login page')
+        elif not StubPaylocity.logged_in:
+            self.send_response(302)
+            self.send_header('Location', '/login')
+            self.end_headers()
+        elif 'session=abc' not in self.headers.get('Cookie', ''):
+            self._respond(403, 'Forbidden')
+        else:
+            self._respond(200, DASHBOARD)
+
+    def do_POST(self):
+        length = int(self.headers['Content-Length'])
+        form = parse_qs(self.rfile.read(length).decode(), keep_blank_values=True)
+        StubPaylocity.posted.append(form)
+
+        # The dashboard comes back showing the punch as the latest one.
+        punches = [punch for punch, button in BUTTONS.items() if button in form]
+        self._respond(
+            StubPaylocity.punch_status,
+            '<div id="LastPunch"><b>%s</b>\n 8:01 AM</div><p>Other</p>'
+            % (punches[0] if punches else 'Nothing')
+        )
+
+    def _respond(self, status, body):
+        self.send_response(status)
+        self.end_headers()
+        self.wfile.write(body.encode())
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture()
+def server():
+    httpd = HTTPServer(('127.0.0.1', 0), StubPaylocity)
+    thread = Thread(
+        target=httpd.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True
+    )
+    thread.start()
+
+    StubPaylocity.posted = []
+    StubPaylocity.logged_in = True
+    StubPaylocity.stall = 0
+    StubPaylocity.punch_status = 200
+
+    yield 'http://127.0.0.1:%s' % httpd.server_port
+
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture()
+def client(server):
+    config = Mock()
+    config.get_dashboard_url = Mock(return_value=server + '/dashboard')
+    config.get_punch_url = Mock(return_value=server + '/punch')
+    config.get_login_url = Mock(return_value=server + '/login')
+    config.get_implicit_wait = Mock(return_value=0.2)
+
+    client = HttpPunchClient(config, Session())
+    client.set_cookies([
+        {'name': 'session', 'value': 'abc', 'domain': '127.0.0.1', 'path': '/'}
+    ])
+
+    return client
+
+
+def test_punch_posts_hidden_fields_and_button(client):
+    client.clock_in()
+
+    assert StubPaylocity.posted == [
+        {'__RequestVerificationToken': ['token'], 'ClockIn': ['in']}
+    ]
+
+
+def test_punch_posts_button_without_value(client):
+    client.start_lunch()
+
+    assert StubPaylocity.posted[0]['StartLunch'] == ['']
+
+
+def test_punch_raises_when_session_expired(client):
+    StubPaylocity.logged_in = False
+
+    with pytest.raises(RequestException):
+        client.clock_out()
+
+    assert StubPaylocity.posted == []
+
+
+def test_punch_raises_without_cookies(client):
+    client.set_cookies([])
+
+    with pytest.raises(RequestException):
+        client.end_lunch()
+
+    assert StubPaylocity.posted == []
+
+
+def test_punch_raises_when_paylocity_stalls(client):
+    StubPaylocity.stall = 0.5
+
+    with pytest.raises(RequestException):
+        client.clock_in()
+
+    assert StubPaylocity.posted == []
+
+
+def test_punch_leaves_submitted_punch_unconfirmed(client):
+    StubPaylocity.punch_status = 500
+
+    # The form went out, so the caller must not send the punch again.
+    assert client.clock_in() is None
+    assert len(StubPaylocity.posted) == 1
+
+
+def test_punch_raises_when_paylocity_cannot_be_reached(client):
+    client._config.get_punch_url.return_value = 'http://127.0.0.1:1/punch'
+
+    with pytest.raises(RequestException):
+        client.clock_in()
+
+
+def test_punch_returns_latest_punch_from_response(client):
+    assert client.start_lunch() == 'Start Lunch'
+
+
+def test_parser_collects_only_latest_punch_text():
+    parser = PunchFormParser()
+    parser.feed('<p>Clock Out</p><div id="LastPunch"><i>End</i> Lunch</div><p>x</p>')
+
+    assert parser.last_punch == 'End Lunch'
+    assert parse_last_punch(parser.last_punch) == 'End Lunch'
+    assert parse_last_punch(PunchFormParser().last_punch) is None
@@ -1,9 +1,13 @@
-from unittest.mock import Mock
+from smtplib import SMTP, SMTPServerDisconnected
+from socketserver import StreamRequestHandler, ThreadingTCPServer
+from threading import Event, Thread
+from unittest.mock import Mock, patch
 import pytest
 
 
 # Unit under test
 from src.utility import PagerDuty
+from src.utility import pager_duty
 
 
 username = 'some'
@@ -15,8 +19,10 @@ pager_duty_info = {
     'password': password,
     'to': to_email
 }
+no_limits = {'digest_seconds': 0, 'messages_per_hour': 0, 'burst': 3}
 config = Mock()
 config.get_pager_duty_info = Mock(return_value=pager_duty_info)
+config.get_pager_limits = Mock(return_value=no_limits)
 
 
 smtp = Mock()
@@ -40,6 +46,7 @@ def test_log_levels(log_level):
     }
 
     switch[log_level](pager_message)
+    pd.flush()
 
     smtp.connect.assert_called_once_with('smtp.gmail.com', 465)
     smtp.login.assert_called_once_with(username, password)
@@ -47,12 +54,319 @@ def test_log_levels(log_level):
     expected = 'Level - %s\nMessage - %s' % (log_level.upper(), pager_message)
     smtp.sendmail.assert_called_once_with(from_email, to_email, expected)
 
+    # The connection is kept open for the next message.
+    smtp.quit.assert_not_called()
+
+    pd.close()
     smtp.quit.assert_called_once()
 
     # Parameterized test needs the calls to be reset.
     smtp.reset_mock()
 
 
+def test_connection_is_reused_between_messages():
+    pd = PagerDuty(config, smtp)
+    pd.info('first')
+    pd.info('second')
+    pd.flush()
+
+    smtp.connect.assert_called_once()
+    smtp.login.assert_called_once()
+    assert smtp.sendmail.call_count == 2
+
+    pd.close()
+    smtp.reset_mock()
+
+
+def test_reconnects_when_connection_drops():
+    smtp.sendmail.side_effect = [None, SMTPServerDisconnected(), None]
+
+    pd = PagerDuty(config, smtp)
+    pd.info('first')
+    pd.info('second')
+    pd.flush()
+
+    assert smtp.connect.call_count == 2
+    assert smtp.sendmail.call_count == 3
+
+    pd.close()
+    smtp.sendmail.side_effect = None
+    smtp.reset_mock()
+
+
+class DroppingSmtp(StreamRequestHandler):
+    """Wants EHLO before AUTH, and drops each connection after one message."""
+
+    sessions = []
+
+    def handle(self):
+        commands = []
+        DroppingSmtp.sessions.append(commands)
+        greeted = False
+
+        self.wfile.write(b'220 ready\r\n')
+
+        for line in self.rfile:
+            command = line.decode().strip()
+            commands.append(command.split(' ')[0].upper())
+
+            if commands[-1] == 'EHLO':
+                greeted = True
+                self.wfile.write(b'250-hello\r\n250 AUTH PLAIN\r\n')
+            elif commands[-1] == 'AUTH':
+                reply = b'235 ok' if greeted else b'503 EHLO first'
+                self.wfile.write(reply + b'\r\n')
+            elif commands[-1] == 'DATA':
+                self.wfile.write(b'354 go on\r\n')
+                for data in self.rfile:
+                    if data.strip() == b'.':
+                        break
+                self.wfile.write(b'250 sent\r\n')
+                return
+            else:
+                self.wfile.write(b'250 ok\r\n')
+
+
+def test_reconnect_greets_server_again(monkeypatch):
+    server = ThreadingTCPServer(('127.0.0.1', 0), DroppingSmtp)
+    server.daemon_threads = True
+    Thread(target=server.serve_forever, daemon=True).start()
+    DroppingSmtp.sessions = []
+
+    monkeypatch.setattr(pager_duty, 'GMAIL_DOMAIN', '127.0.0.1')
+    monkeypatch.setattr(pager_duty, 'GMAIL_PORT', server.server_address[1])
+
+    pd = PagerDuty(config, SMTP())
+    pd.info('first')
+    pd.flush()
+    pd.info('after the connection dropped')
+    pd.flush()
+    pd.close()
+
+    server.shutdown()
+    server.server_close()
+
+    sent = [session for session in DroppingSmtp.sessions if 'DATA' in session]
+    assert len(sent) == 2
+    for session in sent:
+        assert session[:2] == ['EHLO', 'AUTH']
+
+
+def test_gives_up_after_one_retry(capsys):
+    smtp.connect.side_effect = OSError('network is down')
+
+    pd = PagerDuty(config, smtp)
+    pd.alert('lost message')
+    pd.flush()
+
+    assert smtp.connect.call_count == 2
+    smtp.sendmail.assert_not_called()
+    assert 'lost message' in capsys.readouterr().out
+
+    pd.close()
+    smtp.connect.side_effect = None
+    smtp.reset_mock()
+
+
+def test_worker_survives_message_it_cannot_send(capsys):
+    smtp.sendmail.side_effect = [
+        UnicodeEncodeError('ascii', 'caf\xe9', 3, 4, 'ordinal not in range'),
+        None
+    ]
+
+    pd = PagerDuty(config, smtp)
+    pd.info('caf\xe9')
+    pd.alert('still sent')
+    pd.flush()
+
+    assert smtp.sendmail.call_count == 2
+    assert 'caf\xe9' in capsys.readouterr().out
+
+    pd.close()
+    smtp.sendmail.side_effect = None
+    smtp.reset_mock()
+
+
+def test_page_does_not_wait_for_server():
+    sending = Event()
+    release = Event()
+
+    def slow_send(*args):
+        sending.set()
+        release.wait(5)
+
+    smtp.sendmail.side_effect = slow_send
+
+    pd = PagerDuty(config, smtp)
+    pd.info('slow message')
+
+    # The call returned while the message is still being sent.
+    assert sending.wait(5)
+    release.set()
+
+    pd.close()
+    smtp.sendmail.side_effect = None
+    smtp.reset_mock()
+
+
+@pytest.fixture()
+def limited_config():
+    limited = Mock()
+    limited.get_pager_duty_info = Mock(return_value=pager_duty_info)
+    limited.get_pager_limits = Mock(return_value=dict(no_limits))
+
+    yield limited
+
+    smtp.reset_mock()
+
+
+def test_digest_holds_info_and_warning_until_window_closes(limited_config):
+    limited_config.get_pager_limits.return_value['digest_seconds'] = 60
+
+    pd = PagerDuty(limited_config, smtp)
+    pd.info('Clock In at 8')
+    pd.warning('Did not log Clock In to database')
+    pd.flush()
+
+    smtp.sendmail.assert_not_called()
+
+    pd.send_digest()
+    pd.flush()
+
+    expected = (
+        'Level - DIGEST\nMessage - 2 messages\n'
+        'INFO - Clock In at 8\n'
+        'WARNING - Did not log Clock In to database'
+    )
+    smtp.sendmail.assert_called_once_with(from_email, to_email, expected)
+
+    pd.close()
+
+
+def test_digest_sends_alert_straight_away(limited_config):
+    limited_config.get_pager_limits.return_value['digest_seconds'] = 60
+
+    pd = PagerDuty(limited_config, smtp)
+    pd.info('held')
+    pd.alert('urgent')
+    pd.flush()
+
+    smtp.sendmail.assert_called_once_with(
+        from_email, to_email, 'Level - ALERT\nMessage - urgent'
+    )
+
+    # Closing sends what was held, a single message as it was.
+    pd.close()
+    smtp.sendmail.assert_called_with(
+        from_email, to_email, 'Level - INFO\nMessage - held'
+    )
+
+
+def test_digest_is_sent_when_window_closes(limited_config):
+    limited_config.get_pager_limits.return_value['digest_seconds'] = 0.01
+    sent = Event()
+    smtp.sendmail.side_effect = lambda *args: sent.set()
+
+    pd = PagerDuty(limited_config, smtp)
+    pd.info('on a timer')
+
+    assert sent.wait(5)
+
+    pd.close()
+    smtp.sendmail.side_effect = None
+
+
+@patch('src.utility.pager_duty.time.sleep')
+def test_rate_limit_waits_except_for_alerts(sleep, limited_config):
+    limits = limited_config.get_pager_limits.return_value
+    limits['messages_per_hour'] = 1
+    limits['burst'] = 1
+    pager_duty_info_to = dict(pager_duty_info, to='rate-limited@cellprovider.net')
+    limited_config.get_pager_duty_info.return_value = pager_duty_info_to
+
+    pd = PagerDuty(limited_config, smtp)
+    pd.info('first is free')
+    pd.alert('alert skips the wait')
+    pd.flush()
+
+    sleep.assert_not_called()
+
+    pd.info('third waits')
+    pd.flush()
+
+    sleep.assert_called_once()
+    assert sleep.call_args[0][0] > 3600
+    assert smtp.sendmail.call_count == 3
+
+    pd.close()
+
+
+def test_alert_does_not_wait_behind_rate_limited_message(limited_config):
+    limits = limited_config.get_pager_limits.return_value
+    limits['messages_per_hour'] = 1
+    limits['burst'] = 1
+    pager_duty_info_to = dict(pager_duty_info, to='priority@cellprovider.net')
+    limited_config.get_pager_duty_info.return_value = pager_duty_info_to
+
+    waiting = Event()
+    release = Event()
+
+    def sleep(seconds):
+        waiting.set()
+        release.wait(5)
+
+    alerted = Event()
+    smtp.sendmail.side_effect = lambda *args: 'ALERT' in args[2] and alerted.set()
+
+    pd = PagerDuty(limited_config, smtp)
+
+    with patch('src.utility.pager_duty.time.sleep', side_effect=sleep):
+        pd.info('first is free')
+        pd.info('second waits an hour')
+        assert waiting.wait(5)
+
+        # The alert goes out while the info is still waiting for a token.
+        pd.alert('urgent')
+        assert alerted.wait(5)
+        assert smtp.sendmail.call_count == 2
+
+        release.set()
+        pd.close()
+
+    assert smtp.sendmail.call_count == 3
+    smtp.sendmail.side_effect = None
+
+
+def test_digest_is_shared_per_destination(limited_config):
+    limited_config.get_pager_limits.return_value['digest_seconds'] = 60
+    pager_duty_info_to = dict(pager_duty_info, to='shared@cellprovider.net')
+    limited_config.get_pager_duty_info.return_value = pager_duty_info_to
+
+    first = PagerDuty(limited_config, smtp)
+    second = PagerDuty(limited_config, smtp)
+    first.info('Clock In for a')
+    second.info('Clock In for b')
+
+    first.close()
+    second.close()
+
+    smtp.sendmail.assert_called_once_with(
+        from_email,
+        'shared@cellprovider.net',
+        'Level - DIGEST\nMessage - 2 messages\n'
+        'INFO - Clock In for a\nINFO - Clock In for b'
+    )
+
+
+def test_rate_limit_is_shared_per_destination(limited_config):
+    limited_config.get_pager_limits.return_value['messages_per_hour'] = 10
+
+    first = PagerDuty(limited_config, smtp)
+    second = PagerDuty(limited_config, smtp)
+
+    assert first._bucket is second._bucket
+
+
 def test_output_to_console_without_email_credentials():
     empty_info = {'from': '', 'password': '', 'to': ''}
     config.get_pager_duty_info.return_value = empty_info
@@ -0,0 +1,60 @@
+from datetime import date, datetime, timedelta
+from src.records import PtoRecord
+import pytest
+
+
+# Unit under test
+from src.utility import PtoIndex
+
+
+NOW = datetime(2020, 3, 1, 9)
+
+
+@pytest.fixture()
+def index():
+    index = PtoIndex(72)
+    index.load(
+        [
+            PtoRecord(date(2020, 3, 9), date(2020, 3, 20), 80, 'Approved'),
+            PtoRecord(date(2020, 3, 2), date(2020, 3, 3), 16, 'Approved'),
+            PtoRecord(date(2020, 3, 10), date(2020, 3, 11), 16, 'Approved'),
+            PtoRecord(date(2020, 3, 25), date(2020, 3, 25), 8, 'Pending')
+        ],
+        NOW
+    )
+
+    return index
+
+
+@pytest.mark.parametrize(
+    'day,expected',
+    [
+        (date(2020, 3, 1), False),
+        (date(2020, 3, 2), True),
+        (date(2020, 3, 3), True),
+        (date(2020, 3, 4), False),
+        (date(2020, 3, 12), True),  # Covered by the longer, earlier record
+        (date(2020, 3, 20), True),
+        (date(2020, 3, 21), False),
+        (date(2020, 3, 25), False)  # Not approved
+    ]
+)
+def test_contains_finds_approved_days(index, day, expected):
+    assert index.contains(day) is expected
+
+
+def test_contains_accepts_datetimes(index):
+    assert index.contains(datetime(2020, 3, 2, 23, 59)) is True
+
+
+def test_contains_is_false_when_empty():
+    assert PtoIndex(72).contains(NOW) is False
+
+
+def test_is_stale_until_loaded():
+    assert PtoIndex(72).is_stale(NOW) is True
+
+
+def test_is_stale_after_refresh_hours(index):
+    assert index.is_stale(NOW + timedelta(hours=71)) is False
+    assert index.is_stale(NOW + timedelta(hours=72)) is True
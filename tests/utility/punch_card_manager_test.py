@@ -1,21 +1,35 @@
-from datetime import datetime, timedelta
-from src.pages import Dashboard, Login
-from selenium.common.exceptions import NoSuchElementException
+from datetime import datetime, timedelta, timezone
+from src.pages import Dashboard, Login, PtoRecord
+from requests.exceptions import RequestException
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    TimeoutException,
+    WebDriverException
+)
 from unittest.mock import Mock, patch
+from zoneinfo import ZoneInfo
 import pytest
 
 
 # Unit under test
 from src.utility import PunchCardManager
+from src.utility.driver_pool import hand_over
+from src.utility.punch_card_manager import PUNCH_ATTEMPTS
 
 
 START_HOUR = 8
 
+ZONE = ZoneInfo('America/Chicago')
+
 
 @pytest.fixture()
 def args():
     config = Mock()
     config.get_start_hour = Mock(return_value=START_HOUR)
+    config.get_pto_refresh_hours = Mock(return_value=72)
+    config.get_timezone = Mock(return_value=ZONE)
+    config.get_blocked_urls = Mock(return_value={})
+    config.get_warm_up_seconds = Mock(return_value=0)
 
     return {
         'config': config,
@@ -45,6 +59,20 @@ def test_start_inserts_new_day_if_db_is_empty(args):
     punch.insert_new_day.assert_called_once()
 
 
+@patch('src.utility.punch_card_manager.datetime')
+def test_prepare_dates_first_day_on_the_account_clock(clock, args):
+    # Past midnight in UTC, but still the evening before in Chicago.
+    clock.now = Mock(return_value=datetime(2020, 3, 19, 3, tzinfo=timezone.utc))
+
+    punch = Mock()
+    punch.get_most_recent_day = Mock(return_value=None)
+    args['punch'] = punch
+
+    PunchCardManager(args).prepare()
+
+    punch.insert_new_day.assert_called_once_with(datetime(2020, 3, 18).date())
+
+
 def test_start_inserts_new_day_if_most_recent_was_yesterday(args):
     yesterday = datetime.now().date() - timedelta(days=1)
     yesterday_str = yesterday.strftime('%Y-%m-%d')
@@ -69,7 +97,7 @@ def test_start_inserts_new_day_if_most_recent_was_yesterday(args):
 
 
 @patch('time.sleep')
-def test_start_sleeps_for_five_min_on_not_clock_day(time, args):
+def test_start_sleeps_until_tomorrow_on_not_clock_day(time, args):
     # To break out of the infinite loop, we'll have sleep raise
     time.side_effect = [None, Exception()]
 
@@ -81,8 +109,9 @@ def test_start_sleeps_for_five_min_on_not_clock_day(time, args):
     pcm = PunchCardManager(args)
     pcm.get_datetime_from_date_string = Mock(return_value=datetime.now())
     pcm.is_clock_in_day = Mock(return_value=False)
+    pcm.seconds_until_tomorrow = Mock(return_value=123)
     pcm.perform_action = Mock()
-    pcm.should_punch = Mock()
+    pcm.plan_day = Mock()
 
     try:
         pcm.start()
@@ -91,13 +120,13 @@ def test_start_sleeps_for_five_min_on_not_clock_day(time, args):
         # Do nothing with the exception
         pass
 
-    time.assert_called_with(300)
+    time.assert_called_with(123)
     pcm.perform_action.assert_not_called()
-    pcm.should_punch.assert_not_called()
+    pcm.plan_day.assert_not_called()
 
 
 @patch('time.sleep')
-def test_start_performs_clock_in(time, args):
+def test_start_sleeps_until_next_punch_is_due(time, args):
     # To break out of the infinite loop, we'll have sleep raise
     time.side_effect = Exception()
 
@@ -108,16 +137,14 @@ def test_start_performs_clock_in(time, args):
 
     args['punch'] = punch
 
-    config = Mock()
-    config.get_start_hour = Mock(return_value=datetime.now().hour)
-
-    args['config'] = config
-
     pcm = PunchCardManager(args)
-    pcm.get_datetime_from_date_string = Mock(return_value=datetime.now())
     pcm.is_clock_in_day = Mock(return_value=True)
     pcm.perform_action = Mock()
-    pcm.should_punch = Mock()
+    pcm.plan_day = Mock(
+        side_effect=lambda card, now: pcm._scheduler.schedule(
+            now + timedelta(minutes=10), 'Clock In'
+        )
+    )
 
     try:
         pcm.start()
@@ -125,14 +152,19 @@ def test_start_performs_clock_in(time, args):
         # Do nothing with the exception
         pass
 
-    pcm.perform_action.call_args[0] == 'Clock In'
-    pcm.perform_action.assert_called_once()
-    pcm.should_punch.assert_not_called()
-    time.assert_called_once_with(60)
+    pcm.plan_day.assert_called_once()
+    pcm.perform_action.assert_not_called()
+    assert 590 < time.call_args[0][0] <= 600
 
 
+@pytest.mark.parametrize('action_str,follow_ups', [
+    ('Clock In', ['Start Lunch', 'Clock Out']),
+    ('Start Lunch', ['End Lunch']),
+    ('End Lunch', []),
+    ('Clock Out', [])
+])
 @patch('time.sleep')
-def test_start_performs_lunch_start(time, args):
+def test_start_performs_due_punch(time, args, action_str, follow_ups):
     # To break out of the infinite loop, we'll have sleep raise
     time.side_effect = Exception()
 
@@ -144,10 +176,13 @@ def test_start_performs_lunch_start(time, args):
     args['punch'] = punch
 
     pcm = PunchCardManager(args)
-    pcm.get_datetime_from_date_string = Mock(return_value=datetime.now())
     pcm.is_clock_in_day = Mock(return_value=True)
     pcm.perform_action = Mock()
-    pcm.should_punch = Mock(return_value=True)
+    pcm.plan_day = Mock(
+        side_effect=lambda card, now: pcm._scheduler.schedule(
+            now - timedelta(seconds=1), action_str
+        )
+    )
 
     try:
         pcm.start()
@@ -155,14 +190,18 @@ def test_start_performs_lunch_start(time, args):
         # Do nothing with the exception
         pass
 
-    pcm.perform_action.call_args[0] == 'Start Lunch'
     pcm.perform_action.assert_called_once()
-    pcm.should_punch.assert_called_once()
-    time.assert_called_once_with(60)
+    assert pcm.perform_action.call_args[0][0] == action_str
+
+    queued = sorted(pcm._scheduler.pop()[1] for _ in range(len(pcm._scheduler)))
+    assert queued == sorted(follow_ups)
+
+    # Punches are planned once a day, not on every pass through the loop.
+    pcm.plan_day.assert_called_once()
 
 
 @patch('time.sleep')
-def test_start_performs_end_lunch(time, args):
+def test_start_skips_follow_ups_of_failed_punch(time, args):
     # To break out of the infinite loop, we'll have sleep raise
     time.side_effect = Exception()
 
@@ -174,10 +213,13 @@ def test_start_performs_end_lunch(time, args):
     args['punch'] = punch
 
     pcm = PunchCardManager(args)
-    pcm.get_datetime_from_date_string = Mock(return_value=datetime.now())
     pcm.is_clock_in_day = Mock(return_value=True)
-    pcm.perform_action = Mock()
-    pcm.should_punch = Mock(side_effect=[False, True])
+    pcm.perform_action = Mock(return_value=False)
+    pcm.plan_day = Mock(
+        side_effect=lambda card, now: pcm._scheduler.schedule(
+            now - timedelta(seconds=1), 'Clock In'
+        )
+    )
 
     try:
         pcm.start()
@@ -185,44 +227,104 @@ def test_start_performs_end_lunch(time, args):
         # Do nothing with the exception
         pass
 
-    pcm.perform_action.call_args[0] == 'End Lunch'
     pcm.perform_action.assert_called_once()
-    assert pcm.should_punch.call_count is 2
-    time.assert_called_once_with(60)
+    assert len(pcm._scheduler) == 0
 
 
-@patch('time.sleep')
-def test_start_performs_clock_out(time, args):
-    # To break out of the infinite loop, we'll have sleep raise
-    time.side_effect = Exception()
+def test_login_to_paylocity_reuses_live_session(args):
+    pcm = PunchCardManager(args)
+    pcm.has_session = Mock(return_value=True)
 
-    today_str = datetime.now().date().strftime('%Y-%m-%d')
+    with patch.object(Login, 'login') as login:
+        dash = pcm.login_to_paylocity()
 
-    punch = Mock()
-    punch.get_most_recent_day = Mock(return_value=(1, today_str, None, None))
+    login.assert_not_called()
+    assert isinstance(dash, Dashboard)
 
-    args['punch'] = punch
+
+@pytest.mark.parametrize('current_url,expected', [
+    ('https://login.example.com/dashboard', True),
+    ('https://access.example.com/?ReturnUrl=dashboard', False)
+])
+def test_has_session_checks_for_login_redirect(args, current_url, expected):
+    config = args['config']
+    config.get_dashboard_url = Mock(return_value='https://login.example.com/dashboard')
+    config.get_login_url = Mock(return_value='https://access.example.com/')
+
+    driver = args['driver']
+    driver.current_url = current_url
 
     pcm = PunchCardManager(args)
-    pcm.get_datetime_from_date_string = Mock(return_value=datetime.now())
-    pcm.is_clock_in_day = Mock(return_value=True)
-    pcm.perform_action = Mock()
-    pcm.should_punch = Mock(side_effect=[False, False, True])
 
-    try:
-        pcm.start()
-    except Exception:
-        # Do nothing with the exception
-        pass
+    assert pcm.has_session() is expected
+    driver.get.assert_called_once_with('https://login.example.com/dashboard')
 
-    pcm.perform_action.call_args[0] == 'Clock Out'
-    pcm.perform_action.assert_called_once()
-    assert pcm.should_punch.call_count is 3
-    time.assert_called_once_with(60)
+
+def test_login_to_paylocity_restores_saved_session(args):
+    sessions = Mock()
+    sessions.load = Mock(return_value=[{'name': 'session'}])
+    args['sessions'] = sessions
+
+    pcm = PunchCardManager(args)
+    pcm.has_session = Mock(side_effect=[False, True])
+
+    with patch.object(Login, 'login') as login:
+        dash = pcm.login_to_paylocity()
+
+    login.assert_not_called()
+    args['driver'].execute_cdp_cmd.assert_called_once_with(
+        'Network.setCookies', {'cookies': [{'name': 'session'}]}
+    )
+    assert isinstance(dash, Dashboard)
+
+
+def test_restore_session_forgets_expired_session(args):
+    sessions = Mock()
+    sessions.load = Mock(return_value=[{'name': 'session'}])
+    args['sessions'] = sessions
+
+    pcm = PunchCardManager(args)
+    pcm.has_session = Mock(return_value=False)
+
+    assert pcm.restore_session() is False
+    sessions.remove.assert_called_once()
+
+
+def test_restore_session_without_saved_cookies(args):
+    sessions = Mock()
+    sessions.load = Mock(return_value=[])
+    args['sessions'] = sessions
+
+    pcm = PunchCardManager(args)
+    pcm.has_session = Mock()
+
+    assert pcm.restore_session() is False
+    pcm.has_session.assert_not_called()
+
+
+def test_login_to_paylocity_saves_session_after_login(args):
+    sessions = Mock()
+    args['sessions'] = sessions
+    args['driver'].execute_cdp_cmd = Mock(return_value={'cookies': ['c']})
+
+    pcm = PunchCardManager(args)
+    pcm.has_session = Mock(return_value=False)
+    pcm.restore_session = Mock(return_value=False)
+
+    question_page = Mock()
+    question_page.is_on_question_page = Mock(return_value=False)
+
+    with patch.object(Login, 'login', return_value=question_page):
+        pcm.login_to_paylocity()
+
+    sessions.save.assert_called_once_with(
+        args['config'].get_account_id(), ['c']
+    )
 
 
 def test_login_to_paylocity_returns_dashboard(args):
     pcm = PunchCardManager(args)
+    pcm.has_session = Mock(return_value=False)
 
     question_page = Mock()
     question_page.is_on_question_page = Mock(return_value=False)
@@ -235,6 +337,7 @@ def test_login_to_paylocity_returns_dashboard(args):
 
 def test_login_to_paylocity_calls_answer_question(args):
     pcm = PunchCardManager(args)
+    pcm.has_session = Mock(return_value=False)
 
     expected = Mock()
 
@@ -302,37 +405,152 @@ def test_check_resources_returns_false_for_weekend_or_holiday(args, date_str):
     assert actual is False
 
 
-@pytest.mark.parametrize('is_pto_day_return', [(True,), (False,)])
-def test_check_resources_returns_based_on_pto(args, is_pto_day_return):
+def pto_dashboard(records):
     pto_mock = Mock()
-    pto_mock.is_pto_day = Mock(return_value=is_pto_day_return)
+    pto_mock.get_pto_records = Mock(return_value=records)
 
     dash_mock = Mock()
     dash_mock.go_to_pto = Mock(return_value=pto_mock)
 
+    return dash_mock
+
+
+@pytest.mark.parametrize('status,expected', [('Approved', False), ('Pending', True)])
+def test_check_resources_returns_based_on_pto(args, status, expected):
+    now = datetime(2020, 3, 18, 9)  # A Wednesday
+    records = [PtoRecord(now.date(), now.date(), 8, status)]
+
     holiday = Mock()
     holiday.is_holiday = Mock(return_value=False)
 
     args['holiday'] = holiday
 
     pcm = PunchCardManager(args)
-    pcm.login_to_paylocity = Mock(return_value=dash_mock)
-
-    now = Mock()
-    now.weekday = Mock(return_value=3)  # Number is arbitrary, but less than 5
+    pcm.login_to_paylocity = Mock(return_value=pto_dashboard(records))
 
     actual = pcm.check_resources(now)
 
-    assert actual is not is_pto_day_return
+    assert actual is expected
+
+
+def test_check_resources_reads_pto_grid_once_per_refresh(args):
+    now = datetime(2020, 3, 18, 9)  # A Wednesday
+    start = (now + timedelta(days=1)).date()
+    records = [PtoRecord(start, start + timedelta(days=1), 16, 'Approved')]
+
+    holiday = Mock()
+    holiday.is_holiday = Mock(return_value=False)
+
+    args['holiday'] = holiday
+
+    pcm = PunchCardManager(args)
+    pcm.login_to_paylocity = Mock(return_value=pto_dashboard(records))
+
+    assert pcm.check_resources(now) is True
+    assert pcm.check_resources(now + timedelta(days=1)) is False
+    assert pcm.check_resources(now + timedelta(days=2)) is False
+    pcm.login_to_paylocity.assert_called_once()
+
+    assert pcm.check_resources(now + timedelta(days=3)) is True
+    assert pcm.login_to_paylocity.call_count == 2
+
+
+def test_refresh_pto_uses_saved_days_off_after_restart(args):
+    now = datetime(2020, 3, 18, 9)
+
+    time_off = Mock()
+    time_off.get_synced_at = Mock(return_value=now - timedelta(hours=1))
+    time_off.get_records = Mock(
+        return_value=[PtoRecord(now.date(), now.date(), 8, 'Approved')]
+    )
+    args['time_off'] = time_off
+
+    pcm = PunchCardManager(args)
+    pcm.login_to_paylocity = Mock()
+
+    pcm.refresh_pto(now)
+
+    pcm.login_to_paylocity.assert_not_called()
+    time_off.sync.assert_not_called()
+    assert pcm.check_resources(now) is False
+
+
+@pytest.mark.parametrize('synced_at', [None, datetime(2020, 3, 1)])
+def test_refresh_pto_syncs_grid_when_saved_days_are_stale(args, synced_at):
+    now = datetime(2020, 3, 18, 9)
+    records = [PtoRecord(now.date(), now.date(), 8, 'Approved')]
+
+    time_off = Mock()
+    time_off.get_synced_at = Mock(return_value=synced_at)
+    time_off.get_records = Mock(return_value=[])
+    time_off.sync = Mock(return_value=1)
+    args['time_off'] = time_off
+
+    pcm = PunchCardManager(args)
+    pcm.login_to_paylocity = Mock(return_value=pto_dashboard(records))
+
+    pcm.refresh_pto(now)
+
+    # A time without a zone is in the account's zone, and is saved in UTC.
+    synced = time_off.sync.call_args[0][1]
+    time_off.sync.assert_called_once_with(records, now.replace(tzinfo=ZONE))
+    assert synced.utcoffset() == timedelta(0)
+    args['pager'].warning.assert_not_called()
+
+
+def test_refresh_pto_warns_when_sync_fails(args):
+    time_off = Mock()
+    time_off.get_synced_at = Mock(return_value=None)
+    time_off.sync = Mock(return_value=-1)
+    args['time_off'] = time_off
+
+    pcm = PunchCardManager(args)
+    pcm.login_to_paylocity = Mock(return_value=pto_dashboard([]))
+
+    pcm.refresh_pto(datetime(2020, 3, 18, 9))
+
+    args['pager'].warning.assert_called_once()
+
+
+@pytest.mark.parametrize('error', [
+    ChildProcessError(), NoSuchElementException(), TimeoutException()
+])
+def test_check_resources_keeps_saved_days_off_when_grid_fails(args, error):
+    now = datetime(2020, 3, 18, 9)  # A Wednesday
+
+    holiday = Mock()
+    holiday.is_holiday = Mock(return_value=False)
+    time_off = Mock()
+    time_off.get_synced_at = Mock(return_value=datetime(2020, 3, 1))
+    time_off.get_records = Mock(
+        return_value=[PtoRecord(now.date(), now.date(), 8, 'Approved')]
+    )
+    time_off.sync = Mock(return_value=1)
+    args['holiday'] = holiday
+    args['time_off'] = time_off
+
+    pcm = PunchCardManager(args)
+    pcm.read_pto_records = Mock(side_effect=error)
+
+    assert pcm.check_resources(now) is False
+
+    args['pager'].alert.assert_called_once()
+    time_off.sync.assert_not_called()
+
+    # The grid is read again on the next check.
+    pcm.read_pto_records = Mock(return_value=[])
+
+    assert pcm.check_resources(now) is True
 
 
 @pytest.fixture()
 def dashboard():
+    # Each punch shows up as the latest one once it is clicked.
     dashboard = Mock()
-    dashboard.clock_in = Mock()
-    dashboard.start_lunch = Mock()
-    dashboard.end_lunch = Mock()
-    dashboard.clock_out = Mock()
+    dashboard.clock_in = Mock(return_value='Clock In')
+    dashboard.start_lunch = Mock(return_value='Start Lunch')
+    dashboard.end_lunch = Mock(return_value='End Lunch')
+    dashboard.clock_out = Mock(return_value='Clock Out')
 
     return dashboard
 
@@ -381,6 +599,182 @@ def test_perform_action_calls_raises_and_alerts(args, dashboard):
     pager.alert.assert_called_once_with(alert_message)
 
 
+def test_perform_action_punches_over_http_without_browser(args):
+    http = Mock()
+    http.punch = Mock(return_value='Clock In')
+    args['http'] = http
+
+    pcm = PunchCardManager(args)
+    pcm.login_to_paylocity = Mock()
+
+    pcm.perform_action('Clock In', datetime.now(), lambda time: True)
+
+    http.punch.assert_called_once_with('Clock In')
+    pcm.login_to_paylocity.assert_not_called()
+    args['pager'].info.assert_called_once()
+
+
+def test_perform_action_falls_back_to_browser_when_http_fails(args, dashboard):
+    http = Mock()
+    http.punch = Mock(side_effect=RequestException())
+    args['http'] = http
+
+    pcm = PunchCardManager(args)
+    pcm.login_to_paylocity = Mock(return_value=dashboard)
+
+    pcm.perform_action('Clock Out', datetime.now(), lambda time: True)
+
+    dashboard.clock_out.assert_called_once()
+    args['pager'].info.assert_called_once()
+
+
+def test_perform_action_does_not_resend_unconfirmed_http_punch(args):
+    http = Mock()
+    http.punch = Mock(return_value=None)
+    args['http'] = http
+
+    pcm = PunchCardManager(args)
+    pcm.login_to_paylocity = Mock()
+
+    pcm.perform_action('Clock In', datetime.now(), lambda time: True)
+
+    http.punch.assert_called_once_with('Clock In')
+    pcm.login_to_paylocity.assert_not_called()
+    args['pager'].warning.assert_called_once_with(
+        'Could not confirm Clock In registered.'
+    )
+
+
+def test_http_punch_uses_saved_session_cookies(args):
+    http = Mock()
+    sessions = Mock()
+    sessions.load = Mock(return_value=['cookie'])
+    args['http'] = http
+    args['sessions'] = sessions
+
+    http.punch = Mock(return_value='End Lunch')
+
+    pcm = PunchCardManager(args)
+
+    assert pcm.http_punch('End Lunch') == 'End Lunch'
+    http.set_cookies.assert_called_once_with(['cookie'])
+
+
+def test_perform_action_alerts_without_logging_when_punch_never_registers(args, dashboard):
+    dashboard.clock_in.return_value = 'Clock Out'
+    db_fn = Mock()
+
+    pcm = PunchCardManager(args)
+    pcm.login_to_paylocity = Mock(return_value=dashboard)
+
+    assert not pcm.perform_action('Clock In', datetime.now(), db_fn)
+
+    assert dashboard.clock_in.call_count == PUNCH_ATTEMPTS
+    args['pager'].alert.assert_called_once_with(
+        'Clock In did not register after %d tries.' % PUNCH_ATTEMPTS
+    )
+    args['pager'].info.assert_not_called()
+    db_fn.assert_not_called()
+
+
+def test_perform_action_retries_punch_that_did_not_register(args, dashboard):
+    dashboard.end_lunch.side_effect = ['Start Lunch', 'End Lunch']
+    db_fn = Mock(return_value=True)
+
+    pcm = PunchCardManager(args)
+    pcm.login_to_paylocity = Mock(return_value=dashboard)
+
+    assert pcm.perform_action('End Lunch', datetime.now(), db_fn)
+
+    assert dashboard.end_lunch.call_count == 2
+    args['pager'].alert.assert_not_called()
+    db_fn.assert_called_once()
+
+
+def test_perform_action_trusts_punch_it_cannot_read_back(args, dashboard):
+    dashboard.clock_out.return_value = None
+    db_fn = Mock(return_value=True)
+
+    pcm = PunchCardManager(args)
+    pcm.login_to_paylocity = Mock(return_value=dashboard)
+
+    pcm.perform_action('Clock Out', datetime.now(), db_fn)
+
+    dashboard.clock_out.assert_called_once()
+    args['pager'].warning.assert_called_once_with(
+        'Could not confirm Clock Out registered.'
+    )
+    db_fn.assert_called_once()
+
+
+def test_perform_action_does_not_log_when_punch_raises(args, dashboard):
+    dashboard.start_lunch.side_effect = NoSuchElementException()
+    db_fn = Mock()
+
+    pcm = PunchCardManager(args)
+    pcm.login_to_paylocity = Mock(return_value=dashboard)
+
+    pcm.perform_action('Start Lunch', datetime.now(), db_fn)
+
+    db_fn.assert_not_called()
+
+
+def test_perform_action_alerts_when_browser_worker_crashes(args):
+    browsers = Mock()
+    browsers.run = Mock(side_effect=ChildProcessError())
+    args['browsers'] = browsers
+    db_fn = Mock()
+
+    pcm = PunchCardManager(args)
+    pcm.login_to_paylocity = Mock()
+
+    pcm.perform_action('Clock In', datetime.now(), db_fn)
+
+    pcm.login_to_paylocity.assert_not_called()
+    args['pager'].alert.assert_called_once_with('Did not Clock In successfully.')
+    db_fn.assert_not_called()
+
+
+def test_perform_action_alerts_when_browser_fails(args, dashboard):
+    dashboard.clock_in.side_effect = WebDriverException('chrome not reachable')
+    db_fn = Mock()
+
+    pcm = PunchCardManager(args)
+    pcm.login_to_paylocity = Mock(return_value=dashboard)
+
+    assert not pcm.perform_action('Clock In', datetime.now(), db_fn)
+
+    args['pager'].alert.assert_called_once_with('Did not Clock In successfully.')
+    db_fn.assert_not_called()
+
+
+def test_browser_punch_runs_in_browser_worker(args):
+    browsers = Mock()
+    browsers.run = Mock(return_value='Clock In')
+    args['browsers'] = browsers
+    args['config'].get_account_id = Mock(return_value='some-account')
+
+    pcm = PunchCardManager(args)
+
+    assert pcm.browser_punch('Clock In') == 'Clock In'
+    browsers.run.assert_called_once_with('some-account', 'browser_punch', 'Clock In')
+
+
+def test_read_pto_records_runs_in_browser_worker(args):
+    records = [PtoRecord(datetime(2020, 3, 18).date(), None, 8, 'Approved')]
+    browsers = Mock()
+    browsers.run = Mock(return_value=records)
+    args['browsers'] = browsers
+    args['config'].get_account_id = Mock(return_value='some-account')
+
+    pcm = PunchCardManager(args)
+    pcm.login_to_paylocity = Mock()
+
+    assert pcm.read_pto_records() == records
+    browsers.run.assert_called_once_with('some-account', 'read_pto_records')
+    pcm.login_to_paylocity.assert_not_called()
+
+
 def test_perform_action_calls_fails_db_and_warns(args, dashboard):
     pager = Mock()
     pager.warning = Mock()
@@ -398,29 +792,255 @@ def test_perform_action_calls_fails_db_and_warns(args, dashboard):
     pager.warning.assert_called_once_with(alert_message)
 
 
-def test_should_punch_returns_false_for_existing_punch(args):
+def test_plan_day_schedules_clock_in_at_start_hour(args):
+    now = datetime.now(ZONE).replace(hour=START_HOUR - 1, minute=30)
+
     pcm = PunchCardManager(args)
-    actual = pcm.should_punch(('Not none',), 0, 0, datetime.now(), timedelta(days=1))
+    pcm.plan_day((1, 'today', None, None, None, None, None), now)
+
+    due, action_str = pcm._scheduler.pop()
+    assert action_str == 'Clock In'
+    assert due == now.replace(hour=START_HOUR, minute=0, second=0, microsecond=0)
+    assert len(pcm._scheduler) == 0
 
-    assert actual is False
 
+def test_plan_day_skips_clock_in_after_start_hour(args):
+    now = datetime.now().replace(hour=START_HOUR + 1, minute=30)
 
-def test_should_punch_returns_false_is_previous_punch_missing(args):
-    punch_card = (None, None)
     pcm = PunchCardManager(args)
-    actual = pcm.should_punch(punch_card, 0, 1, datetime.now(), timedelta(days=1))
+    pcm.plan_day((1, 'today', None, None, None, None, None), now)
 
-    assert actual is False
+    assert len(pcm._scheduler) == 0
 
 
-@pytest.mark.parametrize('expected', [True, False])
-def test_should_punch_returns_boolean_satisfying_delta_logic(args, expected):
+@pytest.mark.parametrize('recorded,expected', [
+    ((1, 2), ['Start Lunch', 'Clock Out']),
+    ((1, 2, 3), ['End Lunch', 'Clock Out']),
+    ((1, 2, 3, 4), ['Clock Out']),
+    ((1, 2, 3, 4, 5), [])
+])
+def test_plan_day_resumes_from_recorded_punches(args, recorded, expected):
     now = datetime.now()
-    earlier = now - timedelta(hours=2) if expected else now - timedelta(minutes=10)
-    earlier_str = earlier.strftime('%Y-%m-%d %H:%M:%S.%f')
+    punch_str = (now - timedelta(hours=1)).strftime('%Y-%m-%d %H:%M:%S.%f')
+    punches = [punch_str] * (len(recorded) - 1)
+    punches += [None] * (4 - len(punches))
+    punch_card = (1, 'today', True) + tuple(punches)
+
+    pcm = PunchCardManager(args)
+    pcm.plan_day(punch_card, now)
+
+    actual = [pcm._scheduler.pop()[1] for _ in range(len(pcm._scheduler))]
+    assert actual == expected
+
+
+@pytest.mark.parametrize('action_str,low,high', [
+    ('Start Lunch', timedelta(hours=4, minutes=1), timedelta(hours=4, minutes=30)),
+    ('End Lunch', timedelta(minutes=31), timedelta(minutes=35)),
+    ('Clock Out', timedelta(hours=8, minutes=40), timedelta(hours=8, minutes=45))
+])
+def test_schedule_follow_ups_waits_within_delay(args, action_str, low, high):
+    now = datetime.now(ZONE)
+    previous = {
+        'Start Lunch': 'Clock In',
+        'End Lunch': 'Start Lunch',
+        'Clock Out': 'Clock In'
+    }
+
+    pcm = PunchCardManager(args)
+    pcm.schedule_follow_ups(previous[action_str], now)
+
+    queued = dict(
+        reversed(pcm._scheduler.pop()) for _ in range(len(pcm._scheduler))
+    )
+    assert low <= queued[action_str] - now <= high
+
+
+def test_seconds_until_tomorrow_counts_to_midnight(args):
+    now = datetime(2020, 3, 19, 23, 59, 30)
+
+    assert PunchCardManager.seconds_until_tomorrow(now) == 30
+
+
+def test_seconds_until_tomorrow_counts_daylight_saving_change():
+    # Clocks fall back an hour overnight, so the evening lasts an hour longer.
+    now = datetime(2020, 10, 31, 23, 0, tzinfo=ZONE)
+
+    assert PunchCardManager.seconds_until_tomorrow(now) == 3600
+
+    now = datetime(2020, 11, 1, 23, 0, tzinfo=ZONE)
+
+    assert PunchCardManager.seconds_until_tomorrow(now) == 3600
+
+    now = datetime(2020, 11, 1, 0, 0, tzinfo=ZONE)
+
+    assert PunchCardManager.seconds_until_tomorrow(now) == 25 * 3600
+
+
+@pytest.mark.parametrize('day', [
+    datetime(2020, 3, 6),  # Standard time, UTC-6
+    datetime(2020, 3, 9)   # Daylight saving time, UTC-5
+])
+def test_plan_day_schedules_clock_in_on_the_account_clock(args, day):
+    now = day.replace(hour=START_HOUR - 1, tzinfo=timezone.utc)
+
+    pcm = PunchCardManager(args)
+    pcm.plan_day((1, 'today', None, None, None, None, None), now.astimezone(ZONE))
+
+    due, action_str = pcm._scheduler.pop()
+    assert due.astimezone(ZONE).hour == START_HOUR
+    assert due.utcoffset() == timedelta(0)
+
+
+def test_plan_day_reads_punches_recorded_in_utc(args):
+    now = datetime(2020, 3, 18, 13, tzinfo=ZONE)
+    clock_in = datetime(2020, 3, 18, 13, tzinfo=timezone.utc)  # 8 in Chicago
+    punch_card = (1, 'today', True, str(clock_in), None, None, None)
+
+    pcm = PunchCardManager(args)
+    pcm.plan_day(punch_card, now)
+
+    queued = dict(
+        reversed(pcm._scheduler.pop()) for _ in range(len(pcm._scheduler))
+    )
+    assert timedelta(hours=4) < queued['Start Lunch'] - clock_in < timedelta(hours=5)
+
+
+def test_run_pending_records_punch_in_utc_on_the_account_day(args):
+    # Past midnight in UTC, but still the evening before in Chicago.
+    now = datetime(2020, 3, 19, 3, tzinfo=timezone.utc)
+
+    punch = Mock()
+    punch.get_most_recent_day = Mock(return_value=(1, '2020-03-18', None, None))
+    args['punch'] = punch
+
+    pcm = PunchCardManager(args)
+    pcm.is_clock_in_day = Mock(return_value=True)
+    pcm.perform_action = Mock()
+    pcm.plan_day = Mock(
+        side_effect=lambda card, now: pcm._scheduler.schedule(now, 'Clock Out')
+    )
+
+    pcm.run_pending(now)
+
+    punch.insert_new_day.assert_not_called()
+    time_of_action = pcm.perform_action.call_args[0][1]
+    assert time_of_action == now
+    assert time_of_action.utcoffset() == timedelta(0)
+
+
+def test_run_pending_warms_up_once_before_punch_is_due(args):
+    now = datetime(2020, 3, 18, 7, 59, tzinfo=ZONE)
+
+    punch = Mock()
+    punch.get_most_recent_day = Mock(return_value=(1, '2020-03-18', None, None))
+    args['punch'] = punch
+    args['config'].get_warm_up_seconds = Mock(return_value=120)
+
+    pcm = PunchCardManager(args)
+    pcm.is_clock_in_day = Mock(return_value=True)
+    pcm.perform_action = Mock()
+    pcm.warm_up = Mock()
+
+    # Logged in ahead, then told to check again straight away.
+    assert pcm.run_pending(now) == 0
+    pcm.warm_up.assert_called_once()
+
+    assert pcm.run_pending(now + timedelta(seconds=30)) == 30
+    pcm.warm_up.assert_called_once()
+    pcm.perform_action.assert_not_called()
+
+    pcm.run_pending(now + timedelta(minutes=1))
+    pcm.perform_action.assert_called_once()
+
+
+def test_run_pending_waits_to_warm_up(args):
+    now = datetime(2020, 3, 18, 7, 50, tzinfo=ZONE)
+
+    punch = Mock()
+    punch.get_most_recent_day = Mock(return_value=(1, '2020-03-18', None, None))
+    args['punch'] = punch
+    args['config'].get_warm_up_seconds = Mock(return_value=120)
 
-    punch_card = (earlier_str, None)
     pcm = PunchCardManager(args)
-    actual = pcm.should_punch(punch_card, 0, 1, now, timedelta(hours=1))
+    pcm.is_clock_in_day = Mock(return_value=True)
+    pcm.warm_up = Mock()
+
+    assert pcm.run_pending(now) == 600
+    pcm.warm_up.assert_not_called()
+
+
+def test_browser_punch_clicks_dashboard_left_open(args, dashboard):
+    pcm = PunchCardManager(args)
+    pcm.login_to_paylocity = Mock(return_value=dashboard)
+
+    pcm.warm_up()
+
+    assert pcm.browser_punch('Clock In') == 'Clock In'
+    pcm.login_to_paylocity.assert_called_once()
+
+    # The dashboard is only used for the punch it was opened for.
+    pcm.browser_punch('Start Lunch')
+    assert pcm.login_to_paylocity.call_count == 2
+
+
+def test_browser_punch_logs_in_once_another_account_used_browser(args, dashboard):
+    pcm = PunchCardManager(args)
+    pcm.login_to_paylocity = Mock(return_value=dashboard)
+
+    pcm.warm_up()
+    # Another account's dashboard has the same URL, so only the handover tells.
+    hand_over(args['driver'])
+    pcm.browser_punch('Clock In')
+
+    assert pcm.login_to_paylocity.call_count == 2
+
+
+def test_browser_punch_logs_in_again_when_button_is_missing(args, dashboard):
+    stale = Mock()
+    stale.clock_in = Mock(side_effect=NoSuchElementException())
+
+    pcm = PunchCardManager(args)
+    pcm.login_to_paylocity = Mock(side_effect=[stale, dashboard])
+
+    pcm.warm_up()
+
+    assert pcm.browser_punch('Clock In') == 'Clock In'
+    dashboard.clock_in.assert_called_once()
+
+
+def test_browser_punch_never_sends_clicked_punch_again(args, dashboard):
+    dashboard.clock_in.side_effect = TimeoutException('did not reload')
+
+    pcm = PunchCardManager(args)
+    pcm.login_to_paylocity = Mock(return_value=dashboard)
+
+    pcm.warm_up()
+
+    with pytest.raises(TimeoutException):
+        pcm.browser_punch('Clock In')
+
+    dashboard.clock_in.assert_called_once()
+    pcm.login_to_paylocity.assert_called_once()
+
+
+def test_warm_up_leaves_punch_to_log_in_when_login_fails(args, dashboard):
+    pcm = PunchCardManager(args)
+    pcm.login_to_paylocity = Mock(side_effect=[NoSuchElementException(), dashboard])
+
+    pcm.warm_up()
+
+    assert pcm.browser_punch('Clock In') == 'Clock In'
+    assert pcm.login_to_paylocity.call_count == 2
+
+
+def test_warm_up_runs_in_browser_worker(args):
+    browsers = Mock()
+    browsers.run = Mock(side_effect=ChildProcessError())
+    args['browsers'] = browsers
+    args['config'].get_account_id = Mock(return_value='some-account')
+
+    pcm = PunchCardManager(args)
+
+    pcm.warm_up()
 
-    assert actual is expected
\ No newline at end of file
+    browsers.run.assert_called_once_with('some-account', 'warm_up')
@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta
+
+
+# Unit under test
+from src.utility import PunchScheduler
+
+
+def test_pop_returns_earliest_action_first():
+    now = datetime.now()
+
+    scheduler = PunchScheduler()
+    scheduler.schedule(now + timedelta(hours=2), 'Clock Out')
+    scheduler.schedule(now + timedelta(hours=1), 'Start Lunch')
+
+    assert scheduler.pop() == (now + timedelta(hours=1), 'Start Lunch')
+    assert scheduler.pop() == (now + timedelta(hours=2), 'Clock Out')
+
+
+def test_actions_due_together_keep_scheduled_order():
+    now = datetime.now()
+
+    scheduler = PunchScheduler()
+    scheduler.schedule(now, 'first')
+    scheduler.schedule(now, 'second')
+
+    assert scheduler.pop()[1] == 'first'
+    assert scheduler.pop()[1] == 'second'
+
+
+def test_peek_leaves_action_in_queue():
+    now = datetime.now()
+
+    scheduler = PunchScheduler()
+    scheduler.schedule(now, 'Clock In')
+
+    assert scheduler.peek() == (now, 'Clock In')
+    assert len(scheduler) == 1
+
+
+def test_empty_queue_returns_empty_tuples():
+    scheduler = PunchScheduler()
+
+    assert scheduler.peek() == ()
+    assert scheduler.pop() == ()
+
+
+def test_clear_empties_queue():
+    scheduler = PunchScheduler()
+    scheduler.schedule(datetime.now(), 'Clock In')
+    scheduler.clear()
+
+    assert len(scheduler) == 0
+
+
+def test_seconds_until_next():
+    now = datetime.now()
+
+    scheduler = PunchScheduler()
+    assert scheduler.seconds_until_next(now) == -1
+
+    scheduler.schedule(now + timedelta(minutes=1), 'Clock In')
+    assert scheduler.seconds_until_next(now) == 60
+
+    # Overdue actions are due right away.
+    assert scheduler.seconds_until_next(now + timedelta(minutes=2)) == 0
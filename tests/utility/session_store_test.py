@@ -0,0 +1,97 @@
+from os.path import join
+from unittest.mock import Mock
+import os
+import pytest
+
+
+# Unit under test
+from src.utility import SessionStore
+
+
+COOKIE = {
+    'name': 'session',
+    'value': 'secret',
+    'domain': '.example.com',
+    'path': '/',
+    'secure': True,
+    'httpOnly': True,
+    'expires': 1234567890,
+    'size': 13,
+    'session': False
+}
+
+
+@pytest.fixture()
+def config(tmp_path):
+    config = Mock()
+    config.get_session_dir = Mock(return_value=str(tmp_path / 'sessions'))
+    config.get_session_key_path = Mock(return_value=str(tmp_path / 'key'))
+
+    return config
+
+
+def test_init_creates_private_key_file(config):
+    SessionStore(config)
+
+    mode = os.stat(config.get_session_key_path()).st_mode & 0o777
+    assert mode == 0o600
+
+
+def test_save_and_load_round_trip(config):
+    store = SessionStore(config)
+
+    assert store.save('a', [COOKIE]) is True
+
+    loaded = store.load('a')[0]
+    assert loaded['value'] == 'secret'
+    assert loaded['expires'] == 1234567890
+    assert 'size' not in loaded
+
+
+def test_save_encrypts_cookies_at_rest(config):
+    store = SessionStore(config)
+    store.save('a', [COOKIE])
+
+    with open(join(config.get_session_dir(), 'a.session'), 'rb') as session:
+        assert b'secret' not in session.read()
+
+
+def test_save_drops_expiry_of_session_cookies(config):
+    store = SessionStore(config)
+    store.save('a', [dict(COOKIE, session=True, expires=-1)])
+
+    assert 'expires' not in store.load('a')[0]
+
+
+def test_load_survives_restart_with_same_key(config):
+    SessionStore(config).save(None, [COOKIE])
+
+    assert SessionStore(config).load(None)[0]['name'] == 'session'
+
+
+def test_load_returns_empty_list_for_missing_session(config):
+    assert SessionStore(config).load('nobody') == []
+
+
+def test_load_returns_empty_list_for_unreadable_session(config):
+    store = SessionStore(config)
+    store.save('a', [COOKIE])
+
+    os.remove(config.get_session_key_path())
+
+    assert SessionStore(config).load('a') == []
+
+
+def test_remove_forgets_session(config):
+    store = SessionStore(config)
+    store.save('a', [COOKIE])
+    store.remove('a')
+
+    assert store.load('a') == []
+
+
+def test_account_ids_cannot_escape_directory(config):
+    store = SessionStore(config)
+    store.save('../a', [COOKIE])
+
+    assert os.listdir(config.get_session_dir()) == ['.._a.session']
@@ -0,0 +1,35 @@
+from unittest.mock import patch
+
+
+# Unit under test
+from src.utility import TokenBucket
+
+
+@patch('src.utility.token_bucket.time.monotonic', return_value=0)
+def test_take_is_free_until_bucket_is_empty(monotonic):
+    bucket = TokenBucket(1, 2)
+
+    assert bucket.take() == 0
+    assert bucket.take() == 0
+    assert bucket.take() == 1
+    assert bucket.take() == 2
+
+
+@patch('src.utility.token_bucket.time.monotonic', return_value=0)
+def test_take_refills_over_time(monotonic):
+    bucket = TokenBucket(0.5, 1)
+    bucket.take()
+
+    monotonic.return_value = 2
+
+    assert bucket.take() == 0
+
+
+@patch('src.utility.token_bucket.time.monotonic', return_value=0)
+def test_refill_stops_at_capacity(monotonic):
+    bucket = TokenBucket(1, 1)
+
+    monotonic.return_value = 100
+
+    assert bucket.take() == 0
+    assert bucket.take() == 1